@@ -19,13 +19,23 @@ class Agent(System):
         * ``integrate(actual_speeds, dt)``
         * and ``update_children_positions()``
         * as well as ``pygame_draw(self, screen, scale: float, shiftx: float, shifty: float)``, if you are going to animate your simulation
-        * ``update_energy`` can also be optionally implemented, if you want your agent to have an internal energy level
+        * ``update_energy`` can also be optionally overridden, if you want your agent's energy level to be updated differently from the default, in which action costs energy in proportion to the agent's motor speeds
 
         These methods split up the :class:`Agent`'s side of its sensorimotor loop. The main reason for splitting them up is to make it easier to subclass agent implementations. For example, to add sensors to an existing :class:`Agent` subclass, you would only need to override ``step_sensors`` and ``control`` - ``step_actuators`` and ``integrate`` don't need to be touched. Another example would be if you wanted to change the dynamics of motion when subclassing an existing :class:`Agent` - it may only be necessary to override the ``integrate`` method, and leave the other methods as they are.
 
         All instances of :class:`Agent` will have two sensors: the first is an :class:`EnergySensor`, which detects the agent's internal energy level. The second is a :class:`BumpSensor`, which can register collisions with other agents and objects. 
 
+        If an agent's sensors have already been stepped in the current simulation step, by a :class:`SensorRegistry`, then their activations are in the agent's ``sensor_readings``, and ``step`` uses them rather than calling ``step_sensors``. Subclasses whose ``step_sensors`` method only steps every sensor in the ``sensors`` list, and returns their activations in a list, can set the class attribute ``sensor_batching`` to ``True``, to allow a registry to do that for them.
+
+        ``step`` is itself split into ``step_before_motion``, which steps the agent's sensors, controller and actuators, and ``step_after_motion``, which updates its histories, with the calls to ``integrate`` and ``update_energy`` in between. This allows a group of agents of the same class to be stepped together, by the class's ``step_batch`` method, in which the agents are all moved by one call to ``integrate_batch``, and all have their energy updated by one call to ``update_energy_batch``. A :class:`Simulator` does this when it is constructed with ``batch_agents=True``, for agents whose class attribute ``step_batching`` is ``True`` (as it is for :class:`Robot`, :class:`Ant`, :class:`Bee` and :class:`FauxKilobot`, which have vectorised ``integrate_batch`` methods). If you subclass one of these and override ``step``, then you should set ``step_batching`` to ``False`` in your subclass.
     """
+    # by default, agents step their own sensors
+    sensor_batching: bool = False
+    sensor_readings: List[float] = None
+    # by default, agents are stepped one at a time, even when a Simulator batches them
+    step_batching: bool = False
+
+
     # I'm not entirely sure about theta=None
     # - this would be an odd kind of agent!
     def __init__(self, x: float, y: float, colour: str,  theta: float=None, radius: float=1, light: LightSource=None, energy_sensor_noisemaker=None, action_energy_cost: float=0, metabolism_energy_cost: float=0, alive: bool=True, maximum_energy: float=0, initial_energy: float=1, init_fun: Callable=None, perturb_fun: Callable=None, pheromone_manager=None, drop_interval=0.5, p_bump_noise=0):
@@ -91,7 +101,7 @@ class Agent(System):
         self.alive = alive
         self.maximum_energy = maximum_energy
         self.energy = initial_energy  # set initial energy level
-        self.energies = [initial_energy]  # store energy level
+        self.energies = History([initial_energy])  # store energy level
 
         self.drop_interval = drop_interval
         self.pheromone_manager = pheromone_manager  # the manager which new pheromones will be added to
@@ -104,25 +114,55 @@ class Agent(System):
             :param dt: Interval of time to integrate the agent's dynamics over.
             :type dt: float
         """
+        actual_speeds = self.step_before_motion(dt)
+
+        if self.alive:
+            # integrate agent's motion
+            self.integrate(actual_speeds, dt)
+
+            # update energy - agent may die in this called method
+            self.update_energy(actual_speeds, dt)
+
+        self.step_after_motion(dt)
+
+    def step_before_motion(self, dt: float) -> List[float]:
+        """
+            Only called from step() and step_batch().
+
+            The part of ``step`` which comes before the agent moves: pheromones are dropped, and the agent's sensors, controller and actuators are stepped.
+
+            :param dt: Interval of time to integrate the agent's dynamics over.
+            :type dt: float
+
+            :return: The actual speeds of the agent's motors.
+            :rtype: list[float]
+        """
         if self.pheromone_manager is not None:
             self.drop_pheromones(dt)
 
-        activations = self.step_sensors(dt)
+        if self.sensor_readings is not None:
+            # the sensors have already been stepped by a SensorRegistry
+            activations = self.sensor_readings
+            self.sensor_readings = None
+        else:
+            activations = self.step_sensors(dt)
 
         # step controller
         speed_commands = self.control(activations, dt)
 
         # step motor objects, if agent has any, or otherwise deal with any
         # dynamics of speed change such as inertia
-        actual_speeds = self.step_actuators(speed_commands, dt)
+        return self.step_actuators(speed_commands, dt)
 
-        if self.alive:
-            # integrate agent's motion
-            self.integrate(actual_speeds, dt)
+    def step_after_motion(self, dt: float) -> None:
+        """
+            Only called from step() and step_batch().
 
-            # update energy - agent may die in this called method
-            self.update_energy(actual_speeds, dt)
+            The part of ``step`` which comes after the agent has moved: the agent's histories are updated, and its attached systems are moved with it.
 
+            :param dt: Interval of time to integrate the agent's dynamics over.
+            :type dt: float
+        """
         self.energies.append(self.energy)
 
         # call System's step method
@@ -131,7 +171,72 @@ class Agent(System):
         # update light and light sensor positions
         self.update_children_positions()
 
-    def get_data(self):
+    @classmethod
+    def step_batch(cls, agents: List["Agent"], dt: float) -> None:
+        """
+            Step a group of agents of this class forwards in time together. Each agent's sensors, controller and actuators are stepped as in ``step``, and then the motion of all of the agents which are alive is integrated, and their energy levels are updated, in one call to ``integrate_batch`` (for each integrator used by the agents, if they have an ``integrator`` attribute) and one call to ``update_energy_batch``.
+
+            As every agent in the group senses and acts before any of them moves, the agents do not see the effects of each other's movements in the same simulation step, e.g. a light carried by another agent having moved, as they would if they were stepped one at a time (see :class:`SensorRegistry`, which has the same effect).
+
+            If a subclass overrides ``integrate`` or ``update_energy``, but not the corresponding batch method, then its agents are integrated, or have their energy updated, one at a time, so that the override is respected.
+
+            :param agents: The agents, which should all be of this class.
+            :type agents: list[:class:`Agent`]
+
+            :param dt: Interval of time to integrate the agents' dynamics over.
+            :type dt: float
+        """
+        speeds = [agent.step_before_motion(dt) for agent in agents]
+        moving = [i for i, agent in enumerate(agents) if agent.alive]
+        if moving:
+            groups: Dict[str, List[int]] = {}
+            for i in moving:
+                groups.setdefault(getattr(agents[i], "integrator", None), []).append(i)
+            for indices in groups.values():
+                group = [agents[i] for i in indices]
+                group_speeds = [speeds[i] for i in indices]
+                if Agent.get_definer(cls, "integrate_batch") is Agent.get_definer(cls, "integrate"):
+                    cls.integrate_batch(group, np.array(group_speeds, dtype=float), dt)
+                else:
+                    for agent, actual_speeds in zip(group, group_speeds):
+                        agent.integrate(actual_speeds, dt)
+            group = [agents[i] for i in moving]
+            group_speeds = [speeds[i] for i in moving]
+            if Agent.get_definer(cls, "update_energy_batch") is Agent.get_definer(cls, "update_energy"):
+                cls.update_energy_batch(group, np.array(group_speeds, dtype=float), dt)
+            else:
+                for agent, actual_speeds in zip(group, group_speeds):
+                    agent.update_energy(actual_speeds, dt)
+        for agent in agents:
+            agent.step_after_motion(dt)
+
+    @staticmethod
+    def get_definer(cls: type, name: str) -> type:
+        """
+            Get the class in which the method (or other attribute) which ``cls`` has with the given name is defined, or ``None`` if it has no such attribute.
+        """
+        return next((klass for klass in cls.__mro__ if name in klass.__dict__), None)
+
+    @classmethod
+    def integrate_batch(cls, agents: List["Agent"], speeds: np.ndarray, dt: float) -> None:
+        """
+            Integrate the motion of a group of agents of this class, which all have the same integrator, based on their motor speeds. Subclasses whose motion can be integrated for many agents at once should override this method with a vectorised version of ``integrate`` (see :class:`Kinematics`). By default, the agents are integrated one at a time.
+
+            Only called from step_batch().
+
+            :param agents: The agents.
+            :type agents: list[:class:`Agent`]
+
+            :param speeds: The agents' motor speeds, with a row for each agent.
+            :type speeds: :class:`numpy.ndarray`
+
+            :param dt: Interval of time to integrate the agents' motion over.
+            :type dt: float
+        """
+        for agent, actual_speeds in zip(agents, speeds.tolist()):
+            agent.integrate(actual_speeds, dt)
+
+    def get_data(self, copy: bool=False):
         """
             A function to get the data from an :class:`Agent`, in the form of a string-keyed dict.
 
@@ -140,9 +245,9 @@ class Agent(System):
             * data inherited from :class:`System`: see :class:`System`
             * The history of the agent's energy level over the simulation: ``data["energies"]``
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
-        data["energies"] = self.energies[:]
+        data["energies"] = self.energies.get_values(copy)
 
         return data
 
@@ -152,22 +257,78 @@ class Agent(System):
         """
         super().reset()
 
-        self.energy = self.energies[0]
-        self.energies = [self.energy]
+        self.energy = self.energies.first
+        self.energies = History([self.energy])
 
         self.timer = 0
 
     def update_energy(self, actual_speeds, dt):
         """
-            A placeholder. Subclasses of :class:`Agent` will need to implement this method, if they are to have internal energy levels.
+            Update the agent's energy level, based on its metabolic and action costs. The cost of action in a single simulation step is ``abs(motor speed) * dt * action_energy_cost``, for each of the agent's motors, and if the agent has any ``consumables``, then it then consumes the ones it is on top of (see :meth:`consume_consumables`). Agents which run out of energy die.
 
-            param actual_speeds: the actual speeds of the agent's motors.
-            type actual_speeds: list[float]
+            :param actual_speeds: the actual speeds of the agent's motors.
+            :type actual_speeds: list[float]
 
             :param dt: The interval of time to integrate the energy cost over.
             :type dt: float
         """
-        pass
+        # energy losses - allows agent to die here *before* it can consume anything
+        if self.alive:
+            # update energy. the faster the agent's motors turn, the quicker it loses energy
+            for speed in actual_speeds:
+                self.energy -= np.abs(speed) * dt * self.action_energy_cost
+            self.energy -= dt * self.metabolism_energy_cost  # some energy is lost even if the agent does not move
+            self.energy = max(self.energy, 0)  # prevent energy falling below zero
+
+            if self.energy <= 0:
+                self.alive = False
+
+        self.consume_consumables()
+
+    @classmethod
+    def update_energy_batch(cls, agents: List["Agent"], speeds: np.ndarray, dt: float) -> None:
+        """
+            Update the energy levels of a group of living agents of this class, in the same way as ``update_energy``, but with the costs of all of the agents computed together.
+
+            Only called from step_batch().
+
+            :param agents: The agents.
+            :type agents: list[:class:`Agent`]
+
+            :param speeds: The agents' motor speeds, with a row for each agent.
+            :type speeds: :class:`numpy.ndarray`
+
+            :param dt: The interval of time to integrate the energy costs over.
+            :type dt: float
+        """
+        energy = np.array([agent.energy for agent in agents], dtype=float)
+        action_energy_cost = np.array([agent.action_energy_cost for agent in agents], dtype=float)
+        metabolism_energy_cost = np.array([agent.metabolism_energy_cost for agent in agents], dtype=float)
+        # the costs are taken off one at a time, in the same order as in update_energy, so that the results are the same
+        for j in range(speeds.shape[1]):
+            energy = energy - np.abs(speeds[:, j]) * dt * action_energy_cost
+        energy = np.maximum(energy - dt * metabolism_energy_cost, 0)
+        for agent, agent_energy in zip(agents, energy.tolist()):
+            agent.energy = agent_energy
+            if agent_energy <= 0:
+                agent.alive = False
+            agent.consume_consumables()
+
+    def consume_consumables(self) -> None:
+        """
+            If the agent is alive and has a list of ``consumables``, then consume the ones which it is on top of, and add their energy to its own, which is kept between ``0`` and the agent's ``maximum_energy``. The agent dies if this leaves it with no energy.
+        """
+        consumables = getattr(self, "consumables", None)
+        # energy consumption - can include gains and losses ("negative energy")
+        if consumables is not None and self.alive:
+            for consumable in consumables:
+                if np.linalg.norm([self.x-consumable.x, self.y-consumable.y]) < consumable.radius:
+                    self.energy += consumable.consume()
+            self.energy = max(self.energy, 0) # prevent energy falling below zero
+            self.energy = min(self.energy, self.maximum_energy) # prevent energy going over "full"
+
+            if self.energy <= 0:
+                self.alive = False
 
     def drop_pheromones(self, dt):
         """
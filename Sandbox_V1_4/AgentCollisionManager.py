@@ -16,9 +16,10 @@ class AgentCollisionManager(System):
 		attempts = 0
 		while not bumps and attempts < max_attempts:
 			bumps = False
-			np.random.shuffle(self.agents)
-			for a in self.agents:
-				for a2 in self.agents:
+			# visit agents in a random order, without reordering the list, which may be shared with the Simulator
+			agents = [self.agents[i] for i in self.get_rng().permutation(len(self.agents))]
+			for a in agents:
+				for a2 in agents:
 					if a != a2:
 						delta_x = a.x - a2.x
 						delta_y = a.y - a2.y
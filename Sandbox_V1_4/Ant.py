@@ -5,6 +5,7 @@ from .Motor import *
 from .MotorSpeedSensor import *
 from .CompassSensor import *
 from .AntController import *
+from .Kinematics import *
 
 import math
 
@@ -12,6 +13,13 @@ class Ant(Agent):
     """
 
     """
+    # step_sensors only steps the sensors in the sensors list, so a SensorRegistry can step them instead
+    sensor_batching = True
+    # integrate_batch is a vectorised version of integrate, so ants can be stepped together (see Agent.step_batch)
+    step_batching = True
+    # the integrator which ants' motion is integrated with (see Kinematics)
+    integrator: str = "semi_implicit"
+
     def __init__(self, x: float, y: float, theta: float,
                        controller: AntController,
                        sensors: List[Sensor],
@@ -212,7 +220,7 @@ class Ant(Agent):
 
             Only called from step().
 
-            Applies a motor activation vector to an ant state, and simulates the consequences using Euler integration over a dt interval.
+            Applies a motor activation vector to an ant state, and simulates the consequences over a dt interval, with the ant's ``integrator`` (see :class:`Kinematics`).
 
             :param dt: Interval of time to integrate the ant's motion over.
             :type dt: float
@@ -220,42 +228,30 @@ class Ant(Agent):
             :param speeds: The ant's motor speeds.
             :type speeds: list[float]
         """
-        self.theta += speeds[1] * dt
-
-        self.x += speeds[0] * math.cos(self.theta) * dt
-        self.y += speeds[0] * math.sin(self.theta) * dt
+        self.x, self.y, self.theta = Kinematics.integrate(self.x, self.y, self.theta, speeds[0], speeds[1], dt, self.integrator)
 
-    def update_energy(self, actual_speeds, dt):
+    @classmethod
+    def integrate_batch(cls, ants: List["Ant"], speeds: np.ndarray, dt: float) -> None:
         """
-            Update the ant's energy level, based on its metabolic and action costs.
+            Integrate the motion of a group of ants, which all have the same integrator, in the same way as ``integrate``, but all at once (see ``Agent.step_batch``).
 
-            :param dt: Interval of time to integrate the ant's energy losses over.
-            :type dt: float
+            Only called from step_batch().
 
-            :param actual_speeds: The ant's current motor speeds.
-            :type actual_speeds: list[float]
+            :param ants: The ants.
+            :type ants: list[:class:`Ant`]
+
+            :param speeds: The ants' motor speeds, with a row for each ant.
+            :type speeds: :class:`numpy.ndarray`
+
+            :param dt: Interval of time to integrate the ants' motion over.
+            :type dt: float
         """
-        # energy losses - allows ant to die here *before* it can consume anything
-        if self.alive:
-            # update energy. the faster the ant's wheels turn, the quicker it loses energy
-            self.energy -= np.abs(actual_speeds[0]) * dt * self.action_energy_cost
-            self.energy -= np.abs(actual_speeds[1]) * dt * self.action_energy_cost
-            self.energy -= dt * self.metabolism_energy_cost  # some energy is lost even if the ant does not move
-            self.energy = max(self.energy, 0)  # prevent energy falling below zero
-
-            if self.energy <= 0:
-                self.alive = False
-
-        # energy consumption - can include gains and losses ("negative energy")
-        if self.consumables is not None and self.alive:
-            for consumable in self.consumables:
-                if np.linalg.norm([self.x-consumable.x, self.y-consumable.y]) < consumable.radius:
-                    self.energy += consumable.consume()
-            self.energy = max(self.energy, 0) # prevent energy falling below zero
-            self.energy = min(self.energy, self.maximum_energy) # prevent energy going over "full"
-
-            if self.energy <= 0:
-                self.alive = False
+        x = np.array([ant.x for ant in ants], dtype=float)
+        y = np.array([ant.y for ant in ants], dtype=float)
+        theta = np.array([ant.theta for ant in ants], dtype=float)
+        x, y, theta = Kinematics.integrate_batch(x, y, theta, speeds[:, 0], speeds[:, 1], dt, ants[0].integrator)
+        for ant, ant_x, ant_y, ant_theta in zip(ants, x.tolist(), y.tolist(), theta.tolist()):
+            ant.x, ant.y, ant.theta = ant_x, ant_y, ant_theta
 
     # update positions and orientations of all sensors
     def update_children_positions(self) -> None:
@@ -277,7 +273,7 @@ class Ant(Agent):
                 sensor.y = self.y + (self.radius * np.sin(self.theta + self.sensor_angles[i]))
                 sensor.theta = self.thetas[-1] + self.sensor_angles[i]
 
-    def get_data(self) -> Dict[str, Dict[str, Any]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Dict[str, Any]]:
         """
             Get the ant's simulation data, including the data from its sensors, motors and controller.
 
@@ -289,20 +285,20 @@ class Ant(Agent):
             * data from the ant's sensors: ``data["sensors"]``
             * data from the ant's motors: ``data["motors"]``
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
         data["classname"] = "Ant"
 
         data["sensors"] = []
         for sensor in self.sensors:
-            data["sensors"].append(sensor.get_data())
+            data["sensors"].append(sensor.get_data(copy))
 
         # data["move_motor"] = self.move_motor.get_data()
         # data["turn_motor"] = self.turn_motor.get_data()
 
-        data["motors"] = [self.move_motor.get_data(), self.turn_motor.get_data()]
+        data["motors"] = [self.move_motor.get_data(copy), self.turn_motor.get_data(copy)]
 
-        data["controller"] = self.controller.get_data()
+        data["controller"] = self.controller.get_data(copy)
 
         # WHAT TO DO ABOUT CONSUMABLES?
 
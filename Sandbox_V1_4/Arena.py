@@ -49,7 +49,7 @@ class Arena(System):
         self.y_bottom = y_bottom
         self.keep_out = keep_out
 
-        self.initial_state = self.get_data()
+        self.initial_state = self.get_data(copy=True)
 
     # step arena
     def step(self, dt: float, x_move: float=None, y_move: float=None) -> None:
@@ -170,7 +170,7 @@ class Arena(System):
         self.keep_out = self.initial_state["keep_out"]
         # self.agents = self.initial_state["agents"]
 
-    def get_data(self):
+    def get_data(self, copy: bool=False):
         """
             A function to get the data from an :class:`Arena`, in the form of a string-keyed dict.
 
@@ -186,7 +186,7 @@ class Arena(System):
             :return: The System's data.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
         data["x_left"] = self.x_left
         data["x_right"] = self.x_right
@@ -7,6 +7,7 @@ from .CompassSensor import *
 from .HeadingSensor import *
 from .BeeController import *
 from .MotorSpeedSensor import *
+from .Kinematics import *
 
 from typing import Dict, List
 
@@ -16,6 +17,13 @@ class Bee(Agent):
     """
        A class to represent a bee, or a drone like a quadcopter, which can control its orientation and direction of travel independently.
     """
+    # step_sensors only steps the sensors in the sensors list, so a SensorRegistry can step them instead
+    sensor_batching = True
+    # integrate_batch is a vectorised version of integrate, so bees can be stepped together (see Agent.step_batch)
+    step_batching = True
+    # the integrator which bees' motion is integrated with (see Kinematics)
+    integrator: str = "semi_implicit"
+
     def __init__(self, x: float,
                         y: float,
                         theta: float,
@@ -184,10 +192,10 @@ class Bee(Agent):
         self.controller: NewBeeController = controller
 
         self.heading = heading
-        self.headings: List[float] = [heading]
+        self.headings: History = History([heading])
 
         self.speed: float = 0
-        self.speeds: List[float] = [self.speed]
+        self.speeds: History = History([self.speed])
 
         self.update_children_positions()
 
@@ -240,46 +248,13 @@ class Bee(Agent):
 
         return speed_commands
 
-    def update_energy(self, actual_speeds, dt):
-        """
-            Update the bee's energy level, based on its metabolic and action costs.
-
-            :param dt: Interval of time to integrate the bee's energy losses over.
-            :type dt: float
-
-            :param actual_speeds: The bee's current motor speeds.
-            :type actual_speeds: list[float]
-        """
-        # energy losses - allows bee to die here *before* it can consume anything
-        if self.alive:
-            # update energy. the faster the bee's wheels turn, the quicker it loses energy
-            self.energy -= np.abs(actual_speeds[0]) * dt * self.action_energy_cost
-            self.energy -= np.abs(actual_speeds[1]) * dt * self.action_energy_cost
-            self.energy -= np.abs(actual_speeds[2]) * dt * self.action_energy_cost
-            self.energy -= dt * self.metabolism_energy_cost  # some energy is lost even if the bee does not move
-            self.energy = max(self.energy, 0)  # prevent energy falling below zero
-
-            if self.energy <= 0:
-                self.alive = False
-
-        # energy consumption - can include gains and losses ("negative energy")
-        if self.consumables is not None and self.alive:
-            for consumable in self.consumables:
-                if np.linalg.norm([self.x-consumable.x, self.y-consumable.y]) < consumable.radius:
-                    self.energy += consumable.consume()
-            self.energy = max(self.energy, 0) # prevent energy falling below zero
-            self.energy = min(self.energy, self.maximum_energy) # prevent energy going over "full"
-
-            if self.energy <= 0:
-                self.alive = False
-
     def integrate(self, speeds: List[float], dt: float) -> None:
         """
             Integrate the bee's motion based on its motor speeds.
 
             Only called from step().
 
-            Applies a motor activation vector to a bee state, and simulates the consequences using Euler integration over a dt interval.
+            Applies a motor activation vector to a bee state, and simulates the consequences over a dt interval, with the bee's ``integrator`` (see :class:`Kinematics`).
 
             :param dt: Interval of time to integrate the bee's motion over.
             :type dt: float
@@ -290,13 +265,37 @@ class Bee(Agent):
         self.speed = speeds[1]
         self.speeds.append(self.speed)
 
+        # the bee's body turns independently of its direction of travel
         self.theta += speeds[0] * dt
 
-        self.heading += speeds[2] * dt
+        self.x, self.y, self.heading = Kinematics.integrate(self.x, self.y, self.heading, self.speed, speeds[2], dt, self.integrator)
         self.headings.append(self.heading)
 
-        self.x += self.speed * math.cos(self.heading) * dt
-        self.y += self.speed * math.sin(self.heading) * dt
+    @classmethod
+    def integrate_batch(cls, bees: List["Bee"], speeds: np.ndarray, dt: float) -> None:
+        """
+            Integrate the motion of a group of bees, which all have the same integrator, in the same way as ``integrate``, but all at once (see ``Agent.step_batch``).
+
+            Only called from step_batch().
+
+            :param bees: The bees.
+            :type bees: list[:class:`Bee`]
+
+            :param speeds: The bees' motor speeds, with a row for each bee.
+            :type speeds: :class:`numpy.ndarray`
+
+            :param dt: Interval of time to integrate the bees' motion over.
+            :type dt: float
+        """
+        x = np.array([bee.x for bee in bees], dtype=float)
+        y = np.array([bee.y for bee in bees], dtype=float)
+        theta = np.array([bee.theta for bee in bees], dtype=float) + speeds[:, 0] * dt
+        heading = np.array([bee.heading for bee in bees], dtype=float)
+        x, y, heading = Kinematics.integrate_batch(x, y, heading, speeds[:, 1], speeds[:, 2], dt, bees[0].integrator)
+        for bee, bee_x, bee_y, bee_theta, bee_heading, bee_speed in zip(bees, x.tolist(), y.tolist(), theta.tolist(), heading.tolist(), speeds[:, 1].tolist()):
+            bee.x, bee.y, bee.theta, bee.heading, bee.speed = bee_x, bee_y, bee_theta, bee_heading, bee_speed
+            bee.speeds.append(bee_speed)
+            bee.headings.append(bee_heading)
 
     # update positions and orientations of all sensors
     def update_children_positions(self) -> None:
@@ -320,7 +319,7 @@ class Bee(Agent):
             if sensor.has_orientation and self.sensor_angles[i] != None:
                 sensor.theta = self.thetas[-1] + self.sensor_angles[i]
 
-    def get_data(self) -> Dict[str, Dict[str, Any]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Dict[str, Any]]:
         """
             A function to get the data from a :class:`Bee`, in the form of a string-keyed dict.
 
@@ -334,18 +333,18 @@ class Bee(Agent):
             * a complete history of the bee's speed: ``data["speeds"]``
             * a complete history of the bee's heading: ``data["headings"]``
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
         data["classname"] = "Bee"
 
         data["sensors"] = []
         for sensor in self.sensors:
-            data["sensors"].append(sensor.get_data())
+            data["sensors"].append(sensor.get_data(copy))
 
-        data["motors"] = [self.speed_motor.get_data(), self.theta_motor.get_data(), self.heading_motor.get_data()]
-        data["headings"] = self.headings[:]
-        data["speeds"] = self.speeds[:]
-        data["controller"] = self.controller.get_data()
+        data["motors"] = [self.speed_motor.get_data(copy), self.theta_motor.get_data(copy), self.heading_motor.get_data(copy)]
+        data["headings"] = self.headings.get_values(copy)
+        data["speeds"] = self.speeds.get_values(copy)
+        data["controller"] = self.controller.get_data(copy)
 
         # WHAT TO DO ABOUT CONSUMABLES?
 
@@ -363,11 +362,11 @@ class Bee(Agent):
         self.theta_motor.reset()
         self.heading_motor.reset()
 
-        self.heading = self.headings[0]
-        self.headings = [self.heading]
+        self.heading = self.headings.first
+        self.headings = History([self.heading])
 
-        self.speed = self.speeds[0]
-        self.speeds = [self.speed]
+        self.speed = self.speeds.first
+        self.speeds = History([self.speed])
 
         # this assumes that no sensors have been added or removed
         for i, sensor in enumerate(self.sensors):
@@ -0,0 +1,177 @@
+from .base import *
+
+class BrightnessModel:
+    """
+        A model of how the brightness of a :class:`LightSource` decays with distance, which is selected by the light's ``model`` attribute. Models are registered by name, with :meth:`register`, and are the only place where brightness is computed: both ``LightSource.get_brightness_at``, for single points, and :class:`LightSourceField`, for whole arrays of lights and sensors, call the same model's ``kernel``.
+
+        A kernel is a function ``kernel(dist, angle, brightness, gradient)``, which takes arrays (or single numbers) of the distances from lights to points, the angles between the lights' orientations and the directions of the points from them (which are always less than the lights' half-spreads), and the lights' ``brightness`` and ``gradient`` attributes, and returns the brightness at the points. Kernels are written with NumPy operations which broadcast, so that the same kernel works for any shapes of inputs (a kernel may return an array of a smaller shape, e.g. ``brightness`` alone, which is then broadcast).
+
+        A model can also have a ``radius`` function, ``radius(brightness, gradient, cutoff)``, which returns the distances at which lights' brightness falls to ``cutoff``, so that sensors with a ``cutoff`` can ignore lights beyond those distances (see :class:`LightSourceField`). Models without one are never cut off. A ``radius`` function should only be given if brightness never increases with distance, or with angle, so that the brightness at the cutoff radius bounds the brightness of ignored lights.
+
+        The built-in models are:
+
+        * ``inv_sq``: ``brightness / (dist + 1)**2``
+        * ``linear``: ``max(brightness - gradient * dist, 0)``
+        * ``binary``: ``brightness``, at any distance
+        * ``exponential``: ``brightness * exp(-gradient * dist)``
+        * ``gaussian``: ``brightness * exp(-(gradient * dist)**2 / 2)``, i.e. a Gaussian with a standard deviation of ``1 / gradient``
+
+        Each model has an integer ``code``, which is the order it was registered in, and which is how :class:`LightSourceField` stores its lights' models. Models should be registered before any fields are built with lights which use them: lights whose models are not registered are never detected.
+    """
+    # the registered models, by name and by code
+    models: Dict[str, "BrightnessModel"] = {}
+    codes: List["BrightnessModel"] = []
+
+    def __init__(self, name: str, kernel: Callable, radius: Callable=None):
+        """
+            __init__(name: str, kernel: Callable, radius: Callable=None)
+
+            Normally, :meth:`register` should be used instead of constructing a model directly.
+
+            :param name: The model's name, which lights select it by.
+            :type name: str
+
+            :param kernel: The function which computes brightness, ``kernel(dist, angle, brightness, gradient)``.
+            :type kernel: function
+
+            :param radius: The function which computes cutoff radii, ``radius(brightness, gradient, cutoff)``. Defaults to ``None``, in which case lights with this model are never cut off.
+            :type radius: function
+        """
+        self.name = name
+        self.kernel = kernel
+        self.radius = radius
+        self.code: int = None
+
+    @staticmethod
+    def register(name: str, kernel: Callable, radius: Callable=None) -> "BrightnessModel":
+        """
+            Register a brightness model, so that lights can use it by setting their ``model`` attribute to ``name``. If a model with the same name has already been registered, then it is replaced, and keeps its code.
+
+            :param name: The model's name.
+            :type name: str
+
+            :param kernel: The function which computes brightness, ``kernel(dist, angle, brightness, gradient)``.
+            :type kernel: function
+
+            :param radius: The function which computes cutoff radii, ``radius(brightness, gradient, cutoff)``. Defaults to ``None``.
+            :type radius: function
+
+            :return: The model.
+            :rtype: :class:`BrightnessModel`
+        """
+        model = BrightnessModel(name, kernel, radius)
+        if name in BrightnessModel.models:
+            model.code = BrightnessModel.models[name].code
+            BrightnessModel.codes[model.code] = model
+        else:
+            model.code = len(BrightnessModel.codes)
+            BrightnessModel.codes.append(model)
+        BrightnessModel.models[name] = model
+        return model
+
+    @staticmethod
+    def get_code(name: str) -> int:
+        """
+            Get the code of the model with the given name.
+
+            :param name: The model's name.
+            :type name: str
+
+            :return: The model's code, or ``-1`` if there is no model with that name.
+            :rtype: int
+        """
+        model = BrightnessModel.models.get(name)
+        return -1 if model is None else model.code
+
+    @staticmethod
+    def evaluate(codes: np.ndarray, dist, angle, brightness, gradient) -> np.ndarray:
+        """
+            Compute the brightness of lights with different models. When the lights all have the same model, its kernel is called with the arrays as they are, and otherwise, each model's kernel is called with only the elements for the lights which use it, so no kernel computes brightness for lights of other models.
+
+            :param codes: The codes of the lights' models. Lights with the code ``-1`` have a brightness of ``0``.
+            :type codes: :class:`numpy.ndarray`
+
+            :param dist: The distances, which are broadcast with the lights' arrays.
+            :type dist: :class:`numpy.ndarray`
+
+            :param angle: The angles from the lights' orientations, which are broadcast in the same way.
+            :type angle: :class:`numpy.ndarray`
+
+            :param brightness: The lights' brightness.
+            :type brightness: :class:`numpy.ndarray`
+
+            :param gradient: The lights' gradients.
+            :type gradient: :class:`numpy.ndarray`
+
+            :return: The brightness.
+            :rtype: :class:`numpy.ndarray`
+        """
+        shape = np.broadcast(codes, dist, angle, brightness, gradient).shape
+        if np.size(codes) == 0:
+            return np.zeros(shape)
+        lowest, highest = int(np.min(codes)), int(np.max(codes))
+        if lowest == highest:
+            # the common case, where all of the lights have the same model
+            if lowest < 0:
+                return np.zeros(shape)
+            return np.zeros(shape) + BrightnessModel.codes[lowest].kernel(dist, angle, brightness, gradient)
+        # otherwise, each kernel is only given the elements for the lights which use its model
+        inputs = [np.broadcast_to(a, shape) for a in (dist, angle, brightness, gradient)]
+        codes = np.broadcast_to(codes, shape)
+        result = np.zeros(shape)
+        for code in range(max(lowest, 0), highest + 1):
+            uses = codes == code
+            if np.any(uses):
+                result[uses] = BrightnessModel.codes[code].kernel(*[a[uses] for a in inputs])
+        return result
+
+    @staticmethod
+    def get_radius(codes: np.ndarray, brightness: np.ndarray, gradient: np.ndarray, cutoff: float) -> np.ndarray:
+        """
+            Get the distances at which lights' brightness falls to ``cutoff``, according to their models. Lights whose models have no ``radius`` function have infinite radii, and lights which are never as bright as ``cutoff`` have radii of ``-inf``.
+
+            :param codes: The codes of the lights' models.
+            :type codes: :class:`numpy.ndarray`
+
+            :param brightness: The lights' brightness.
+            :type brightness: :class:`numpy.ndarray`
+
+            :param gradient: The lights' gradients.
+            :type gradient: :class:`numpy.ndarray`
+
+            :param cutoff: The cutoff brightness.
+            :type cutoff: float
+
+            :return: The radii.
+            :rtype: :class:`numpy.ndarray`
+        """
+        radius = np.full(len(codes), np.inf)
+        for model in BrightnessModel.codes:
+            uses = codes == model.code
+            if model.radius is not None and np.any(uses):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    radius[uses] = model.radius(brightness[uses], gradient[uses], cutoff)
+        radius[radius < 0] = -np.inf
+        return radius
+
+
+def _positive(gradient: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    # lights which do not decay are never cut off, however bright they are
+    return np.where(gradient > 0, radius, np.inf)
+
+BrightnessModel.register("inv_sq",
+                         lambda dist, angle, brightness, gradient: brightness / np.power(dist + 1, 2),  # 1 is added to fix brightness at dist=0
+                         lambda brightness, gradient, cutoff: np.sqrt(brightness / cutoff) - 1)
+BrightnessModel.register("linear",
+                         lambda dist, angle, brightness, gradient: np.maximum(brightness - gradient * dist, 0),
+                         lambda brightness, gradient, cutoff: _positive(gradient, (brightness - cutoff) / gradient))
+BrightnessModel.register("binary",
+                         lambda dist, angle, brightness, gradient: brightness,
+                         # binary lights are either always above the cutoff, or never
+                         lambda brightness, gradient, cutoff: np.where(brightness < cutoff, -np.inf, np.inf))
+BrightnessModel.register("exponential",
+                         lambda dist, angle, brightness, gradient: brightness * np.exp(-gradient * dist),
+                         lambda brightness, gradient, cutoff: _positive(gradient, np.log(brightness / cutoff) / gradient))
+BrightnessModel.register("gaussian",
+                         lambda dist, angle, brightness, gradient: brightness * np.exp(-np.square(gradient * dist) / 2),
+                         lambda brightness, gradient, cutoff: np.where(brightness < cutoff, -np.inf, _positive(gradient, np.sqrt(2 * np.log(brightness / cutoff)) / gradient)))
@@ -6,13 +6,13 @@ class BumpSensor(Sensor):
 
         super().__init__(name_str=name_str, delay_steps=delay_steps)
         self.activation = False
-        self.activations = [self.activation]
+        self.activations = History([self.activation])
         self.p_noise = p_noise
 
     def step(self, dt):
         super().step(dt)
 
-        if np.random.random() < self.p_noise:
+        if self.get_rng().random() < self.p_noise:
             self.activation = not self.activation
 
         r = self.update(dt)
@@ -24,7 +24,7 @@ class BumpSensor(Sensor):
         self.activation = True
 
     # A method to get the sensor's data, in the form of a dict.
-    def get_data(self) -> dict:
+    def get_data(self, copy: bool=False) -> dict:
         """
             A function to get the data from a :class:`CompassSensor`, in the form of a string-keyed dict.
 
@@ -37,11 +37,11 @@ class BumpSensor(Sensor):
             :return: The sensors's data.
             :rtype: dict
         """
-        data = super().get_data()
-        data["activations"] = self.activations
+        data = super().get_data(copy)
+        data["activations"] = self.activations.get_values(copy)
         data["noises"] =  None
         if self.noisemaker:
-            data["noises"] = self.noisemaker.get_data()["noises"]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         return data
 
     def reset(self):
@@ -49,7 +49,7 @@ class BumpSensor(Sensor):
             A method to reset the sensor to its initial state, so that it can be reused in a later simulation.
         """
         super().reset()
-        self.activation = self.activations[0]
-        self.activations = [self.activation]
+        self.activation = self.activations.first
+        self.activations = History([self.activation])
         if self.noisemaker:
             self.noisemaker.reset()
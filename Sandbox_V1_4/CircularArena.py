@@ -41,7 +41,7 @@ class CircularArena(System):
         self.radius = radius
         self.keep_out = keep_out
 
-        self.initial_state = self.get_data()
+        self.initial_state = self.get_data(copy=True)
 
     # step arena
     def step(self, dt: float, x_move: float=None, y_move: float=None) -> None:
@@ -110,7 +110,7 @@ class CircularArena(System):
         self.keep_out = self.initial_state["keep_out"]
         # self.agents = self.initial_state["agents"]
 
-    def get_data(self):
+    def get_data(self, copy: bool=False):
         """
             A function to get the data from a :class:`CircularArena`, in the form of a string-keyed dict.
 
@@ -123,7 +123,7 @@ class CircularArena(System):
             :return: The System's data.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
         data["radius"] = self.radius
         data["keep_out"] = self.keep_out
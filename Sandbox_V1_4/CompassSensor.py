@@ -25,7 +25,7 @@ class CompassSensor(Sensor):
         """
         super().__init__(x=x, y=y, theta=theta, name_str=name_str, noisemaker=noisemaker, delay_steps=delay_steps)
         self.activation = 0  # sensor activation. this variable is updated in and returned from the step method. it is stored separately in case you want to access it multiple times between simulation steps, although that is unlikely to be necessary
-        self.activations = [self.activation]  # for plotting and analysis, a sensor keeps a complete record of its activation over time
+        self.activations = History([self.activation])  # for plotting and analysis, a sensor keeps a complete record of its activation over time
 
     # step sensor
     def step(self, dt):
@@ -44,7 +44,7 @@ class CompassSensor(Sensor):
         return self.update(dt)
 
     # A method to get the sensor's data, in the form of a dict.
-    def get_data(self) -> dict:
+    def get_data(self, copy: bool=False) -> dict:
         """
             A function to get the data from a :class:`CompassSensor`, in the form of a string-keyed dict.
 
@@ -57,11 +57,11 @@ class CompassSensor(Sensor):
             :return: The sensors's data.
             :rtype: dict
         """
-        data = super().get_data()
-        data["activations"] = self.activations
+        data = super().get_data(copy)
+        data["activations"] = self.activations.get_values(copy)
         data["noises"] =  None
         if self.noisemaker:
-            data["noises"] = self.noisemaker.get_data()["noises"]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         return data
 
 
@@ -70,7 +70,7 @@ class CompassSensor(Sensor):
             A method to reset the sensor to its initial state, so that it can be reused in a later simulation.
         """
         super().reset()
-        self.activation = self.activations[0]
-        self.activations = [self.activation]
+        self.activation = self.activations.first
+        self.activations = History([self.activation])
         if self.noisemaker:
             self.noisemaker.reset()
@@ -40,7 +40,7 @@ class Consumable(System):
         self.recovery_time = recovery_time  # when an item is consumed, it can reappear when the recovery time expires. if you don't want it to recover, then just make this time longer than your simulation duration
         self.initial_recovery_time = recovery_time
         self.depleted = False  # initially, a Consumable is not depleted. When it is consumed, it is depleted and will be invisible until (and if) it recovers
-        self.depleteds = [False]
+        self.depleteds = History([False])
         self.time_since_consumed = 0  # used to track time to recover
         self.radius = radius  # this is the radius within which an Agent will potentially consume this Consumable
         self.initial_radius = radius
@@ -115,14 +115,14 @@ class Consumable(System):
         """
         super().reset()
         self.depleted = False  # initially, a Consumable is not depleted. When it is consumed, it is depleted and will be invisible until (and if) it recovers
-        self.depleteds = [False]
+        self.depleteds = History([False])
         self.time_since_consumed = 0  # used to track time to recover
         self.stimulus.reset()
         self.radius = self.initial_radius
         self.recovery_time = self.initial_recovery_time
         self.quantity = self.initial_quantity
 
-    def get_data(self):
+    def get_data(self, copy: bool=False):
         """
             A function to get the data from a :class:`Consumable`, in the form of a string-keyed dict.
 
@@ -132,9 +132,9 @@ class Consumable(System):
             * data from the attached :class:`LightSource`: ``data["light_source"]``
             * the history of when the consumable is/isn't depleted: ``data["depleteds"]``
         """
-        data = super().get_data()
-        data["light_source"] = self.stimulus.get_data()
-        data["depleteds"] = self.depleteds
+        data = super().get_data(copy)
+        data["light_source"] = self.stimulus.get_data(copy)
+        data["depleteds"] = self.depleteds.get_values(copy)
 
 
         return data
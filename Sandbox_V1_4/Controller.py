@@ -75,13 +75,15 @@ class Controller(System):
 
         # attributes which may change have initial values saved so that the
         # controller can  be reset
+        # inputs_hist and params_hist are kept as lists, rather than Histories, as their rows can be ragged, or contain
+        # None (e.g. a Robot passes more inputs to its controller than inputs_n, some of which may be None)
         self.inputs_hist: List[List[float]] = [[0.] * inputs_n]
         self.initial_inputs_hist = []
         for input in self.inputs_hist:
             self.initial_inputs_hist.append(input)
-        self.commands_hist: List[List[float]] = [[0.] * commands_n]
+        self.commands_hist: History = History([[0.] * commands_n])
         self.initial_commands_hist = []
-        for c in self.commands_hist:
+        for c in self.commands_hist.tolist():
             self.initial_commands_hist.append(c)
         self.params = params
         self.params_hist = None
@@ -113,14 +115,14 @@ class Controller(System):
         """
         self.t = 0
         self.inputs_hist = self.initial_inputs_hist[:]
-        self.commands_hist = self.initial_commands_hist[:]
+        self.commands_hist = History(self.initial_commands_hist)
         self.params = self.initial_params
         self.params_hist = [self.params]
         if self.noisemakers:
             for noisemaker in self.noisemakers:
                 noisemaker.reset()
 
-    def get_data(self) -> Dict[str, dict]:
+    def get_data(self, copy: bool=False) -> Dict[str, dict]:
         """
             A method for getting the simulation run data from a :class:`Controller`.
 
@@ -143,13 +145,13 @@ class Controller(System):
         if self.noisemakers:
             noises = []
             for noisemaker in self.noisemakers:
-                noises.append(noisemaker.get_data()["noises"])
+                noises.append(noisemaker.get_data(copy)["noises"])
 
-        data = {"commands_hist": self.commands_hist,
+        data = {"commands_hist": self.commands_hist.get_values(copy),
                 "noisemakers_inds": self.noisemakers_inds,
                 "noises": noises,
-                "params_hist": self.params_hist,
-                "inputs_hist": self.inputs_hist,
+                "params_hist": self.params_hist[:] if copy and self.params_hist is not None else self.params_hist,
+                "inputs_hist": self.inputs_hist[:] if copy else self.inputs_hist,
                 "state_hist": self.state_hist}
 
         return data
@@ -1,51 +1,89 @@
+from .base import *
+from .History import *
+
 class DelayBlock:
     """
-        A class which implements a delay to a signal, currently only used in :class:`Sensor` classes. The class uses a buffer to store delayed signal values.
+        A class which implements a delay to a signal, currently only used in :class:`Sensor` classes. The class stores the most recent inputs in a ring buffer, which is a NumPy array, so that a block takes up the same, small, amount of memory however long a simulation runs for.
+
+        The signal can be a single number, or a vector of them (e.g. the activations of all of an agent's sensors, or of a whole population of agents), in which case every element is delayed by the same amount. The shape of the signal is taken from the first input, unless it is given when the block is constructed.
+
+        As in earlier versions of *Sandbox*, a block with a ``delay_n`` of ``n`` outputs the input which it was given ``n - 1`` steps earlier, so that delays of ``0`` and ``1`` both leave the signal as it is. Until the block has been stepped enough times, it outputs zeros. ``delay_n`` does not need to be a whole number: fractional delays are interpolated linearly between the two nearest whole-numbered delays.
+
+        A block only keeps a record of its outputs, in its ``outputs`` :class:`History`, if it is constructed with ``record=True``. Otherwise, ``outputs`` is ``None``; a :class:`Sensor` records its (delayed) activations itself, so its block does not need to.
     """
-    def __init__(self, delay_n: int):
+    def __init__(self, delay_n: float, shape: Tuple[int, ...]=None, record: bool=False):
         """
-            __init__(self, delay_n: int)
+            __init__(self, delay_n: float, shape: Tuple[int, ...]=None, record: bool=False)
 
             :param delay_n: the number of simulation steps a signal will be delayed for.
-            :type delay_n: int
+            :type delay_n: float
+
+            :param shape: The shape of the signal, e.g. ``()`` for a single number, or ``(n,)`` for a vector of ``n`` numbers. Defaults to ``None``, in which case it is taken from the first input.
+            :type shape: tuple[int]
+
+            :param record: Whether or not to keep a record of the block's outputs. Defaults to ``False``.
+            :type record: bool
         """
         # allow a delay of 0, but not negative delays, which make no sense
         assert delay_n >= 0, "delay_n must be >= 0. Negative time delays make no sense here."
         # set the number of steps that the block will delay a signal for
         self.delay_n = delay_n
-        # set up the delayed signal vector
-        self.sig = [0] * delay_n
-        # we will keep a record of the outputs from the delay block for plotting later
-        self.outputs = [0]
+        # the number of steps between an input and the output which it becomes, split into whole and fractional parts
+        lag = max(delay_n - 1, 0)
+        self.lag_steps = int(math.floor(lag))
+        self.lag_fraction = lag - self.lag_steps
+        # the buffer holds enough inputs for the longest lag, and the current one
+        self.length = self.lag_steps + (2 if self.lag_fraction > 0 else 1)
+        self.shape = shape
+        self.record = record
+        self.reset()
 
-        if delay_n > 0:
-            # set up the current index for inputs
-            self.input_index = 0
-            # set up the current index for outputs
-            self.output_index = self.delay_n-1
+    def reset(self) -> None:
+        """
+            Reset the block, by clearing its buffer (and its record of outputs, if it keeps one).
+        """
+        # the delayed signal buffer, and the index in it where the next input will be written
+        self.sig: np.ndarray = None
+        self.input_index = 0
+        self.outputs: History = None
+        if self.shape is not None:
+            self.allocate(np.zeros(self.shape))
+
+    def allocate(self, input) -> None:
+        """
+            Allocate the block's buffer, to suit the shape of ``input``.
+        """
+        self.shape = np.shape(input)
+        self.sig = np.zeros((self.length,) + self.shape)
+        if self.record:
+            # we will keep a record of the outputs from the delay block for plotting later
+            self.outputs = History([np.zeros(self.shape) if self.shape else 0.0])
 
     def step(self, input):
         """
-            Step the delayed signal forwards. Every time the delay block is stepped, the new input is placed in the buffer, and the oldest one is returned as the delayed value.
+            Step the delayed signal forwards. Every time the delay block is stepped, the new input is placed in the buffer, and the input from ``delay_n - 1`` steps earlier is returned as the delayed value.
 
             :param input: The current signal value
-            :type input: any
+            :type input: float or :class:`numpy.ndarray`
 
             :return: The delayed signal value
-            :rtype: any
-        """
-        # default output for a zero-delay block
-        output = input
-        if self.delay_n > 0:
-            # add the new input to the delay block
-            self.sig[self.input_index] = input
-            # increment the input index for the next input, and use the modulo operator to "wrap round"
-            self.input_index = (self.input_index + 1) % self.delay_n
-            # increment the input index for the next output, and use the modulo operator to "wrap round"
-            self.output_index = (self.input_index + self.delay_n) % self.delay_n
-            # set the output to the delayed output
-            output = self.sig[self.output_index]
+            :rtype: float or :class:`numpy.ndarray`
+        """
+        if self.sig is None:
+            self.allocate(input)
+        # add the new input to the delay block
+        self.sig[self.input_index] = input
+        # find the delayed output, using negative indices to "wrap round"
+        output = self.sig[self.input_index - self.lag_steps]
+        if self.lag_fraction > 0:
+            output = (1 - self.lag_fraction) * output + self.lag_fraction * self.sig[self.input_index - self.lag_steps - 1]
+        # increment the input index for the next input, and "wrap round"
+        self.input_index += 1
+        if self.input_index == self.length:
+            self.input_index = 0
+        output = output.copy() if self.shape else float(output)
         # add the output to the record
-        self.outputs.append(output)
+        if self.outputs is not None:
+            self.outputs.append(output)
         # return the output
         return output
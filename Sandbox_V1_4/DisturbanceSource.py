@@ -323,9 +323,11 @@ class MotorNoiseDisturbanceSource(DisturbanceSource):
                  spike_noise_params: List[float]=[0.0, 0.0, 0.0],
                  start_times=[],
                  stop_times=[],
-                 enabled=False):
+                 enabled=False,
+                 ou_noise_params: List[float]=[0.0, 0.0],
+                 pink_noise_std: float=0):
         """
-            __init__(self, motor, white_noise_params: List[float]=[0.0, 0.0], brown_noise_step: float=0, spike_noise_params: List[float]=[0.0, 0.0, 0.0], start_times=[], stop_times=[], enabled=False)
+            __init__(self, motor, white_noise_params: List[float]=[0.0, 0.0], brown_noise_step: float=0, spike_noise_params: List[float]=[0.0, 0.0, 0.0], start_times=[], stop_times=[], enabled=False, ou_noise_params: List[float]=[0.0, 0.0], pink_noise_std: float=0)
 
             :param motor: The :class:`Motor` to be disturbed.
             :type motor: :class:`Motor`
@@ -345,10 +347,16 @@ class MotorNoiseDisturbanceSource(DisturbanceSource):
             :type stop_times: list[int]
 
             :param enabled: The parameter which determines whether or not the :class:`DisturbanceSource` is active.
+
+            :param ou_noise_params: Parameters for the :class:`OUNoiseSource` component of the :class:`NoiseMaker`, in the form ``[tau, std]``.
+            :type ou_noise_params: list[float]
+
+            :param pink_noise_std: The standard deviation of the :class:`PinkNoiseSource` component of the :class:`NoiseMaker`.
+            :type pink_noise_std: float
         """
         super().__init__(start_times, stop_times, enabled)
         self.motor = motor
-        self.noisesource = NoiseMaker(white_noise_params, brown_noise_step, spike_noise_params)
+        self.noisesource = NoiseMaker(white_noise_params, brown_noise_step, spike_noise_params, ou_noise_params, pink_noise_std)
 
     # step disturbance
     def step(self, dt):
@@ -367,6 +375,7 @@ class MotorNoiseDisturbanceSource(DisturbanceSource):
             Reset disturbance, so it can be re-used in later simulations.
         """
         super().reset()
+        self.noisesource.reset()
 
 class PathDisturbanceSource(DisturbanceSource):
     '''
@@ -442,13 +451,14 @@ class PathDisturbanceSource(DisturbanceSource):
             :type dt: float
         """
         super().step(dt)
+        rng = self.get_rng()
         if self.enabled:
             for j, p in enumerate(self.points):
                 # print(j)
                 i = p
                 # d = 0.4
-                self.light_sources[p].x += self.signs[j] * random_in_interval(0, self.d)
-                self.light_sources[p].y += self.signs2[j] * random_in_interval(0, self.d)
+                self.light_sources[p].x += self.signs[j] * random_in_interval(0, self.d, rng)
+                self.light_sources[p].y += self.signs2[j] * random_in_interval(0, self.d, rng)
 
                 neighbour1 = self.neighbourhoods[i][0]
                 neighbour11 = self.neighbourhoods[neighbour1][0]
@@ -507,9 +517,9 @@ class PathDisturbanceSource(DisturbanceSource):
                     s.x = ratio * vx + self.centroidx
                     s.y = ratio * vy + self.centroidy
         else:
-            self.points = np.random.choice(self.l, self.n_points)
-            self.signs = np.random.choice([-1, 0, 1], self.n_points)
-            self.signs2 = np.random.choice([-1, 0, 1], self.n_points)
+            self.points = rng.choice(self.l, self.n_points)
+            self.signs = rng.choice([-1, 0, 1], self.n_points)
+            self.signs2 = rng.choice([-1, 0, 1], self.n_points)
 
 # # broken by updates to Robot
 # class SensorLabelSwitcherDisturbance(DisturbanceSource):
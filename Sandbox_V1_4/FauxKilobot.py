@@ -7,11 +7,19 @@ from .Radio import *
 from .CompassSensor import *
 from .HeadingSensor import *
 from .MotorSpeedSensor import *
+from .Kinematics import *
 
 class FauxKilobot(Agent):
     """
         A class to simulate a robot which is loosely inspired by Kilobot.
     """
+    # step_sensors only steps the sensors in the sensors list, so a SensorRegistry can step them instead
+    sensor_batching = True
+    # integrate_batch is a vectorised version of integrate, so FauxKilobots can be stepped together (see Agent.step_batch)
+    step_batching = True
+    # the integrator which FauxKilobots' motion is integrated with (see Kinematics)
+    integrator: str = "semi_implicit"
+
     def __init__(self, x: float, y: float, theta: float,
                        controller: FauxKilobotController,
                        sensors: List[Sensor],
@@ -147,7 +155,7 @@ class FauxKilobot(Agent):
         self.consumables = consumables
 
         self.heading = 0
-        self.headings = [self.heading]
+        self.headings = History([self.heading])
 
         self.radio = Radio(x=self.x, y=self.y, transmitter_range=radio_t_range, receiver_range=radio_r_range, enabled=radio_enabled)
 
@@ -207,7 +215,7 @@ class FauxKilobot(Agent):
 
             Only called from step().
 
-            Applies a motor activation vector to a FauxKilobot state, and simulates the consequences using Euler integration over a dt interval.
+            Applies a motor activation vector to a FauxKilobot state, and simulates the consequences over a dt interval, with the FauxKilobot's ``integrator`` (see :class:`Kinematics`).
 
             :param dt: Interval of time to integrate the FauxKilobot's motion over.
             :type dt: float
@@ -215,42 +223,31 @@ class FauxKilobot(Agent):
             :param speeds: The FauxKilobot's motor speeds.
             :type speeds: list[float]
         """
-        self.heading += speeds[1] * dt
-
-        self.x += speeds[0] * math.cos(self.heading) * dt
-        self.y += speeds[0] * math.sin(self.heading) * dt
+        # a FauxKilobot moves in the direction of its heading
+        self.x, self.y, self.heading = Kinematics.integrate(self.x, self.y, self.heading, speeds[0], speeds[1], dt, self.integrator)
 
-    def update_energy(self, actual_speeds, dt):
+    @classmethod
+    def integrate_batch(cls, kilobots: List["FauxKilobot"], speeds: np.ndarray, dt: float) -> None:
         """
-            Update the FauxKilobot's energy level, based on its metabolic and action costs.
+            Integrate the motion of a group of FauxKilobots, which all have the same integrator, in the same way as ``integrate``, but all at once (see ``Agent.step_batch``).
 
-            :param dt: Interval of time to integrate the FauxKilobot's energy losses over.
-            :type dt: float
+            Only called from step_batch().
 
-            :param actual_speeds: The FauxKilobot's current motor speeds.
-            :type actual_speeds: list[float]
+            :param kilobots: The FauxKilobots.
+            :type kilobots: list[:class:`FauxKilobot`]
+
+            :param speeds: The FauxKilobots' motor speeds, with a row for each FauxKilobot.
+            :type speeds: :class:`numpy.ndarray`
+
+            :param dt: Interval of time to integrate the FauxKilobots' motion over.
+            :type dt: float
         """
-        # energy losses - allows FauxKilobot to die here *before* it can consume anything
-        if self.alive:
-            # update energy. the faster the robot's motors turn, the quicker it loses energy
-            self.energy -= np.abs(actual_speeds[0]) * dt * self.action_energy_cost
-            self.energy -= np.abs(actual_speeds[1]) * dt * self.action_energy_cost
-            self.energy -= dt * self.metabolism_energy_cost  # some energy is lost even if the robot does not move
-            self.energy = max(self.energy, 0)  # prevent energy falling below zero
-
-            if self.energy <= 0:
-                self.alive = False
-
-        # energy consumption - can include gains and losses ("negative energy")
-        if self.consumables is not None and self.alive:
-            for consumable in self.consumables:
-                if np.linalg.norm([self.x-consumable.x, self.y-consumable.y]) < consumable.radius:
-                    self.energy += consumable.consume()
-            self.energy = max(self.energy, 0) # prevent energy falling below zero
-            self.energy = min(self.energy, self.maximum_energy) # prevent energy going over "full"
-
-            if self.energy <= 0:
-                self.alive = False
+        x = np.array([kilobot.x for kilobot in kilobots], dtype=float)
+        y = np.array([kilobot.y for kilobot in kilobots], dtype=float)
+        heading = np.array([kilobot.heading for kilobot in kilobots], dtype=float)
+        x, y, heading = Kinematics.integrate_batch(x, y, heading, speeds[:, 0], speeds[:, 1], dt, kilobots[0].integrator)
+        for kilobot, kilobot_x, kilobot_y, kilobot_heading in zip(kilobots, x.tolist(), y.tolist(), heading.tolist()):
+            kilobot.x, kilobot.y, kilobot.heading = kilobot_x, kilobot_y, kilobot_heading
 
     # update positions and orientations of all sensors
     def update_children_positions(self) -> None:
@@ -275,7 +272,7 @@ class FauxKilobot(Agent):
                 sensor.y = self.y + (self.radius * np.sin(self.theta + self.sensor_angles[i]))
                 sensor.theta = self.thetas[-1] + self.sensor_angles[i]
 
-    def get_data(self) -> Dict[str, Dict[str, Any]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Dict[str, Any]]:
         """
             A function to get the data from a :class:`FauxKilobot`, in the form of a string-keyed dict.
 
@@ -288,19 +285,19 @@ class FauxKilobot(Agent):
             * data from the FauxKilobot's motors: ``data["motors"]``
             * a complete history of the FauxKilobot's heading: ``data["headings"]``
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
         data["classname"] = "FauxKilobot"
 
         data["sensors"] = []
         for sensor in self.sensors:
-            data["sensors"].append(sensor.get_data())
+            data["sensors"].append(sensor.get_data(copy))
 
-        data["headings"] = self.headings
+        data["headings"] = self.headings.get_values(copy)
 
-        data["motors"] = [self.move_motor.get_data(), self.turn_motor.get_data()]
+        data["motors"] = [self.move_motor.get_data(copy), self.turn_motor.get_data(copy)]
 
-        data["controller"] = self.controller.get_data()
+        data["controller"] = self.controller.get_data(copy)
 
         return data
 
@@ -324,8 +321,8 @@ class FauxKilobot(Agent):
 
         self.update_children_positions()
 
-        self.heading = self.headings[0]
-        self.headings = [self.heading]
+        self.heading = self.headings.first
+        self.headings = History([self.heading])
 
         if reset_controller:
             self.controller.reset()
@@ -0,0 +1,277 @@
+from .base import *
+from .FloorPatch import *
+
+import weakref
+
+class FloorPatchMap:
+    """
+        A spatial hash of a list of :class:`FloorPatch` es (including :class:`CircularFloorPatch` es), so that finding whether a point is on a patch only involves testing the few patches near the point, rather than every patch in the list. This is what a :class:`FloorPatchSensor` uses to detect patches, which makes it practical to have large, tiled floors with thousands of patches.
+
+        The floor is divided into square cells, ``cell_size`` wide, and every patch is listed in each of the cells which its bounding box overlaps, both in a table for all patches, and in a table for its label. A point is tested against the patches in its cell, in the table for the sensor's label (or the table of all patches, if the sensor has no label), and the search stops at the first patch which contains the point. Patches which would cover more than ``max_cells`` cells, such as a patch which covers the whole floor, are instead tested for every point, as are patches of subclasses of :class:`FloorPatch` and :class:`CircularFloorPatch`, which may have their own ``is_in`` methods.
+
+        A map follows the list of patches which it was built from: patches can be added to or removed from the list at any time (or with :meth:`add_patch` and :meth:`remove_patch`), and the map updates its tables for those patches the next time it is used. The map cannot tell if a patch is moved or resized, or if a patch in the list is replaced by another, so in those cases, :meth:`rebuild` should be called.
+
+        Maps are shared: :meth:`for_patches` returns the existing map for a list of patches, if there is one. Whole arrays of points can be tested at once with :meth:`get_detections`.
+    """
+    # the maps which have been built, keyed by the ids of their lists of patches
+    maps = weakref.WeakValueDictionary()
+
+    def __init__(self, patches: List[FloorPatch], cell_size: float=None, max_cells: int=1024):
+        """
+            __init__(patches: List[FloorPatch], cell_size: float=None, max_cells: int=1024)
+
+            :param patches: The list of patches. Normally, :meth:`for_patches` should be used instead of constructing a map directly, so that maps are shared.
+            :type patches: list[:class:`FloorPatch`]
+
+            :param cell_size: The width of the map's cells. Defaults to ``None``, in which case the median width or height of the patches is used, which suits tiled floors.
+            :type cell_size: float
+
+            :param max_cells: The largest number of cells which a patch will be listed in. Defaults to ``1024``.
+            :type max_cells: int
+        """
+        self.patches = patches
+        self.given_cell_size = cell_size
+        self.max_cells = max_cells
+        self.rebuild()
+
+    @staticmethod
+    def for_patches(patches: List[FloorPatch]) -> "FloorPatchMap":
+        """
+            Get a map of the given list of patches. If one has already been built for the same list, then it is returned, rather than building a new one.
+
+            :param patches: The list of patches.
+            :type patches: list[:class:`FloorPatch`]
+
+            :return: The map.
+            :rtype: :class:`FloorPatchMap`
+        """
+        floor_map = FloorPatchMap.maps.get(id(patches))
+        if floor_map is None or floor_map.patches is not patches:
+            floor_map = FloorPatchMap(patches)
+            FloorPatchMap.maps[id(patches)] = floor_map
+        return floor_map
+
+    def rebuild(self) -> None:
+        """
+            Build the map's tables again, from scratch.
+        """
+        self.cell_size = self.given_cell_size
+        if self.cell_size is None:
+            extents = [max(x_max - x_min, y_max - y_min) for x_min, x_max, y_min, y_max in map(FloorPatchMap.get_bounds, self.patches)]
+            extents = [extent for extent in extents if extent > 0]
+            self.cell_size = float(np.median(extents)) if extents else 1.0
+        # the tables: for each label, and for all patches (under the key None), a dict of cells to lists of patches
+        self.cells: Dict[str, Dict[Tuple[int, int], List[FloorPatch]]] = {None: {}}
+        # patches which are too large to be listed in cells, in the same form
+        self.large: Dict[str, List[FloorPatch]] = {None: []}
+        # the patches in the tables, keyed by their ids, as patches compare equal (see System.__eq__) if they are at the
+        # same position, which every FloorPatch is
+        self.contents: Dict[int, FloorPatch] = {}
+        self.arrays: Dict[str, tuple] = {}
+        for patch in self.patches:
+            self.insert(patch)
+
+    @staticmethod
+    def get_bounds(patch: FloorPatch) -> Tuple[float, float, float, float]:
+        """
+            Get the bounding box of a patch, as ``(x_min, x_max, y_min, y_max)``.
+        """
+        if isinstance(patch, CircularFloorPatch):
+            return patch.x - patch.radius, patch.x + patch.radius, patch.y - patch.radius, patch.y + patch.radius
+        return min(patch.x_left, patch.x_right), max(patch.x_left, patch.x_right), min(patch.y_bottom, patch.y_top), max(patch.y_bottom, patch.y_top)
+
+    def get_cell(self, x: float, y: float) -> Tuple[int, int]:
+        """
+            Get the cell which a point is in.
+        """
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def get_patch_cells(self, patch: FloorPatch) -> List[Tuple[int, int]]:
+        # the cells which a patch's bounding box overlaps, or None if there are too many of them. subclasses may have
+        # their own is_in methods, which need not agree with their bounding boxes, so they are not listed in cells
+        if type(patch) not in (FloorPatch, CircularFloorPatch):
+            return None
+        x_min, x_max, y_min, y_max = FloorPatchMap.get_bounds(patch)
+        cx_min, cy_min = self.get_cell(x_min, y_min)
+        cx_max, cy_max = self.get_cell(x_max, y_max)
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > self.max_cells:
+            return None
+        return [(cx, cy) for cx in range(cx_min, cx_max + 1) for cy in range(cy_min, cy_max + 1)]
+
+    def insert(self, patch: FloorPatch) -> None:
+        # add a patch to the tables for all patches and for its label
+        cells = self.get_patch_cells(patch)
+        for label in (None, patch.label):
+            if cells is None:
+                self.large.setdefault(label, []).append(patch)
+            else:
+                table = self.cells.setdefault(label, {})
+                for cell in cells:
+                    table.setdefault(cell, []).append(patch)
+            if label is None and patch.label is None:
+                break
+        self.contents[id(patch)] = patch
+        self.arrays = {}
+
+    def delete(self, patch: FloorPatch) -> None:
+        # remove a patch from the tables
+        cells = self.get_patch_cells(patch)
+        for label in (None, patch.label):
+            if cells is None:
+                FloorPatchMap.remove_item(self.large[label], patch)
+            else:
+                table = self.cells[label]
+                for cell in cells:
+                    FloorPatchMap.remove_item(table[cell], patch)
+                    if not table[cell]:
+                        del table[cell]
+            if label is None and patch.label is None:
+                break
+        del self.contents[id(patch)]
+        self.arrays = {}
+
+    @staticmethod
+    def remove_item(patches: List[FloorPatch], patch: FloorPatch) -> None:
+        # remove a patch from a list by identity, rather than with list.remove, which would remove the first patch which
+        # compares equal to it
+        for i, other in enumerate(patches):
+            if other is patch:
+                del patches[i]
+                return
+        raise ValueError("The patch is not in the list")
+
+    def add_patch(self, patch: FloorPatch) -> None:
+        """
+            Add a patch to the map, and to its list of patches.
+
+            :param patch: The patch.
+            :type patch: :class:`FloorPatch`
+        """
+        self.sync()
+        self.patches.append(patch)
+        self.insert(patch)
+
+    def remove_patch(self, patch: FloorPatch) -> None:
+        """
+            Remove a patch from the map, and from its list of patches. The patch is found by identity, rather than with ``list.remove``, as all :class:`FloorPatch` es compare equal to each other (see ``System.__eq__``), so ``patches.remove(patch)`` would remove the first patch in the list instead.
+
+            :param patch: The patch.
+            :type patch: :class:`FloorPatch`
+        """
+        self.sync()
+        FloorPatchMap.remove_item(self.patches, patch)
+        self.delete(patch)
+
+    def sync(self) -> None:
+        """
+            Bring the map's tables up to date with its list of patches, if patches have been added to it or removed from it since the map was last used.
+        """
+        if len(self.contents) == len(self.patches) and (not self.patches or next(reversed(self.contents.values())) is self.patches[-1]):
+            return
+        in_list = set(map(id, self.patches))
+        for patch in [patch for patch in self.contents.values() if id(patch) not in in_list]:
+            self.delete(patch)
+        for patch in self.patches:
+            if id(patch) not in self.contents:
+                self.insert(patch)
+        # keep the map's record of its contents in the same order as the list, so that changes are noticed
+        self.contents = {id(patch): patch for patch in self.patches}
+
+    def is_on_patch(self, x: float, y: float, label: str=None) -> bool:
+        """
+            Find whether a point is on any of the map's patches, in the same way as :class:`FloorPatchSensor` used to: by calling the patches' ``is_in`` methods.
+
+            :param x: The x-coordinate of the point.
+            :type x: float
+
+            :param y: The y-coordinate of the point.
+            :type y: float
+
+            :param label: The label of the patches to look for. Defaults to ``None``, in which case patches with any label are looked for.
+            :type label: str
+
+            :return: Whether the point is on a patch.
+            :rtype: bool
+        """
+        self.sync()
+        label = label or None
+        for patch in self.cells.get(label, {}).get(self.get_cell(x, y), ()):
+            if patch.is_in(x, y):
+                return True
+        for patch in self.large.get(label, ()):
+            if patch.is_in(x, y):
+                return True
+        return False
+
+    def get_arrays(self, label: str) -> tuple:
+        # the entries of the table for a label, sorted by cell, with the patches' shapes in arrays, for batch queries
+        if label not in self.arrays:
+            keys, patches = [], []
+            for (cx, cy), cell_patches in self.cells.get(label, {}).items():
+                for patch in cell_patches:
+                    keys.append(FloorPatchMap.get_key(cx, cy))
+                    patches.append(patch)
+            order = np.argsort(np.array(keys, dtype=np.int64), kind="stable")
+            keys = np.array(keys, dtype=np.int64)[order]
+            patches = [patches[i] for i in order] + list(self.large.get(label, ()))
+
+            # 0 for rectangles, 1 for circles, 2 for subclasses which may have their own is_in methods
+            kinds = np.array([0 if type(p) is FloorPatch else 1 if type(p) is CircularFloorPatch else 2 for p in patches], dtype=int)
+            shapes = np.array([[p.x_left, p.x_right, p.y_bottom, p.y_top] if type(p) is FloorPatch
+                               else [p.x, p.y, p.radius, 0] if type(p) is CircularFloorPatch else [0, 0, 0, 0] for p in patches], dtype=float).reshape(-1, 4)
+            self.arrays[label] = (keys, patches, kinds, shapes)
+        return self.arrays[label]
+
+    @staticmethod
+    def get_key(cx, cy):
+        # a single integer for a cell
+        return cx * 2**32 + cy
+
+    def get_detections(self, x, y, label: str=None) -> np.ndarray:
+        """
+            Find whether each of an array of points is on any of the map's patches.
+
+            :param x: The x-coordinates of the points.
+            :type x: :class:`numpy.ndarray`
+
+            :param y: The y-coordinates of the points.
+            :type y: :class:`numpy.ndarray`
+
+            :param label: The label of the patches to look for. Defaults to ``None``, in which case patches with any label are looked for.
+            :type label: str
+
+            :return: A boolean array, with the same shape as ``x`` and ``y``.
+            :rtype: :class:`numpy.ndarray`
+        """
+        self.sync()
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        shape = x.shape
+        x = x.ravel()
+        y = y.ravel()
+        n = len(x)
+        keys, patches, kinds, shapes = self.get_arrays(label or None)
+
+        # the (point, patch) pairs to test: the patches in each point's cell, and the large patches
+        point_keys = FloorPatchMap.get_key(np.floor(x / self.cell_size).astype(np.int64), np.floor(y / self.cell_size).astype(np.int64))
+        starts = np.searchsorted(keys, point_keys, side="left")
+        counts = np.searchsorted(keys, point_keys, side="right") - starts
+        point = np.repeat(np.arange(n), counts)
+        entry = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(int(np.sum(counts)))
+        large_n = len(patches) - len(keys)
+        if large_n:
+            point = np.concatenate([point, np.repeat(np.arange(n), large_n)])
+            entry = np.concatenate([entry, np.tile(np.arange(len(keys), len(patches)), n)])
+
+        kind = kinds[entry]
+        shape_of = shapes[entry]
+        px = x[point]
+        py = y[point]
+        inside = np.where(kind == 0,
+                          (px < shape_of[:, 1]) & (px > shape_of[:, 0]) & (py < shape_of[:, 3]) & (py > shape_of[:, 2]),
+                          np.sqrt((px - shape_of[:, 0])**2 + (py - shape_of[:, 1])**2) < shape_of[:, 2])
+        for k in np.flatnonzero(kind == 2):
+            inside[k] = patches[entry[k]].is_in(px[k], py[k])
+
+        detections = np.zeros(n, dtype=bool)
+        detections[point[inside]] = True
+        return detections.reshape(shape)
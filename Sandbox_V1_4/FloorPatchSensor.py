@@ -1,10 +1,13 @@
 from .Sensor import *
 from .noise import *
 from .FloorPatch import *
+from .FloorPatchMap import *
 
 class FloorPatchSensor(Sensor):
     """
         A class which represents a sensor for detecting coloured patches on the floor. Can detect both :class:`FloorPatch` and :class:`CircularFloorPatch` objects.
+
+        Patches are found with a :class:`FloorPatchMap` of the sensor's list of patches, so that only the patches near the sensor are tested.
     """
     def __init__(self, floor_patches: List[FloorPatch], x: float, y: float, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='FloorPatchSensor', delay_steps: float=0):
         '''
@@ -39,12 +42,13 @@ class FloorPatchSensor(Sensor):
         self.floor_patches = floor_patches
 
         self.activation: float = 0.0  # sensor activation. this variable is updated in and returned from the step method. it is stored separately in case you want to access it multiple times between simulation steps, although that is unlikely to be necessary
-        self.activations = [self.activation]  # for plotting and analysis, a sensor keeps a complete record of its activation over time
+        self.activations = History([self.activation])  # for plotting and analysis, a sensor keeps a complete record of its activation over time
         self.noisemaker = noisemaker  # noise source
 
         self.label = label
+        self.floor_map: FloorPatchMap = None  # the map of the sensor's floor patches, which is found when it is needed
 
-        self.initial_state = FloorPatchSensor.get_data(self)
+        self.initial_state = FloorPatchSensor.get_data(self, copy=True)
 
     def step(self, dt: float) -> float:
         """
@@ -60,16 +64,59 @@ class FloorPatchSensor(Sensor):
         self.activation = 0.0  # begin with zero activation, and
         # only detect anything if enabled
         if self.enabled:
-            for patch in self.floor_patches:  # for every floor patch the sensor can detect
-                # if this sensor has a label set, then it will only detect sensors with the same label
-                if not self.label or self.label == patch.label:
-
-                    if patch.is_in(self.x, self.y):
-                        self.activation = 1
+            # if this sensor has a label set, then it will only detect patches with the same label
+            if self.get_map().is_on_patch(self.x, self.y, self.label):
+                self.activation = 1
 
         return self.update(dt)
 
-    def get_data(self) -> dict:
+    @classmethod
+    def step_batch(cls, sensors: List["FloorPatchSensor"], dt: float) -> List[float]:
+        """
+            Step a group of floor patch sensors forwards in time (see ``Sensor.step_batch``). The sensors are split up by their maps and labels, and each subgroup's patches are found with one call to ``FloorPatchMap.get_detections``.
+
+            :param sensors: The sensors.
+            :type sensors: list[:class:`FloorPatchSensor`]
+
+            :param dt: Integration interval - not used here.
+            :type dt: float
+
+            :return: The sensors' activations, in the same order as ``sensors``.
+            :rtype: list[float]
+        """
+        subgroups = {}
+        for sensor in sensors:
+            System.step(sensor, dt)  # store xy-coordinates, as in step
+            sensor.activation = 0.0
+            if sensor.enabled:
+                subgroups.setdefault((sensor.get_map(), sensor.label or None), []).append(sensor)
+
+        for (floor_map, label), subgroup in subgroups.items():
+            detections = floor_map.get_detections([sensor.x for sensor in subgroup], [sensor.y for sensor in subgroup], label)
+            for sensor, detected in zip(subgroup, detections.tolist()):
+                if detected:
+                    sensor.activation = 1
+
+        return [sensor.update(dt) for sensor in sensors]
+
+    def get_map(self) -> FloorPatchMap:
+        """
+            Get the :class:`FloorPatchMap` of the sensor's floor patches. The map is only looked up again (see :meth:`Sandbox.FloorPatchMap.for_patches`) if the sensor's ``floor_patches`` list has been replaced.
+
+            :return: The map.
+            :rtype: :class:`FloorPatchMap`
+        """
+        if self.floor_map is None or self.floor_map.patches is not self.floor_patches:
+            self.floor_map = FloorPatchMap.for_patches(self.floor_patches)
+        return self.floor_map
+
+    def __getstate__(self) -> dict:
+        # the map is looked up again when it is needed, rather than being copied or pickled
+        state = self.__dict__.copy()
+        state["floor_map"] = None
+        return state
+
+    def get_data(self, copy: bool=False) -> dict:
         """
             A function to get the data from an :class:`FloorPatchSensor`, in the form of a string-keyed dict.
 
@@ -85,14 +132,14 @@ class FloorPatchSensor(Sensor):
             :return: The sensors's data.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["activation"] = self.activation
-        data["activations"] = self.activations[:]
+        data["activations"] = self.activations.get_values(copy)
         data["label"] = self.label
         data["floor_patches"] = self.floor_patches # only here for reset() - no use for plotting/analysis
         data["noises"] =  None
         if self.noisemaker:
-            data["noises"] = self.noisemaker.get_data()["noises"][:]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         return data
 
     def reset(self) -> None:
@@ -101,7 +148,7 @@ class FloorPatchSensor(Sensor):
         """
         super().reset()
         self.activation = self.initial_state["activations"][0]
-        self.activations = [self.activation]
+        self.activations = History([self.activation])
         self.label = self.initial_state["label"]
         self.enabled = self.initial_state["enabled"]
         self.floor_patches = self.initial_state["floor_patches"]
@@ -0,0 +1,601 @@
+import numpy as np
+import copy as cp
+import os
+
+from typing import Any, Iterable, Tuple
+
+class RecordingPolicy:
+    """
+        A class which describes how much of a simulation run should be kept in the histories (see :class:`History`) of a :class:`System`. A :class:`Simulator` has a recording policy, which applies to all of its systems, and any :class:`System` can override it by setting its ``recording`` attribute, in which case the override also applies to the system's subsystems (e.g. the sensors and motors of a :class:`Robot`), unless they have overrides of their own.
+
+        There are four modes of recording:
+
+        * ``"full"``: every value is kept. This is the default.
+        * ``"none"``: only the most recent value is kept, e.g. a :class:`Robot`'s final pose at the end of a run.
+        * ``"decimated"``: every ``every``-th value is kept, as well as the most recent value.
+        * ``"windowed"``: only the most recent ``window`` values are kept, in a ring buffer.
+
+        Whatever the mode, a history always remembers the first value recorded in it, as that is what systems are reset to.
+    """
+    modes = ["full", "none", "decimated", "windowed"]
+
+    def __init__(self, mode: str="full", every: int=1, window: int=1):
+        """
+            __init__(mode: str="full", every: int=1, window: int=1)
+
+            :param mode: The mode of recording: ``"full"``, ``"none"``, ``"decimated"`` or ``"windowed"``. Defaults to ``"full"``.
+            :type mode: str
+
+            :param every: The interval, in simulation steps, between the values which are kept in ``"decimated"`` mode. Defaults to ``1``.
+            :type every: int
+
+            :param window: The number of values which are kept in ``"windowed"`` mode. Defaults to ``1``.
+            :type window: int
+        """
+        if mode not in RecordingPolicy.modes:
+            raise ValueError("Unknown recording mode " + repr(mode) + ", expected one of " + str(RecordingPolicy.modes))
+        if int(every) < 1 or int(window) < 1:
+            raise ValueError("A RecordingPolicy's every and window parameters must be at least 1")
+        self.mode: str = mode
+        self.every: int = int(every)
+        self.window: int = int(window)
+
+    def get_every(self) -> int:
+        """
+            Get the interval between the values which a history following this policy keeps.
+        """
+        if self.mode == "decimated":
+            return self.every
+        return 1
+
+    def get_window(self) -> int:
+        """
+            Get the number of values which a history following this policy keeps, or ``0`` if the number is unbounded.
+        """
+        if self.mode == "none":
+            return 1
+        if self.mode == "windowed":
+            return self.window
+        return 0
+
+    def get_data(self) -> dict:
+        """
+            Get a description of the policy, in the form of a string-keyed dict, with the keys ``"mode"``, ``"every"`` and ``"window"``. Parameters which are not used by the policy's mode are ``None``.
+        """
+        return {"mode": self.mode,
+                "every": self.every if self.mode == "decimated" else None,
+                "window": self.window if self.mode == "windowed" else None}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RecordingPolicy):
+            return False
+        return self.get_data() == other.get_data()
+
+    def __hash__(self):
+        return hash((self.mode, self.get_every(), self.get_window()))
+
+    def __repr__(self) -> str:
+        return "RecordingPolicy(" + ", ".join(k + "=" + repr(v) for k, v in self.get_data().items() if v is not None) + ")"
+
+class History:
+    """
+        A class for recording the history of a variable over a simulation run, e.g. the x-coordinates of a :class:`System` or the activations of a :class:`Sensor`. A :class:`History` behaves like the Python lists which *Sandbox* classes used to keep their histories in: it can be appended to, indexed (including with ``[-1]`` for the most recent value), assigned to, sliced, iterated over and compared with ``==``. Underneath, values are stored in a preallocated NumPy array, which is much more compact than a list of Python floats, and which grows (by doubling its capacity) if it fills up.
+
+        The type of the array is chosen from the first recorded value: booleans are stored as ``bool``, and all other numbers as ``float``. Values which are vectors, such as the commands output by a :class:`Controller`, are stored as rows of a 2D array. If a value is recorded which does not fit the array's type or shape, then the array is converted so that it can hold the value (as a last resort, to an array of Python objects).
+
+        A :class:`History` can follow a :class:`RecordingPolicy`, in which case it will not keep every value which is appended to it. Indexing and iteration only see the values which have been kept, except that the most recent value is always kept, and the first value which was ever recorded is available as ``first``. The number of the step (i.e. append) which each kept value was recorded in can be found with ``get_steps()``.
+
+        Slicing a :class:`History` returns a NumPy array, rather than a list.
+
+        A :class:`History` can also be spilled to a ``.npy`` file as it is recorded (see ``spill``), so that only a chunk of its values is held in memory at a time. This is how a :class:`RunWriter` streams simulation runs to disk.
+
+        Copying a :class:`History` with :func:`copy.deepcopy` (which is how a :class:`Simulator` is snapshotted and forked) does not copy the values recorded so far. Instead, the history and its copy share them as a read-only prefix, and each records its later values in an array of its own (see ``share``).
+    """
+    # the capacity of a new History, before it has been reserved by a Simulator
+    default_capacity: int = 16
+
+    def __init__(self, values: Iterable=(), capacity: int=None):
+        """
+            __init__(values: Iterable=(), capacity: int=None)
+
+            :param values: The initial values in the history, e.g. ``[x]``. Defaults to an empty history.
+            :type values: iterable
+
+            :param capacity: The number of values to allocate space for. Defaults to ``None``, in which case ``History.default_capacity`` or the number of initial values is used, whichever is larger.
+            :type capacity: int
+        """
+        values = list(values)
+        self.capacity: int = max(capacity or History.default_capacity, len(values))
+        self.n: int = 0  # the number of values which are currently kept
+        self.count: int = 0  # the number of values which have ever been appended
+        self.data: np.ndarray = None
+        self.first: Any = None
+        self.policy: RecordingPolicy = None
+        self.every: int = 1
+        self.window: int = 0
+        self.pending: bool = False  # when decimating, whether the last kept value is only kept because it is the latest
+        self.prefix: np.ndarray = None  # read-only values which are shared with copies of the history
+        self.offset: int = 0  # the number of values in the prefix, which come before those in data
+        self.file: np.ndarray = None  # a writable memory-map of the file which the history is being spilled to
+        self.path: str = None  # the path of the file which the history is, or was, spilled to
+        for value in values:
+            self.append(value)
+
+    def allocate(self, value: Any) -> None:
+        """
+            Allocate the history's array, with a type and shape chosen to suit ``value``.
+        """
+        value = np.asarray(value)
+        if value.dtype.kind == 'b':
+            dtype = bool
+        elif value.dtype.kind in 'iuf':
+            dtype = float
+        else:
+            dtype = object
+        # in windowed mode, every value is written twice, so that the window is always a contiguous part of the array
+        length = 2 * self.window if self.window else self.capacity
+        if dtype is object:
+            self.data = np.empty(length, dtype=object)
+        else:
+            self.data = np.empty((length,) + value.shape, dtype=dtype)
+        self.is_bool = dtype is bool
+
+    def append(self, value: Any) -> None:
+        """
+            Add a value to the end of the history.
+
+            :param value: The value to record.
+            :type value: float, bool or list[float]
+        """
+        if self.data is None:
+            self.allocate(value)
+        if self.count == 0:
+            self.first = cp.copy(value)
+        if self.window:
+            i = self.count % self.window
+            self.write(i, value)
+            self.write(i + self.window, value)
+            self.n = min(self.count + 1, self.window)
+        else:
+            if self.pending:
+                self.n -= 1
+            i = self.n - self.offset
+            if i == len(self.data) and self.file is not None:
+                self.flush()
+                i = self.n - self.offset
+            if i == len(self.data):
+                if self.file is not None:
+                    self.resize(2 * len(self.data))
+                else:
+                    self.reserve(2 * (self.offset + len(self.data)) * self.every)
+            self.write(i, value)
+            self.n += 1
+            self.pending = self.count % self.every != 0
+        self.count += 1
+
+    def write(self, i: int, value: Any) -> None:
+        """
+            Write a value into the history's array at index ``i``, converting the array first if it cannot hold the value.
+        """
+        # converting to objects can move a shared prefix into the array, which shifts the index
+        offset = self.offset
+        if self.is_bool and not isinstance(value, (bool, np.bool_)):
+            self.convert(value)
+        try:
+            self.data[i + offset - self.offset] = value
+        except (TypeError, ValueError):
+            self.convert(value)
+            self.data[i + offset - self.offset] = value
+
+    def extend(self, values: Iterable) -> None:
+        """
+            Add all of the passed in values to the end of the history.
+        """
+        for value in values:
+            self.append(value)
+
+    def convert(self, value: Any) -> None:
+        """
+            Convert the history's array so that it can hold ``value``. Numbers which are recorded in a boolean history cause it to be converted to ``float``, and anything else which does not fit causes it to be converted to an array of Python objects.
+
+            A history which is converted to objects takes its own copy of any prefix which it shares with other histories (see ``share``), as the prefix cannot hold the new values. If the history is being spilled to a file (see ``spill``), it stops being spilled, as values of any type cannot be written to a ``.npy`` file, and the file is removed.
+        """
+        if self.is_bool and np.asarray(value).dtype.kind in 'biuf' and np.shape(value) == self.data.shape[1:]:
+            self.data = self.data.astype(float)
+        else:
+            parts = [self.data] if self.prefix is None else [self.prefix, self.data]
+            data = np.empty(self.offset + len(self.data), dtype=object)
+            i = 0
+            for part in parts:
+                for row in part:
+                    data[i] = row if part.ndim == 1 else row.tolist()
+                    i += 1
+            if self.file is not None:
+                self.file, self.prefix = None, None
+                os.remove(self.path)
+                self.path = None
+            self.data, self.prefix, self.offset = data, None, 0
+            self.capacity = len(data)
+        self.is_bool = False
+
+    def reserve(self, capacity: int) -> None:
+        """
+            Make sure that the history has space for at least ``capacity`` values to be recorded, so that it will not need to grow while they are. This is called by :class:`Simulator` with the number of steps in a simulation run. If the history follows a :class:`RecordingPolicy`, then only enough space for the values which will be kept is allocated.
+
+            :param capacity: The number of values to allocate space for.
+            :type capacity: int
+        """
+        if self.window:
+            return
+        capacity = -(-int(capacity) // self.every) + (self.every > 1)
+        if self.file is not None:
+            # a spilled history makes space in its file rather than in memory
+            if capacity > len(self.file):
+                self.resize_file(capacity)
+            return
+        # values in a shared prefix already have space
+        capacity -= self.offset
+        if capacity <= self.capacity and self.data is not None:
+            return
+        self.capacity = max(capacity, self.capacity)
+        if self.data is not None:
+            self.resize(self.capacity)
+
+    def resize(self, capacity: int) -> None:
+        """
+            Reallocate the history's array with space for ``capacity`` values, keeping the values which are in it.
+        """
+        data = np.empty((capacity,) + self.data.shape[1:], dtype=self.data.dtype)
+        data[:self.n - self.offset] = self.data[:self.n - self.offset]
+        self.data = data
+
+    def set_policy(self, policy: RecordingPolicy=None) -> None:
+        """
+            Make the history follow a :class:`RecordingPolicy`. This is meant to be done before a simulation run, e.g. by :class:`Simulator` when it is reset, as the history is restarted with the values which it has kept so far (which, after a reset, is just the initial value).
+
+            :param policy: The policy to follow. Defaults to ``None``, in which case every value is kept.
+            :type policy: :class:`RecordingPolicy`
+        """
+        every, window = 1, 0
+        if policy is not None:
+            every, window = policy.get_every(), policy.get_window()
+        if (every, window) == (self.every, self.window):
+            self.policy = policy
+            return
+        values, first = list(self), self.first
+        self.__init__(capacity=self.offset + self.capacity)
+        self.policy, self.every, self.window = policy, every, window
+        self.extend(values)
+        self.first = first
+
+    def share(self) -> "History":
+        """
+            Make a copy of the history which shares the values recorded so far with it, instead of copying them. The shared values (all but the most recent one) become a read-only prefix of both histories, and each of them records its later values in an array of its own, so that making a copy takes the same time however long the history is. A history only takes its own copy of the prefix (see ``unshare``) if one of the shared values is assigned to, which is rare, as it is usually only the most recent value which is changed, e.g. by ``Agent.push``.
+
+            Windowed histories, which are short anyway, and histories with fewer than two values are copied in the ordinary way.
+
+            :return: The copy.
+            :rtype: :class:`History`
+        """
+        copy = History.__new__(History)
+        if self.window or self.data is None or self.n < 2:
+            copy.__setstate__(cp.deepcopy(self.__getstate__()))
+            return copy
+
+        # a spilled history can share the part of its file which has been written, but the copy must not write to it
+        self.flush()
+        tail = self.n - self.offset
+        if self.prefix is None or tail > 1:
+            # move everything except the latest value into a new prefix. When there was no prefix, this is a view onto
+            # the old array, which this history stops writing to
+            prefix = self.view()[:-1]
+            prefix.flags.writeable = False
+            space = len(self.data) - tail + 1
+            self.prefix, self.offset = prefix, self.n - 1
+            self.data = self.new_tail(self.data[tail - 1], space)
+            self.capacity = space
+
+        copy.__dict__.update(self.__dict__)
+        copy.file, copy.path = None, None
+        copy.data = self.new_tail(self.data[0], len(self.data))
+        copy.first = cp.deepcopy(self.first)
+        return copy
+
+    def new_tail(self, value: Any, capacity: int) -> np.ndarray:
+        """
+            Allocate an array like the history's own, with space for ``capacity`` values, and with ``value`` as its first value.
+        """
+        data = np.empty((capacity,) + self.data.shape[1:], dtype=self.data.dtype)
+        data[0] = value
+        return data
+
+    def unshare(self) -> None:
+        """
+            Give the history its own copy of the values which it shares with other histories (see ``share``), so that they can be changed.
+        """
+        if self.prefix is None:
+            return
+        self.file = None
+        values = self.view()
+        data = np.empty((self.offset + len(self.data),) + values.shape[1:], dtype=values.dtype)
+        data[:self.n] = values
+        self.data, self.prefix, self.offset = data, None, 0
+        self.capacity = len(data)
+        self.is_bool = data.dtype == bool
+
+    def spill(self, path: str, chunk_size: int=1000) -> bool:
+        """
+            Start writing the history to a ``.npy`` file at ``path`` as it is recorded, so that no more than ``chunk_size`` values are held in memory. Whenever that many values have been recorded, all but the most recent of them (which may still be changed, e.g. by ``Agent.push``) are written to the file, which is memory-mapped, and they then form the history's prefix (see ``share``). The history can still be used in all of the usual ways, but reading old values from it will read them from the file. ``close_file`` writes the remaining values and trims the file to length.
+
+            Windowed histories, which are short anyway, and histories of values which cannot be stored in a NumPy array file are not spilled.
+
+            :param path: The path of the file to write.
+            :type path: str
+
+            :param chunk_size: The number of values to write at a time. Defaults to ``1000``.
+            :type chunk_size: int
+
+            :return: Whether or not the history is being spilled.
+            :rtype: bool
+        """
+        if self.window or self.data is None or self.data.dtype == object:
+            return False
+        self.close_file()
+        self.unshare()
+        self.path = path
+        self.file = np.lib.format.open_memmap(path, mode="w+", dtype=self.data.dtype, shape=(max(len(self.data), chunk_size),) + self.data.shape[1:])
+        self.flush()
+        self.data = self.new_tail(self.data[0], max(chunk_size, 1))
+        self.capacity = len(self.data)
+        return True
+
+    def flush(self, final: bool=False) -> None:
+        """
+            Write the values which have been recorded since the last flush to the file which the history is being spilled to (see ``spill``), except for the most recent value, unless ``final`` is ``True``. This is done automatically whenever the history's array fills up.
+
+            :param final: Whether or not to write the most recent value as well. Defaults to ``False``.
+            :type final: bool
+        """
+        if self.file is None:
+            return
+        if self.data.dtype != self.file.dtype:
+            self.convert_file(self.data.dtype)
+        end = self.n if final else self.n - 1
+        k = end - self.offset
+        if k <= 0:
+            return
+        if end > len(self.file):
+            self.resize_file(max(end, 2 * len(self.file)))
+        self.file[self.offset:end] = self.data[:k]
+        rest = self.n - end
+        self.data[:rest] = self.data[k:k + rest]
+        self.offset = end
+        self.prefix = self.file[:end]
+        self.prefix.flags.writeable = False
+
+    def close_file(self) -> None:
+        """
+            Stop spilling the history to its file (see ``spill``), after writing all of its values to it. The file is trimmed so that it only holds the history's kept values, and it is then memory-mapped, read-only, as the history's prefix. Values which are recorded after this are kept in memory in the usual way.
+        """
+        if self.file is None:
+            return
+        self.flush(final=True)
+        self.file.flush()
+        self.file, self.prefix = None, None
+        resize_npy_file(self.path, self.offset)
+        self.prefix = np.load(self.path, mmap_mode="r")
+
+    def resize_file(self, rows: int) -> None:
+        """
+            Change the number of values which there is space for in the file which the history is being spilled to.
+        """
+        self.file.flush()
+        self.file, self.prefix = None, None
+        resize_npy_file(self.path, rows)
+        self.file = np.load(self.path, mmap_mode="r+")
+        self.prefix = self.file[:self.offset]
+        self.prefix.flags.writeable = False
+
+    def convert_file(self, dtype: np.dtype) -> None:
+        """
+            Rewrite the file which the history is being spilled to with a new type, e.g. after a number has been recorded in a boolean history.
+        """
+        values = np.array(self.file[:self.offset], dtype=dtype)
+        rows = len(self.file)
+        self.file, self.prefix = None, None
+        self.file = np.lib.format.open_memmap(self.path, mode="w+", dtype=dtype, shape=(rows,) + values.shape[1:])
+        self.file[:self.offset] = values
+        self.prefix = self.file[:self.offset]
+        self.prefix.flags.writeable = False
+
+    def get_steps(self) -> np.ndarray:
+        """
+            Get the numbers of the steps (i.e. appends, counting from 0 for the first value) in which each of the kept values was recorded. Unless the history follows a :class:`RecordingPolicy`, this will just be ``0, 1, 2, ...``.
+
+            :return: The step numbers of the kept values.
+            :rtype: :class:`numpy.ndarray`
+        """
+        if self.window:
+            return np.arange(self.count - self.n, self.count)
+        if self.every == 1:
+            return np.arange(self.n)
+        steps = np.arange(0, self.count, self.every)
+        if self.pending:
+            steps = np.append(steps, self.count - 1)
+        return steps
+
+    def get_recording_data(self) -> dict:
+        """
+            Get a description of what the history has kept, in the form of a string-keyed dict. The data include those of the history's :class:`RecordingPolicy` (see ``RecordingPolicy.get_data``), as well as:
+
+            * the number of values which were recorded: ``data["n_steps"]``
+            * the number of values which were kept: ``data["n_kept"]``
+            * the step numbers of the kept values, or ``None`` if every value was kept: ``data["steps"]``
+        """
+        data = (self.policy or RecordingPolicy()).get_data()
+        data["n_steps"] = self.count
+        data["n_kept"] = self.n
+        data["steps"] = None
+        if self.n != self.count:
+            data["steps"] = self.get_steps()
+        return data
+
+    def view(self) -> np.ndarray:
+        """
+            Get the kept values as a NumPy array, in the order in which they were recorded. This is a view onto the history's own array, so it should not be modified. For a history which shares a prefix with other histories (see ``share``), it is a new array instead.
+        """
+        if self.data is None:
+            return np.array([])
+        if self.prefix is not None and self.n == self.offset:
+            return self.prefix
+        if self.prefix is not None:
+            return np.concatenate([self.prefix, self.data[:self.n - self.offset]])
+        if not self.window or self.count <= self.window:
+            return self.data[:self.n]
+        start = self.count % self.window
+        return self.data[start:start + self.window]
+
+    def get_values(self, copy: bool=False) -> np.ndarray:
+        """
+            Get the kept values as a NumPy array. This is what the ``get_data`` methods of *Sandbox* classes return for their histories.
+
+            :param copy: If ``True``, the array is a copy, which belongs to the caller. Otherwise, it is a read-only view onto the history's own array, which is much quicker to get for a long history and takes no extra memory. A view will still hold the same values after the history has been reset (which creates a new array), but its last value can change if the history's most recent value is assigned to, e.g. by ``Agent.push``, and a view of a windowed history changes whenever a value is recorded. Defaults to ``False``.
+            :type copy: bool
+
+            :return: The kept values.
+            :rtype: :class:`numpy.ndarray`
+        """
+        values = self.view()
+        if copy:
+            return values.copy()
+        values = values.view()
+        values.flags.writeable = False
+        return values
+
+    def tolist(self) -> list:
+        """
+            Get the history as a Python list.
+        """
+        return self.view().tolist()
+
+    def locate(self, key: int) -> Tuple[np.ndarray, int]:
+        """
+            Get the array which holds the value at index ``key`` in the history (either the history's own array, or its shared prefix), and the value's index in that array.
+        """
+        if key < 0:
+            key += self.n
+        if key < 0 or key >= self.n:
+            raise IndexError("History index out of range")
+        if self.window:
+            return self.data, (self.count - self.n + key) % self.window
+        if key < self.offset:
+            return self.prefix, key
+        return self.data, key - self.offset
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            view = self.view()
+            if isinstance(view, np.memmap):
+                # the values of a history which has been spilled to a file are only read from it as they are needed
+                return view[key]
+            return view[key].copy()
+        data, key = self.locate(key)
+        if data.ndim == 1 and data.dtype != object:
+            return data.item(key)
+        return data[key]
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, slice):
+            self.unshare()
+            view = self.view()
+            view[key] = value
+            if self.window:
+                # keep both copies of each value in the window the same
+                inds = (self.count - self.n + np.arange(self.n)) % self.window
+                values = view.copy()
+                self.data[inds] = values
+                self.data[inds + self.window] = values
+            return
+        data, key = self.locate(key)
+        if data is self.prefix:
+            self.unshare()
+            data, key = self.locate(key)
+        data[key] = value
+        if self.window:
+            self.data[key + self.window] = value
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __iadd__(self, values: Iterable):
+        self.extend(values)
+        return self
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        a = self.view()
+        if dtype is not None:
+            a = a.astype(dtype, copy=False)
+        if copy:
+            a = a.copy()
+        return a
+
+    def __eq__(self, other) -> bool:
+        if other is None:
+            return False
+        if len(self) != len(other):
+            return False
+        return bool(np.array_equal(np.asarray(self), np.asarray(other)))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "History(" + repr(self.tolist()) + ")"
+
+    def __getstate__(self) -> dict:
+        # only the filled part of the array is pickled, and a shared prefix is pickled as part of it
+        state = self.__dict__.copy()
+        if self.data is not None and not self.window:
+            state["data"] = self.view().copy()
+            state["capacity"] = self.n
+            state["prefix"], state["offset"] = None, 0
+            state["file"], state["path"] = None, None
+        return state
+
+    def __deepcopy__(self, memo: dict) -> "History":
+        return self.share()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.data is not None and len(self.data) == 0:
+            # an empty array cannot be doubled in size
+            self.reserve(History.default_capacity)
+
+def resize_npy_file(path: str, rows: int) -> None:
+    """
+        Change the length of the array in a ``.npy`` file, in place, by rewriting its header and then truncating or extending the file. This relies on NumPy padding the headers it writes, so that the length of an array can change without the length of the header changing.
+
+        :param path: The path of the file.
+        :type path: str
+
+        :param rows: The new length of the array's first axis.
+        :type rows: int
+    """
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+        header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": fortran_order, "shape": (rows,) + shape[1:]}
+        f.seek(0)
+        if version == (1, 0):
+            np.lib.format.write_array_header_1_0(f, header)
+        else:
+            np.lib.format.write_array_header_2_0(f, header)
+        if f.tell() != offset:
+            raise ValueError("The header of " + path + " cannot be rewritten in place")
+        f.truncate(offset + rows * int(np.prod(shape[1:], dtype=int)) * dtype.itemsize)
@@ -0,0 +1,112 @@
+from .base import *
+
+class Kinematics:
+    """
+        A class which integrates the motion of agents which move like a unicycle, i.e. which move forwards, in the direction they are facing, at a linear speed ``v``, while turning at an angular speed ``omega``. This includes robots with a differential drive, for which ``v`` is the mean of the two wheel speeds, and ``omega`` is the difference between them, divided by the distance between the wheels.
+
+        The speeds are held constant over each simulation step, and an agent's pose (``x``, ``y`` and ``theta``) is stepped forwards by one of several integrators, which are selected by name:
+
+        * ``euler``: forward Euler, i.e. the agent moves in a straight line, in the direction it faced at the start of the step, and then turns. This is how :class:`Robot` s have always been integrated in *Sandbox*, but its error in each step grows with the square of ``dt``, so it needs small steps.
+        * ``semi_implicit``: semi-implicit Euler, i.e. the agent turns first, and then moves in a straight line, in the direction it faces at the end of the step. This is how :class:`Ant`, :class:`Bee` and :class:`FauxKilobot` have always been integrated, and its error is similar to that of ``euler``.
+        * ``arc``: the exact solution, for constant speeds, in which the agent moves along an arc of a circle (or a straight line, if it is not turning). This is exact for any ``dt``, so the only error in a trajectory comes from the speeds being held constant over each step.
+        * ``rk4``: the classical fourth-order Runge-Kutta method. As the speeds are constant over a step, this is the same as integrating the agent's velocity with Simpson's rule, and its error is very small, but unlike ``arc``, it is not exact.
+
+        :meth:`integrate` steps a single agent, using Python's ``math`` functions, and :meth:`integrate_batch` steps arrays of agents, using NumPy, with the same integrators. Every type of agent which moves like a unicycle uses these two methods, in its ``integrate`` method and its vectorised ``integrate_batch`` method (see ``Agent.step_batch``), so that a whole group of agents of the same type can be moved in one call.
+    """
+    # the names of the integrators
+    integrators: Tuple[str, ...] = ("euler", "semi_implicit", "arc", "rk4")
+
+    @staticmethod
+    def integrate(x: float, y: float, theta: float, v: float, omega: float, dt: float, integrator: str="euler") -> Tuple[float, float, float]:
+        """
+            Step the pose of a single agent forwards in time.
+
+            :param x: The agent's x-coordinate.
+            :type x: float
+
+            :param y: The agent's y-coordinate.
+            :type y: float
+
+            :param theta: The agent's orientation.
+            :type theta: float
+
+            :param v: The agent's linear speed.
+            :type v: float
+
+            :param omega: The agent's angular speed.
+            :type omega: float
+
+            :param dt: The interval of time to integrate the agent's motion over.
+            :type dt: float
+
+            :param integrator: The name of the integrator. Defaults to ``"euler"``.
+            :type integrator: str
+
+            :return: The agent's new pose, as ``(x, y, theta)``.
+            :rtype: tuple[float, float, float]
+        """
+        if integrator == "euler":
+            return x + dt * (v * math.cos(theta)), y + dt * (v * math.sin(theta)), theta + dt * omega
+        if integrator == "semi_implicit":
+            theta = theta + dt * omega
+            return x + dt * (v * math.cos(theta)), y + dt * (v * math.sin(theta)), theta
+        if integrator == "arc":
+            # the chord of the arc points half way between the start and end orientations
+            half_turn = 0.5 * dt * omega
+            chord = dt * v * (math.sin(half_turn) / half_turn if half_turn != 0 else 1.0)
+            return x + chord * math.cos(theta + half_turn), y + chord * math.sin(theta + half_turn), theta + dt * omega
+        if integrator == "rk4":
+            # the second and third stages are the same, as the orientation does not depend on the position
+            mid_cos, mid_sin = math.cos(theta + 0.5 * dt * omega), math.sin(theta + 0.5 * dt * omega)
+            end_cos, end_sin = math.cos(theta + dt * omega), math.sin(theta + dt * omega)
+            x += dt * v * (math.cos(theta) + 4 * mid_cos + end_cos) / 6
+            y += dt * v * (math.sin(theta) + 4 * mid_sin + end_sin) / 6
+            return x, y, theta + dt * omega
+        raise ValueError("Unknown integrator " + repr(integrator) + ", which should be one of " + ", ".join(Kinematics.integrators))
+
+    @staticmethod
+    def integrate_batch(x: np.ndarray, y: np.ndarray, theta: np.ndarray, v: np.ndarray, omega: np.ndarray, dt: float, integrator: str="euler") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+            Step the poses of an array of agents forwards in time, in the same way as :meth:`integrate`.
+
+            :param x: The agents' x-coordinates.
+            :type x: :class:`numpy.ndarray`
+
+            :param y: The agents' y-coordinates.
+            :type y: :class:`numpy.ndarray`
+
+            :param theta: The agents' orientations.
+            :type theta: :class:`numpy.ndarray`
+
+            :param v: The agents' linear speeds.
+            :type v: :class:`numpy.ndarray`
+
+            :param omega: The agents' angular speeds.
+            :type omega: :class:`numpy.ndarray`
+
+            :param dt: The interval of time to integrate the agents' motion over.
+            :type dt: float
+
+            :param integrator: The name of the integrator. Defaults to ``"euler"``.
+            :type integrator: str
+
+            :return: The agents' new poses, as ``(x, y, theta)``.
+            :rtype: tuple[:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`]
+        """
+        if integrator == "euler":
+            return x + dt * (v * np.cos(theta)), y + dt * (v * np.sin(theta)), theta + dt * omega
+        if integrator == "semi_implicit":
+            theta = theta + dt * omega
+            return x + dt * (v * np.cos(theta)), y + dt * (v * np.sin(theta)), theta
+        if integrator == "arc":
+            half_turn = 0.5 * dt * omega
+            half_turn = np.asarray(half_turn, dtype=float)
+            # the same expression as in integrate, so that single agents and arrays of them follow the same trajectories
+            chord = dt * v * np.divide(np.sin(half_turn), half_turn, out=np.ones(half_turn.shape), where=half_turn != 0)
+            return x + chord * np.cos(theta + half_turn), y + chord * np.sin(theta + half_turn), theta + dt * omega
+        if integrator == "rk4":
+            mid, end = theta + 0.5 * dt * omega, theta + dt * omega
+            x = x + dt * v * (np.cos(theta) + 4 * np.cos(mid) + np.cos(end)) / 6
+            y = y + dt * v * (np.sin(theta) + 4 * np.sin(mid) + np.sin(end)) / 6
+            return x, y, end
+        raise ValueError("Unknown integrator " + repr(integrator) + ", which should be one of " + ", ".join(Kinematics.integrators))
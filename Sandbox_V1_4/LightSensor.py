@@ -1,14 +1,30 @@
 from .stimuli import *
 from .Sensor import *
+from .LightSourceField import *
 
 # a class to define a sensor which detects instances of the LightSource class
 class LightSensor(Sensor, FOV_thing):
     """
         A class which represents a light sensor. :class:`LightSensor` inherits both from :class:`Sensor` and :class:`FOV_thing`.
+
+        The brightness which a :class:`LightSensor` detects is found from a :class:`LightSourceField`, which holds its light sources in arrays.
+
+        In worlds with many light sources, a sensor can be made to ignore lights which are too dim, or too far away, to matter, by giving it a ``cutoff`` brightness and/or a ``max_distance`` (see :class:`LightSourceField`). These can be set for all sensors at once, by setting the class attributes ``LightSensor.cutoff`` and ``LightSensor.max_distance``, which apply to any sensor that has not been given its own values. A sensor keeps track of the largest possible error in any of its readings which has resulted from ignoring lights, in its ``max_cutoff_error`` attribute.
+
+        In scenes where the lights do not move, a sensor can instead sample its readings from a precomputed raster of its field, by giving it a ``raster_resolution`` (see :class:`LightSourceField`). Readings from outside of the raster's ``raster_bounds`` are computed as usual. Again, these can be set for all sensors at once, with the class attributes ``LightSensor.raster_resolution`` and ``LightSensor.raster_bounds``, and the number of direction bins in rasters and the number of lights at each point of a raster which are kept out of the bins, so that the field of view is applied to them exactly, are set by ``LightSensor.raster_directions`` and ``LightSensor.raster_sources``.
     """
-    def __init__(self, light_sources: List[LightSource], x: float, y: float, theta: float=0, FOV: float=2*math.pi, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='LightSensor', colour: str='red', delay_steps: int=0):
+    # by default, no lights are ignored
+    cutoff: float = None
+    max_distance: float = None
+    # and readings are not sampled from rasters
+    raster_resolution: float = None
+    raster_bounds: Tuple[float, float, float, float] = None
+    raster_directions: int = 16
+    raster_sources: int = 8
+
+    def __init__(self, light_sources: List[LightSource], x: float, y: float, theta: float=0, FOV: float=2*math.pi, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='LightSensor', colour: str='red', delay_steps: int=0, cutoff: float=None, max_distance: float=None, raster_resolution: float=None, raster_bounds: Tuple[float, float, float, float]=None):
         """
-            __init__(self, light_sources: List[LightSource], x: float, y: float, theta: float=0, FOV: float=2*math.pi, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='LightSensor', colour: str='red', delay_steps: int=0)
+            __init__(self, light_sources: List[LightSource], x: float, y: float, theta: float=0, FOV: float=2*math.pi, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='LightSensor', colour: str='red', delay_steps: int=0, cutoff: float=None, max_distance: float=None, raster_resolution: float=None, raster_bounds: Tuple[float, float, float, float]=None)
 
             :param light_sources: The list of instances of :class:`LightSource` which this sensor can potentially detect.
             :type light_sources: list[:class:`Light_Source`]
@@ -39,21 +55,45 @@ class LightSensor(Sensor, FOV_thing):
 
             :param delay_steps: The number of simulation steps a sensor signal will be delayed for.
             :type delay_steps: int
+
+            :param cutoff: The brightness below which the sensor ignores light sources. Defaults to ``None``, in which case the class attribute ``LightSensor.cutoff`` is used.
+            :type cutoff: float
+
+            :param max_distance: The distance beyond which the sensor ignores light sources. Defaults to ``None``, in which case the class attribute ``LightSensor.max_distance`` is used.
+            :type max_distance: float
+
+            :param raster_resolution: The resolution of the raster which the sensor samples its readings from. Defaults to ``None``, in which case the class attribute ``LightSensor.raster_resolution`` is used.
+            :type raster_resolution: float
+
+            :param raster_bounds: The area covered by the raster, as ``(x_min, x_max, y_min, y_max)``. Defaults to ``None``, in which case the class attribute ``LightSensor.raster_bounds`` is used, and if that is ``None`` too, the area around the sensor's light sources is covered (see ``LightSourceField.get_raster``).
+            :type raster_bounds: tuple[float, float, float, float]
         """
         super().__init__(x=x, y=y, theta=theta, enabled=enabled, name_str=name_str, colour=colour, noisemaker=noisemaker, delay_steps=delay_steps)
         self.light_sources = light_sources
         # self.initial_light_sources = light_sources  # a list of LightSource instances which this sensor can detect
         self.activation: float = 0.0  # sensor activation. this variable is updated in and returned from the step method. it is stored separately in case you want to access it multiple times between simulation steps, although that is unlikely to be necessary
-        self.activations = [self.activation]  # for plotting and analysis, a sensor keeps a complete record of its activation over time
+        self.activations = History([self.activation])  # for plotting and analysis, a sensor keeps a complete record of its activation over time
         self.noisemaker = noisemaker  # noise source
         self.FOV = FOV  # sensor angular field of view
 
         self.label = label
+        # the field which the sensor's light sources are held in, and the list which it was built from
+        self.field: LightSourceField = None
+        self.field_list: List[LightSource] = None
+        if cutoff is not None:
+            self.cutoff = cutoff
+        if max_distance is not None:
+            self.max_distance = max_distance
+        if raster_resolution is not None:
+            self.raster_resolution = raster_resolution
+        if raster_bounds is not None:
+            self.raster_bounds = raster_bounds
+        self.max_cutoff_error: float = 0.0  # the largest upper bound on the error of a reading, from ignoring lights
         # self.initial_label = label
         # self.initial_enabled = enabled # Perhaps should be moved to Sensor!?
         # self.initial_FOV = FOV
 
-        self.initial_state = LightSensor.get_data(self)
+        self.initial_state = LightSensor.get_data(self, copy=True)
 
     def step(self, dt: float) -> float:
         """
@@ -69,12 +109,19 @@ class LightSensor(Sensor, FOV_thing):
         self.activation = 0.0  # begin with zero activation, and add to it for every detected light source
         # only detect anything if enabled
         if self.enabled:
-            for source in self.light_sources:  # for every light source the sensor can detect
-                # if this sensor has a label set, then it will only detect sensors with the same label
-                if not self.label or self.label == source.label:
-                    angle_to_source = math.atan2(source.y - self.y, source.x - self.x)  # find angle of vector from light source to sensor
-                    if abs(angle_difference(angle_to_source, self.theta)) <= (self.FOV/2):  # if angle is within field fo view, the sensor detects the light
-                        self.activation += source.get_brightness_at(self.x, self.y, self.theta)  # stimuli from multiple lights are added linearly
+            # if this sensor has a label set, then it will only detect light sources with the same label. stimuli from
+            # multiple lights are added linearly
+            raster = None
+            if self.raster_resolution is not None:
+                raster = self.get_field().get_raster(self.raster_resolution, self.raster_bounds, self.raster_directions, self.raster_sources)
+            if raster is not None and raster.contains(self.x, self.y):
+                self.activation = float(raster.get_brightness_at(self.x, self.y, self.theta, self.FOV, self.label))
+            elif self.cutoff is None and self.max_distance is None:
+                self.activation = float(self.get_field().get_brightness_at(self.x, self.y, self.theta, self.FOV, self.label))
+            else:
+                activation, error = self.get_field().get_brightness_at(self.x, self.y, self.theta, self.FOV, self.label, self.cutoff, self.max_distance, return_error=True)
+                self.activation = float(activation)
+                self.max_cutoff_error = max(self.max_cutoff_error, float(error))
 
         return self.update(dt)
 
@@ -92,7 +139,67 @@ class LightSensor(Sensor, FOV_thing):
         # # return activation
         # return self.activation  # return activation
 
-    def get_data(self) -> dict:
+    @classmethod
+    def step_batch(cls, sensors: List["LightSensor"], dt: float) -> List[float]:
+        """
+            Step a group of light sensors forwards in time (see ``Sensor.step_batch``). The sensors are split up by their fields and settings (field of view, label, cutoff and raster), and the activations of each of these subgroups are computed in one call to the field, or to its raster, with arrays of the sensors' poses.
+
+            :param sensors: The sensors.
+            :type sensors: list[:class:`LightSensor`]
+
+            :param dt: Integration interval - not used here.
+            :type dt: float
+
+            :return: The sensors' activations, in the same order as ``sensors``.
+            :rtype: list[float]
+        """
+        subgroups = {}
+        for sensor in sensors:
+            System.step(sensor, dt)  # store xy-coordinates and theta, as in step
+            sensor.activation = 0.0
+            if sensor.enabled:
+                key = (sensor.get_field(), sensor.FOV, sensor.label, sensor.cutoff, sensor.max_distance, sensor.raster_resolution, sensor.raster_bounds, sensor.raster_directions, sensor.raster_sources)
+                subgroups.setdefault(key, []).append(sensor)
+
+        for (field, FOV, label, cutoff, max_distance, raster_resolution, raster_bounds, raster_directions, raster_sources), subgroup in subgroups.items():
+            x = np.array([sensor.x for sensor in subgroup], dtype=float)
+            y = np.array([sensor.y for sensor in subgroup], dtype=float)
+            theta = np.array([sensor.theta for sensor in subgroup], dtype=float)
+            activations = np.zeros(len(subgroup))
+            errors = np.zeros(len(subgroup))
+
+            exact = np.ones(len(subgroup), dtype=bool)
+            if raster_resolution is not None:
+                raster = field.get_raster(raster_resolution, raster_bounds, raster_directions, raster_sources)
+                inside = raster.contains(x, y)
+                activations[inside] = raster.get_brightness_at(x[inside], y[inside], theta[inside], FOV, label)
+                exact = ~inside
+            if np.any(exact):
+                if cutoff is None and max_distance is None:
+                    activations[exact] = field.get_brightness_at(x[exact], y[exact], theta[exact], FOV, label)
+                else:
+                    activations[exact], errors[exact] = field.get_brightness_at(x[exact], y[exact], theta[exact], FOV, label, cutoff, max_distance, return_error=True)
+
+            for sensor, activation, error in zip(subgroup, activations.tolist(), errors.tolist()):
+                sensor.activation = activation
+                if error > sensor.max_cutoff_error:
+                    sensor.max_cutoff_error = error
+
+        return [sensor.update(dt) for sensor in sensors]
+
+    def get_field(self) -> LightSourceField:
+        """
+            Get the :class:`LightSourceField` which holds the sensor's light sources. The field is only looked up again (see :meth:`Sandbox.LightSourceField.for_sources`) if the sensor's ``light_sources`` list has been replaced, or has changed in length, since it was last looked up. If you replace light sources in the list without changing its length, then set the sensor's ``field`` attribute to ``None``.
+
+            :return: The field.
+            :rtype: :class:`LightSourceField`
+        """
+        if self.field is None or self.field_list is not self.light_sources or len(self.light_sources) != len(self.field.sources):
+            self.field = LightSourceField.for_sources(self.light_sources)
+            self.field_list = self.light_sources
+        return self.field
+
+    def get_data(self, copy: bool=False) -> dict:
         """
             A function to get the data from a :class:`LightSensor`, in the form of a string-keyed dict.
 
@@ -109,17 +216,17 @@ class LightSensor(Sensor, FOV_thing):
             :return: The sensors's data.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["activation"] = self.activation
-        data["activations"] = cp.copy(self.activations)
+        data["activations"] = self.activations.get_values(copy)
         data["FOV"] = self.FOV
         data["label"] = self.label
         data["light_sources"] = self.light_sources  # only here for reset() - no use for plotting/analysis
         data["noises"] =  None
         if self.noisemaker:
-            # print(self.noisemaker.get_data())
+            # print(self.noisemaker.get_data(copy))
             # print()
-            data["noises"] = self.noisemaker.get_data()["noises"][:]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         return data
 
     def reset(self) -> None:
@@ -131,15 +238,22 @@ class LightSensor(Sensor, FOV_thing):
         super().reset()
 
         self.activation = self.initial_state["activations"][0]
-        self.activations = [self.activation]
+        self.activations = History([self.activation])
         self.label = self.initial_state["label"]
         self.enabled = self.initial_state["enabled"]
         self.FOV = self.initial_state["FOV"]
         self.light_sources = self.initial_state["light_sources"]
+        self.max_cutoff_error = 0.0
 
         if self.noisemaker:
             self.noisemaker.reset()
 
+    def __getstate__(self) -> dict:
+        # the field is looked up again when it is needed, rather than being copied or pickled
+        state = self.__dict__.copy()
+        state["field"], state["field_list"] = None, None
+        return state
+
     def clone(self):
         """
             A method to clone a LightSensor. I'm not sure why I wrote this method - it is not used anywhere.
@@ -0,0 +1,558 @@
+from .stimuli import *
+
+import operator
+
+class LightSourceField:
+    """
+        A class which holds the properties of a list of :class:`LightSource` s in NumPy arrays, so that the total brightness which a :class:`LightSensor` (or a whole population of them, as in :class:`RobotPopulation`) detects from all of the lights can be found with a few array operations, rather than by looping over the lights in Python.
+
+        A field is kept up to date by the light sources themselves: whenever one of the attributes which the field holds (``x``, ``y``, ``theta``, ``brightness``, ``gradient``, ``half_spread``, ``model``, ``is_on`` or ``label``) is assigned to, the light source writes the new value into the arrays of every field it is in. This means that lights can move, fade, be switched on and off and be relabelled, e.g. by a :class:`DisturbanceSource`, as usual. Fields are not copied or pickled with the light sources which they belong to, but are rebuilt when they are next needed.
+
+        The lights are also kept in buckets by their labels (see :meth:`get_bucket`), which are updated as lights are relabelled, e.g. by a :class:`LightSwitcherDisturbanceSource`, so that sensors with a label only evaluate the lights in their bucket.
+
+        Fields are shared: :meth:`for_sources` returns the existing field for a list of light sources, if there is one. A field does not follow changes to the list it was built from, so a sensor checks whether its list has changed before using its field (see ``LightSensor.get_field``).
+
+        Optionally, light sources which are far enough from a sensor that their contribution to its activation is negligible can be left out, which makes the cost of a sensor reading roughly independent of the number of lights in a large world. This is done by passing a ``cutoff`` brightness and/or a ``max_distance`` to :meth:`get_brightness_at`. Each light then has a cutoff radius, beyond which it is ignored: the distance at which its brightness falls to ``cutoff``, or ``max_distance``, whichever is smaller. Lights are found with a uniform grid, which is built for each combination of ``cutoff`` and ``max_distance`` that is used, and rebuilt after any light has moved or changed its brightness, gradient or model. The radii come from the lights' models (see :class:`BrightnessModel`). As the brightness of a light with any of the built-in models never increases with distance, an ignored light can contribute no more than its brightness at its cutoff radius, so :meth:`get_brightness_at` can also return an upper bound on the error of each reading. ``binary`` lights do not decay, so a ``cutoff`` either leaves them out entirely (if they are dimmer than it) or not at all, and only ``max_distance`` limits their range, as is the case for lights whose models have no ``radius`` function.
+
+        When lights do not move, the brightness which a sensor detects only depends on its position and on which directions it can see in, so it can be precomputed. :meth:`get_raster` returns a raster of the field: a grid of points, at a given resolution, at which the brightness of the lights of each label (each "channel") is stored, along with the directions of the lights from the point. For the ``n_sources`` lights which are brightest at a point, the raster keeps each light's own brightness and index, and the rest of the lights are put into ``n_directions`` bins by their directions from the point. A sensor's reading is then sampled from the raster by bilinear interpolation between the four points around it. Each of the lights which are kept separately is tested against the sensor's field of view exactly, using its direction from the sensor itself, and of the rest, the bins which are in the sensor's field of view are summed (bins which are partly in the field of view are weighted by how much of them is, as a bin's lights are treated as though they were spread evenly across it). So in scenes with no more than ``n_sources`` lights of each label, the field of view is applied exactly, and the only error comes from interpolating brightness between points, which is largest near lights, where brightness changes quickly. In a one-light scene, with a field of view of ``0.9 * pi`` and a resolution of ``0.25``, fewer than 0.2% of readings are more than 5% out, and none are wrong about whether the light is in view. With more lights than ``n_sources``, the dimmest lights at each point are binned, e.g. with 20 lights and the default 8, 90% of readings are within 0.03%, but readings can include a small amount of light (up to about 0.02% of the brightest reading) from lights just outside the field of view. A channel is recomputed, when it is next sampled, after any of its lights has changed, e.g. when a light is switched on or off; the other channels are left as they are.
+    """
+    def __init__(self, sources: List[LightSource]):
+        """
+            __init__(sources: List[LightSource])
+
+            :param sources: The light sources which the field holds. Normally, :meth:`for_sources` should be used instead of constructing a field directly, so that fields are shared.
+            :type sources: list[:class:`LightSource`]
+        """
+        self.sources = tuple(sources)
+        n = len(self.sources)
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.theta = np.zeros(n)
+        self.brightness = np.zeros(n)
+        self.gradient = np.zeros(n)
+        self.half_spread = np.zeros(n)
+        self.model = np.zeros(n, dtype=int)
+        self.is_on = np.zeros(n, dtype=bool)
+        self.label = np.empty(n, dtype=object)
+        # the indices of the lights with each label, and masks of them, which are built as they are needed
+        self.buckets: Dict[str, np.ndarray] = {}
+        self.label_masks: Dict[str, np.ndarray] = {}
+        # grids for finding nearby lights, keyed by (cutoff, max_distance)
+        self.grids: Dict[Tuple[float, float], _LightSourceGrid] = {}
+        # rasters of the field, keyed by (resolution, bounds, n_directions, n_sources)
+        self.rasters: Dict[tuple, _LightSourceRaster] = {}
+
+        for i, source in enumerate(self.sources):
+            for name in LightSource.field_attributes:
+                self.update(i, name, getattr(source, name))
+            source.fields.append((self, i))
+
+    @staticmethod
+    def for_sources(sources: List[LightSource]) -> "LightSourceField":
+        """
+            Get a field which holds the given light sources, in the same order. If one has already been built, then it is returned, rather than building a new one.
+
+            :param sources: The light sources.
+            :type sources: list[:class:`LightSource`]
+
+            :return: The field.
+            :rtype: :class:`LightSourceField`
+        """
+        if sources:
+            for field, _ in sources[0].fields:
+                if len(field.sources) == len(sources) and all(map(operator.is_, field.sources, sources)):
+                    return field
+        return LightSourceField(sources)
+
+    def update(self, i: int, name: str, value) -> None:
+        """
+            Update the field's copy of one of the attributes of one of its light sources. This is called by :class:`LightSource` whenever one of those attributes is assigned to.
+
+            :param i: The index of the light source in the field.
+            :type i: int
+
+            :param name: The name of the attribute.
+            :type name: str
+
+            :param value: The attribute's new value.
+        """
+        old_label = self.label[i]
+        if name == "theta":
+            value = value % (2*math.pi)
+        elif name == "model":
+            # models are stored as their codes (see BrightnessModel). lights with unknown models are never detected, as
+            # is the case for LightSource.get_brightness_at
+            value = BrightnessModel.get_code(value)
+        getattr(self, name)[i] = value
+        if name in ("x", "y", "brightness", "gradient", "model"):
+            self.grids = {}
+        elif name in ("is_on", "label"):
+            if name == "label" and value != old_label:
+                # move the light from its old bucket to its new one
+                if old_label in self.buckets:
+                    self.buckets[old_label] = self.buckets[old_label][self.buckets[old_label] != i]
+                    self.label_masks[old_label][i] = False
+                if value in self.buckets:
+                    bucket = self.buckets[value]
+                    self.buckets[value] = np.insert(bucket, np.searchsorted(bucket, i), i)
+                    self.label_masks[value][i] = True
+            for grid in self.grids.values():
+                grid.error_totals = {}
+        # only the channels which the light was and is in need to be recomputed
+        for raster in self.rasters.values():
+            raster.invalidate(old_label)
+            raster.invalidate(self.label[i])
+
+    def get_brightness_at(self, x, y, theta, FOV: float=2*math.pi, label: str=None, cutoff: float=None, max_distance: float=None, return_error: bool=False):
+        """
+            Get the total brightness of the field's light sources, as it is detected by light sensors at the given positions and orientations. This gives the same results as looping over the light sources in the way that :class:`LightSensor` used to: a light is detected if it is on, if it is within the sensor's field of view, if the sensor is within the light's spread, and, when the sensor has a ``label``, if the light has the same label.
+
+            :param x: The x-coordinate(s) of the sensor(s).
+            :type x: float or :class:`numpy.ndarray`
+
+            :param y: The y-coordinate(s) of the sensor(s).
+            :type y: float or :class:`numpy.ndarray`
+
+            :param theta: The orientation(s) of the sensor(s).
+            :type theta: float or :class:`numpy.ndarray`
+
+            :param FOV: The sensors' angular field of view. Defaults to ``2pi``.
+            :type FOV: float
+
+            :param label: The sensors' label. Defaults to ``None``, in which case lights with any label are detected.
+            :type label: str
+
+            :param cutoff: The brightness below which lights are ignored. Defaults to ``None``, in which case lights are not ignored however dim they are.
+            :type cutoff: float
+
+            :param max_distance: The distance beyond which lights are ignored. Defaults to ``None``, in which case lights are not ignored however far away they are.
+            :type max_distance: float
+
+            :param return_error: If ``True``, then an upper bound on the brightness which was ignored because of ``cutoff`` and ``max_distance`` is returned as well. Defaults to ``False``.
+            :type return_error: bool
+
+            :return: The detected brightness, with the same shape as ``x``, ``y`` and ``theta``, and, if ``return_error`` is ``True``, the error bound, with the same shape.
+            :rtype: :class:`numpy.ndarray`, or tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+        """
+        x, y, theta = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(theta, dtype=float))
+
+        if cutoff is None and max_distance is None:
+            # every light (with the sensors' label) is evaluated for every sensor, with the lights along the last axis
+            i = self.get_bucket(label) if label else slice(None)
+            brightness = np.sum(self.get_contributions(i, x[..., None], y[..., None], theta[..., None], FOV), axis=-1)
+            if return_error:
+                return brightness, np.zeros(x.shape)
+            return brightness
+
+        key = (cutoff, max_distance)
+        if key not in self.grids:
+            self.grids[key] = _LightSourceGrid(self, cutoff, max_distance)
+        brightness, error = self.grids[key].get_brightness_at(x.ravel(), y.ravel(), theta.ravel(), FOV, label)
+        if return_error:
+            return brightness.reshape(x.shape), error.reshape(x.shape)
+        return brightness.reshape(x.shape)
+
+    def get_raster(self, resolution: float, bounds: Tuple[float, float, float, float]=None, n_directions: int=16, n_sources: int=8) -> "_LightSourceRaster":
+        """
+            Get a raster of the field (see above), creating it if it has not been used before. The raster's channels are computed when they are first sampled.
+
+            :param resolution: The distance between the raster's points.
+            :type resolution: float
+
+            :param bounds: The area covered by the raster, as ``(x_min, x_max, y_min, y_max)``. Defaults to ``None``, in which case the area around the lights is covered, with a margin of half of its width or height, whichever is larger.
+            :type bounds: tuple[float, float, float, float]
+
+            :param n_directions: The number of bins which the directions of lights from each point are divided into. Defaults to ``16``.
+            :type n_directions: int
+
+            :param n_sources: The number of lights, at each point, which are kept separately, rather than being put into direction bins, so that they are tested against sensors' fields of view exactly. Defaults to ``8``.
+            :type n_sources: int
+
+            :return: The raster.
+            :rtype: :class:`_LightSourceRaster`
+        """
+        key = (resolution, bounds, n_directions, n_sources)
+        if key not in self.rasters:
+            if bounds is None:
+                x_min, x_max = (float(np.min(self.x)), float(np.max(self.x))) if len(self.x) else (0.0, 0.0)
+                y_min, y_max = (float(np.min(self.y)), float(np.max(self.y))) if len(self.y) else (0.0, 0.0)
+                margin = max(x_max - x_min, y_max - y_min, 2) / 2
+                bounds = (x_min - margin, x_max + margin, y_min - margin, y_max + margin)
+            self.rasters[key] = _LightSourceRaster(self, resolution, bounds, n_directions, n_sources)
+        return self.rasters[key]
+
+    def get_bucket(self, label: str) -> np.ndarray:
+        """
+            Get the indices of the lights which have the given label, in ascending order.
+
+            :param label: The label.
+            :type label: str
+
+            :return: The indices.
+            :rtype: :class:`numpy.ndarray`
+        """
+        if label not in self.buckets:
+            mask = np.array([source_label == label for source_label in self.label], dtype=bool)
+            self.label_masks[label] = mask
+            self.buckets[label] = np.flatnonzero(mask)
+        return self.buckets[label]
+
+    def get_label_mask(self, label: str) -> np.ndarray:
+        """
+            Get a mask of the lights which have the given label.
+
+            :param label: The label.
+            :type label: str
+
+            :return: The mask.
+            :rtype: :class:`numpy.ndarray`
+        """
+        self.get_bucket(label)
+        return self.label_masks[label]
+
+    def get_detectable(self, label: str=None) -> np.ndarray:
+        """
+            Get a mask of the lights which a sensor with the given label could detect, if it was in the right place, i.e. the lights which are on, have a known model and, if ``label`` is given, the same label.
+
+            :param label: The sensor's label. Defaults to ``None``.
+            :type label: str
+
+            :return: The mask.
+            :rtype: :class:`numpy.ndarray`
+        """
+        detectable = self.is_on & (self.model >= 0)
+        if label:
+            detectable = detectable & self.get_label_mask(label)
+        return detectable
+
+    def get_brightness_at_distance(self, i, dist, angle=0) -> np.ndarray:
+        """
+            Get the brightness of lights at the given distances from them, according to their models (see :class:`BrightnessModel`), ignoring their spreads.
+
+            :param i: The indices of the lights, or any other index into the field's arrays.
+            :type i: :class:`numpy.ndarray`
+
+            :param dist: The distances, which are broadcast with the lights' arrays.
+            :type dist: :class:`numpy.ndarray`
+
+            :param angle: The angles between the lights' orientations and the directions to the points, which are broadcast in the same way. Defaults to ``0``.
+            :type angle: :class:`numpy.ndarray`
+
+            :return: The brightness.
+            :rtype: :class:`numpy.ndarray`
+        """
+        return BrightnessModel.evaluate(self.model[i], dist, angle, self.brightness[i], self.gradient[i])
+
+    def get_contributions(self, i, x, y, theta, FOV: float=2*math.pi, label: str=None, radius=None) -> np.ndarray:
+        """
+            Get the brightness of some of the field's lights, as it is detected by sensors at the given positions and orientations, with ``0`` for lights which the sensors do not detect.
+
+            :param i: The indices of the lights, or any other index into the field's arrays.
+            :type i: :class:`numpy.ndarray`
+
+            :param x: The x-coordinates of the sensors, which are broadcast with the lights' arrays.
+            :type x: :class:`numpy.ndarray`
+
+            :param y: The y-coordinates of the sensors.
+            :type y: :class:`numpy.ndarray`
+
+            :param theta: The orientations of the sensors.
+            :type theta: :class:`numpy.ndarray`
+
+            :param FOV: The sensors' angular field of view. Defaults to ``2pi``.
+            :type FOV: float
+
+            :param label: The sensors' label. Defaults to ``None``.
+            :type label: str
+
+            :param radius: The lights' cutoff radii, beyond which they are not detected. Defaults to ``None``, in which case lights are detected at any distance.
+            :type radius: :class:`numpy.ndarray`
+
+            :return: The detected brightness of each light.
+            :rtype: :class:`numpy.ndarray`
+        """
+        detected = self.is_on[i] & (self.model[i] >= 0)
+        if label:
+            detected = detected & self.get_label_mask(label)[i]
+
+        dx = self.x[i] - x
+        dy = self.y[i] - y
+        # the sensor can only detect lights in its field of view
+        detected = detected & (np.abs(angle_differences(np.arctan2(dy, dx), theta)) <= FOV/2)
+        # and the light can only be detected from within its spread
+        angle = np.abs(angle_differences(np.arctan2(-dy, -dx), self.theta[i]))
+        detected &= angle < self.half_spread[i]
+
+        dist = np.sqrt(dx**2 + dy**2)
+        if radius is not None:
+            detected &= dist <= radius
+
+        return np.where(detected, self.get_brightness_at_distance(i, dist, angle), 0)
+
+
+class _LightSourceGrid:
+    """
+        A uniform grid over the lights in a :class:`LightSourceField` which have finite cutoff radii, for a given ``cutoff`` and ``max_distance``. The grid's cells are as wide as the largest of those radii, so any light which is within its cutoff radius of a sensor is in the sensor's cell or in one of the eight cells around it. The lights are sorted by cell, so that the lights in a cell are a contiguous range of ``order``, which is found by binary search.
+    """
+    def __init__(self, field: LightSourceField, cutoff: float, max_distance: float):
+        self.field = field
+        n = len(field.sources)
+        idx = np.arange(n)
+
+        # the distance at which each light's brightness falls to the cutoff
+        radius = np.full(n, np.inf)
+        if cutoff is not None:
+            radius = BrightnessModel.get_radius(field.model, field.brightness, field.gradient, cutoff)
+        if max_distance is not None:
+            radius = np.minimum(radius, max_distance)
+        self.radius = radius
+        # the most which an ignored light can contribute to a reading
+        self.edge_brightness = field.get_brightness_at_distance(idx, np.maximum(radius, 0))
+        self.edge_brightness[radius == np.inf] = 0
+        # the sums of edge_brightness over the lights which sensors with each label could detect
+        self.error_totals: Dict[str, float] = {}
+
+        # lights with no cutoff radius are evaluated for every sensor
+        self.unbounded = idx[radius == np.inf]
+
+        bounded = idx[np.isfinite(radius)]
+        self.cell_size = max(float(np.max(radius[bounded])), 1e-9) if len(bounded) else 1.0
+        self.x0 = float(np.min(field.x[bounded])) if len(bounded) else 0.0
+        self.y0 = float(np.min(field.y[bounded])) if len(bounded) else 0.0
+        self.y_cells = int((np.max(field.y[bounded]) - self.y0) // self.cell_size) + 3 if len(bounded) else 1
+        cells = self.get_cells(field.x[bounded], field.y[bounded])
+        order = np.argsort(cells, kind="stable")
+        self.order = bounded[order]
+        self.cells = cells[order]
+
+    def get_cells(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        # the (one-dimensional) ids of the cells which contain the given points. the grid has a spare row above and
+        # below the lights, so that the ids of the cells around a point never wrap around into another column. points
+        # which are too far above or below the lights are moved to the left of the grid, where there are no lights
+        cx = np.floor((x - self.x0) / self.cell_size).astype(np.int64)
+        cy = np.floor((y - self.y0) / self.cell_size).astype(np.int64)
+        outside = (cy < -1) | (cy > self.y_cells - 2)
+        cx[outside] = -2
+        cy[outside] = 0
+        return cx * self.y_cells + cy
+
+    def get_brightness_at(self, x: np.ndarray, y: np.ndarray, theta: np.ndarray, FOV: float, label: str) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(x)
+        field = self.field
+
+        # find the ranges of the sorted lights which are in the nine cells around each sensor
+        cells = self.get_cells(x, y)
+        offsets = (np.array([-1, 0, 1])[:, None] * self.y_cells + np.array([-1, 0, 1])).ravel()
+        cells = (cells[:, None] + offsets).ravel()
+        starts = np.searchsorted(self.cells, cells, side="left")
+        counts = np.searchsorted(self.cells, cells, side="right") - starts
+
+        # expand the ranges into (sensor, light) pairs
+        total = int(np.sum(counts))
+        sensor = np.repeat(np.arange(n * len(offsets)) // len(offsets), counts)
+        ranges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        light = self.order[ranges]
+        unbounded = self.unbounded
+        if label:
+            # only lights in the sensors' bucket need to be evaluated
+            in_bucket = field.get_label_mask(label)[light]
+            sensor = sensor[in_bucket]
+            light = light[in_bucket]
+            unbounded = unbounded[field.get_label_mask(label)[unbounded]]
+
+        contributions = field.get_contributions(light, x[sensor], y[sensor], theta[sensor], FOV, None, self.radius[light])
+        brightness = np.bincount(sensor, contributions, minlength=n)
+        if len(unbounded):
+            brightness += np.sum(field.get_contributions(unbounded, x[:, None], y[:, None], theta[:, None], FOV), axis=-1)
+
+        # every detectable light which was not within its cutoff radius could have contributed up to its edge brightness
+        if label not in self.error_totals:
+            self.error_totals[label] = float(np.sum(self.edge_brightness[field.get_detectable(label)]))
+        dx = field.x[light] - x[sensor]
+        dy = field.y[light] - y[sensor]
+        included = field.get_detectable()[light] & (np.sqrt(dx**2 + dy**2) <= self.radius[light])
+        error = self.error_totals[label] - np.bincount(sensor, np.where(included, self.edge_brightness[light], 0), minlength=n)
+
+        return brightness, np.maximum(error, 0)
+
+
+class _LightSourceRaster:
+    """
+        A raster of a :class:`LightSourceField` (see ``LightSourceField.get_raster``). For every point, a channel holds the brightness of the ``n_sources`` lights which are brightest at that point, along with their indices in the field, in ``near_value`` and ``near_index`` (with shape ``(y_points, x_points, n_sources)``), and the cumulative sums of the brightness of the rest of the lights in each direction bin, going twice around the circle, in ``residual`` (with shape ``(y_points, x_points, 2 * n_directions + 1)``). The brightness of the rest of the lights in any window of directions, including windows which wrap around, is then the difference between two cumulative sums, which are interpolated linearly within bins. ``channels`` holds the channels for sensors with each label, and ``total`` holds the channel for sensors without a label, which detect every light.
+    """
+    def __init__(self, field: LightSourceField, resolution: float, bounds: Tuple[float, float, float, float], n_directions: int, n_sources: int):
+        self.field = field
+        self.resolution = resolution
+        self.n_directions = n_directions
+        self.n_sources = n_sources
+        self.x_min, _, self.y_min, _ = bounds
+        self.x_points = int(math.ceil((bounds[1] - bounds[0]) / resolution)) + 1
+        self.y_points = int(math.ceil((bounds[3] - bounds[2]) / resolution)) + 1
+        self.x_max = self.x_min + (self.x_points - 1) * resolution
+        self.y_max = self.y_min + (self.y_points - 1) * resolution
+        self.channels: Dict[str, tuple] = {}
+        self.total: tuple = None
+
+    def invalidate(self, label: str) -> None:
+        self.channels.pop(label, None)
+        self.total = None
+
+    def get_channel(self, label: str) -> tuple:
+        if label not in self.channels:
+            self.channels[label] = self.compute_channel(np.flatnonzero(self.field.get_detectable() & self.field.get_label_mask(label)))
+        return self.channels[label]
+
+    def get_total(self) -> tuple:
+        if self.total is None:
+            self.total = self.compute_channel(np.flatnonzero(self.field.get_detectable()))
+        return self.total
+
+    def compute_channel(self, lights: np.ndarray) -> tuple:
+        # work out the (near_index, near_value, residual) arrays of a channel (see above) of the given lights
+        field = self.field
+        points_y, points_x = np.meshgrid(self.y_min + np.arange(self.y_points) * self.resolution,
+                                         self.x_min + np.arange(self.x_points) * self.resolution, indexing="ij")
+        points_x = points_x.ravel()
+        points_y = points_y.ravel()
+        n_points = len(points_x)
+        k = min(self.n_sources, len(lights))
+        near_index = np.zeros((n_points, k), dtype=int)
+        near_value = np.zeros((n_points, k))
+        bins = np.zeros((n_points, self.n_directions))
+
+        # points are done in chunks, to limit the size of the (point, light) arrays
+        chunk = max(1, 1000000 // max(len(lights), 1))
+        for start in range(0, n_points, chunk):
+            points = slice(start, start + chunk)
+            x = points_x[points, None]
+            y = points_y[points, None]
+            contributions = field.get_contributions(lights, x, y, 0.0, 2*math.pi)
+            if k:
+                # the brightest lights are kept separately, and only the rest are put into direction bins
+                brightest = np.argpartition(-contributions, k - 1, axis=1)[:, :k] if k < len(lights) else np.broadcast_to(np.arange(k), contributions.shape)
+                near_index[points] = lights[brightest]
+                near_value[points] = np.take_along_axis(contributions, brightest, axis=1)
+                np.put_along_axis(contributions, brightest, 0, axis=1)
+            direction = np.arctan2(field.y[lights] - y, field.x[lights] - x) % (2*math.pi)
+            direction_bins = np.minimum((direction / (2*math.pi) * self.n_directions).astype(int), self.n_directions - 1)
+            rows = np.arange(len(x))[:, None] * self.n_directions + direction_bins
+            bins[points] = np.bincount(rows.ravel(), contributions.ravel(), minlength=len(x) * self.n_directions).reshape(len(x), self.n_directions)
+
+        shape = (self.y_points, self.x_points)
+        residual = np.zeros(shape + (2 * self.n_directions + 1,))
+        bins = bins.reshape(shape + (self.n_directions,))
+        np.cumsum(np.concatenate([bins, bins], axis=-1), axis=-1, out=residual[..., 1:])
+        return near_index.reshape(shape + (k,)), near_value.reshape(shape + (k,)), residual
+
+    def contains(self, x, y):
+        """
+            Check whether the given point(s) are inside the raster.
+        """
+        return (x >= self.x_min) & (x <= self.x_max) & (y >= self.y_min) & (y <= self.y_max)
+
+    def get_brightness_at(self, x, y, theta, FOV: float=2*math.pi, label: str=None):
+        """
+            Sample the brightness detected by sensor(s) at the given position(s), which should be inside the raster (see ``contains``), and orientation(s), with the same arguments as ``LightSourceField.get_brightness_at``. Readings for a single sensor are worked out without NumPy's array functions, which are slow for single numbers.
+        """
+        channel = self.get_channel(label) if label else self.get_total()
+        if np.ndim(x) == 0 and np.ndim(y) == 0 and np.ndim(theta) == 0:
+            return self.get_single_brightness_at(channel, float(x), float(y), float(theta), FOV)
+
+        near_index, near_value, residual = channel
+        n = self.n_directions
+        width = 2*math.pi / n
+        x, y, theta = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(theta, dtype=float))
+        # the four points around each sensor, and the sensor's position between them
+        fx = np.clip((x - self.x_min) / self.resolution, 0, self.x_points - 1)
+        fy = np.clip((y - self.y_min) / self.resolution, 0, self.y_points - 1)
+        ix = np.minimum(fx.astype(int), max(self.x_points - 2, 0))
+        iy = np.minimum(fy.astype(int), max(self.y_points - 2, 0))
+        tx = fx - ix
+        ty = fy - iy
+        ix1 = np.minimum(ix + 1, self.x_points - 1)
+        iy1 = np.minimum(iy + 1, self.y_points - 1)
+
+        # the brightest lights at each of the four points are tested against the sensors' fields of view exactly, using
+        # their directions from the sensors themselves: a light is in view if the cosine of its angle from the sensor's
+        # orientation is at least cos(FOV / 2)
+        brightness = np.zeros(x.shape)
+        if FOV < 2*math.pi:
+            cos_theta, sin_theta, cos_half_FOV = np.cos(theta)[..., None], np.sin(theta)[..., None], math.cos(FOV/2)
+        for py, px, weight in ((iy, ix, (1 - ty) * (1 - tx)), (iy, ix1, (1 - ty) * tx), (iy1, ix, ty * (1 - tx)), (iy1, ix1, ty * tx)):
+            values = near_value[py, px]
+            if FOV < 2*math.pi:
+                i = near_index[py, px]
+                dx = self.field.x[i] - x[..., None]
+                dy = self.field.y[i] - y[..., None]
+                values = np.where(dx * cos_theta + dy * sin_theta >= cos_half_FOV * np.sqrt(dx * dx + dy * dy), values, 0)
+            brightness += weight * np.sum(values, axis=-1)
+
+        if FOV >= 2*math.pi:
+            k = np.full(x.shape, n)
+            return brightness + self.interpolate(residual, ix, iy, ix1, iy1, tx, ty, k, 0)
+
+        # the window of directions which the sensors can see, in units of bins
+        start = ((theta - FOV/2) % (2*math.pi)) / width
+        end = start + FOV / width
+        k_start = np.minimum(start.astype(int), 2*n - 1)
+        k_end = np.minimum(end.astype(int), 2*n - 1)
+        return (brightness + self.interpolate(residual, ix, iy, ix1, iy1, tx, ty, k_end, end - k_end)
+                - self.interpolate(residual, ix, iy, ix1, iy1, tx, ty, k_start, start - k_start))
+
+    @staticmethod
+    def interpolate(values, ix, iy, ix1, iy1, tx, ty, k, tk):
+        # the cumulative sum at k + tk, bilinearly interpolated between the four points
+        def at(k):
+            return ((1 - ty) * ((1 - tx) * values[iy, ix, k] + tx * values[iy, ix1, k])
+                    + ty * ((1 - tx) * values[iy1, ix, k] + tx * values[iy1, ix1, k]))
+        if np.all(tk == 0):
+            return at(k)
+        return (1 - tk) * at(k) + tk * at(np.minimum(k + 1, values.shape[-1] - 1))
+
+    def get_single_brightness_at(self, channel: tuple, x: float, y: float, theta: float, FOV: float) -> float:
+        near_index, near_value, residual = channel
+        n = self.n_directions
+        fx = min(max((x - self.x_min) / self.resolution, 0), self.x_points - 1)
+        fy = min(max((y - self.y_min) / self.resolution, 0), self.y_points - 1)
+        ix = min(int(fx), max(self.x_points - 2, 0))
+        iy = min(int(fy), max(self.y_points - 2, 0))
+        tx = fx - ix
+        ty = fy - iy
+        ix1 = min(ix + 1, self.x_points - 1)
+        iy1 = min(iy + 1, self.y_points - 1)
+        corners = [(iy, ix, (1 - ty) * (1 - tx)), (iy, ix1, (1 - ty) * tx), (iy1, ix, ty * (1 - tx)), (iy1, ix1, ty * tx)]
+
+        # the brightest lights at the four points, weighted by the bilinear interpolation, and tested against the
+        # sensor's field of view once each
+        near = {}
+        for py, px, weight in corners:
+            if weight:
+                for i, value in zip(near_index[py, px].tolist(), near_value[py, px].tolist()):
+                    near[i] = near.get(i, 0.0) + weight * value
+        brightness = 0.0
+        if FOV < 2*math.pi:
+            cos_theta, sin_theta, cos_half_FOV = math.cos(theta), math.sin(theta), math.cos(FOV/2)
+        for i, value in near.items():
+            if FOV < 2*math.pi:
+                dx = float(self.field.x[i]) - x
+                dy = float(self.field.y[i]) - y
+                if dx * cos_theta + dy * sin_theta < cos_half_FOV * math.sqrt(dx * dx + dy * dy):
+                    continue
+            brightness += value
+
+        # the cumulative sums of the rest of the lights at the four points
+        sums = [(weight, residual[py, px]) for py, px, weight in corners if weight]
+
+        def at(t):
+            k = min(int(t), 2*n - 1)
+            tk = t - k
+            total = 0.0
+            for weight, c in sums:
+                total += weight * ((1 - tk) * c[k] + tk * c[min(k + 1, 2*n)])
+            return total
+
+        if FOV >= 2*math.pi:
+            return brightness + at(n)
+        width = 2*math.pi / n
+        start = ((theta - FOV/2) % (2*math.pi)) / width
+        return brightness + at(start + FOV / width) - at(start)
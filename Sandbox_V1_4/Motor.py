@@ -36,7 +36,7 @@ class Motor(System):
         self.noisemaker = noisemaker
         # current speed and history of speed
         self.speed = 0.0
-        self.speeds = [0.0]
+        self.speeds = History([0.0])
 
         # system parameters
         self.motor_inertia_coeff = max(0, motor_inertia_coeff) + 1 # limits rate of change of speed
@@ -46,7 +46,7 @@ class Motor(System):
         self.initial_max_speed = self.max_speed
 
         self.reversed = reversed
-        self.reverseds = [reversed]
+        self.reverseds = History([reversed])
 
         self.name_str = name_str
 
@@ -95,11 +95,11 @@ class Motor(System):
         """
             A function to reset a motor to its initial state. Resets ``max_speed``, ``motor_inertia_coeff``, ``speed``, history of ``speeds``, ``reversed``, and history of ``reverseds``, as well as the motor's noise source, if it has one.
         """
-        self.speed = self.speeds[0]
-        self.speeds = [self.speed]
+        self.speed = self.speeds.first
+        self.speeds = History([self.speed])
 
-        self.reversed = self.reverseds[0]
-        self.reverseds = [self.reversed]
+        self.reversed = self.reverseds.first
+        self.reverseds = History([self.reversed])
 
         self.max_speed = self.initial_max_speed
         self.motor_inertia_coeff = self.initial_motor_inertia_coeff
@@ -107,7 +107,7 @@ class Motor(System):
         if self.noisemaker:
             self.noisemaker.reset()
 
-    def get_data(self) -> Dict[str, Union[List[float], List[bool]]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Union[List[float], List[bool]]]:
         """
             A function to get a motor's data.
 
@@ -120,9 +120,9 @@ class Motor(System):
             :return: Motor's data.
             :rtype: dict
         """
-        data = {"speeds": self.speeds, "reverseds": self.reverseds, "noises": None}
+        data = {"speeds": self.speeds.get_values(copy), "reverseds": self.reverseds.get_values(copy), "noises": None}
         if self.noisemaker:
-            data["noises"] = self.noisemaker.get_data()["noises"]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         data["name_str"] = self.name_str
         return data
 
@@ -35,7 +35,7 @@ class MotorSpeedSensor(Sensor):
         self.motor = motor
         self.noisemaker = noisemaker
         self.activation = 0
-        self.activations = [self.activation]
+        self.activations = History([self.activation])
 
     def step(self, dt: float) -> float:
         """
@@ -52,7 +52,7 @@ class MotorSpeedSensor(Sensor):
 
         return self.update(dt)
 
-    def get_data(self):
+    def get_data(self, copy: bool=False):
         """
             A function to get the data from an :class:`MotorSpeedSensor`, in the form of a string-keyed dict.
 
@@ -66,12 +66,12 @@ class MotorSpeedSensor(Sensor):
             :return: The sensors's data.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["activation"] = self.activation
-        data["activations"] = self.activations[:]
+        data["activations"] = self.activations.get_values(copy)
         data["noises"] =  None
         if self.noisemaker:
-            data["noises"] = self.noisemaker.get_data()["noises"][:]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         return data
 
     def reset(self) -> None:
@@ -80,7 +80,7 @@ class MotorSpeedSensor(Sensor):
         """
         super().reset()
         self.activation = 0
-        self.activations = [self.activation]
+        self.activations = History([self.activation])
 
         if self.noisemaker:
             self.noisemaker.reset()
@@ -0,0 +1,119 @@
+from .base import *
+from .noise import *
+from .Simulator import *
+
+import os
+
+class NoiseRecorder:
+    """
+        A class for recording the random numbers which every :class:`NoiseSource` in a simulation uses (see ``NoiseSource.get_random``) to disk, and then replaying them, in the same or in another simulation, in place of drawing new ones. This makes it possible to compare different controllers under exactly the same motor, sensor and controller noise. Replaying is not faster than generating noise: reading the numbers back costs about as much as drawing them.
+
+        Each noise source's stream of random numbers is written to its own ``.npy`` file in the recorder's ``directory``, which is named after the path of the noise source in the simulation (see :meth:`Sandbox.Simulator.walk_systems`), in the same way as the files of a :class:`RunWriter`, e.g. ``"agents.0.left_motor.noisemaker.noise_sources.0.npy"``. Files are written ``chunk_size`` numbers at a time (see ``History.spill``), and are read back through memory maps, ``chunk_size`` numbers at a time.
+
+        In a replay, a noise source is given the numbers which the noise source with the same path was given in the recording, in the same order, so the simulations should have the same structure, at least as far as their noise sources are concerned. As the numbers, rather than the noise itself, are replayed, a noise source's parameters can be different in the replay. Noise sources which were not in the recording draw random numbers as usual, and a noise source which runs out of recorded numbers raises an error.
+
+        A recorder is used by calling :meth:`start` after the simulation has been reset (and seeded, if it is seeded), and :meth:`finish` after it has been run, e.g.::
+
+            recorder = NoiseRecorder("noise", mode="record")
+            recorder.start(sim)
+            sim.run()
+            recorder.finish()
+
+        Recording and replaying carry on when a simulation is restored from a snapshot (see :meth:`Sandbox.Simulator.restore`), so a script which restores a simulation part way through a recording can be replayed by restoring it at the same point. However, they do not carry into copies of a simulation, e.g. from :meth:`Sandbox.Simulator.fork`, which draw their own random numbers, nor into runs which are executed in worker processes by :meth:`Sandbox.SimulationRunner.run_sims` with ``workers > 1``, as each worker has its own copy of the simulation.
+    """
+    def __init__(self, directory: str, mode: str="record", chunk_size: int=4096):
+        """
+            __init__(directory: str, mode: str="record", chunk_size: int=4096)
+
+            :param directory: The directory which the recording is written to, or read from. It is created if it does not exist.
+            :type directory: str
+
+            :param mode: Either ``"record"`` or ``"replay"``. Defaults to ``"record"``.
+            :type mode: str
+
+            :param chunk_size: The number of random numbers which are written or read at a time, for each noise source. Defaults to ``4096``.
+            :type chunk_size: int
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError("mode must be 'record' or 'replay', not " + repr(mode))
+        self.directory = directory
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.streams: List[Tuple[NoiseSource, _NoiseStream]] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def get_file_path(self, path: str) -> str:
+        """
+            Get the path of the file which holds the stream of the noise source at the given path in the simulation.
+        """
+        return os.path.join(self.directory, path.replace("/", ".") + ".npy")
+
+    def start(self, sim: Simulator) -> None:
+        """
+            Start recording or replaying the streams of all of the noise sources in a simulation.
+
+            :param sim: The simulation.
+            :type sim: :class:`Simulator`
+        """
+        self.finish()
+        for path, system in sim.walk_systems():
+            if isinstance(system, NoiseSource):
+                file_path = self.get_file_path(path)
+                if self.mode == "replay" and not os.path.exists(file_path):
+                    continue
+                stream = _NoiseStream(file_path, self.mode == "replay", self.chunk_size)
+                system.stream = stream
+                self.streams.append((system, stream))
+
+    def finish(self) -> None:
+        """
+            Stop recording or replaying, and finish writing the recording's files, if it is being recorded.
+        """
+        for source, stream in self.streams:
+            stream.close()
+            if source.stream is stream:
+                source.stream = None
+        self.streams = []
+
+
+class _NoiseStream:
+    """
+        The stream of random numbers of one noise source, which is being written to, or read from, a ``.npy`` file. Numbers are written through a :class:`History` which is spilled to the file, and are read from a memory map of the file, a chunk at a time.
+    """
+    def __init__(self, path: str, replaying: bool, chunk_size: int):
+        self.path = path
+        self.replaying = replaying
+        self.chunk_size = chunk_size
+        self.history: History = None
+        self.file: np.ndarray = None
+        self.chunk: List[float] = []
+        self.position = 0  # the index in the file of the start of the next chunk
+        self.index = 0  # the index in the chunk of the next number to read
+        if replaying:
+            self.file = np.load(path, mmap_mode="r")
+        else:
+            self.history = History()
+
+    def write(self, value: float) -> None:
+        self.history.append(value)
+        if self.history.file is None and self.history.path is None:
+            self.history.spill(self.path, self.chunk_size)
+
+    def read(self) -> float:
+        if self.index == len(self.chunk):
+            if self.position >= len(self.file):
+                raise ValueError("The recorded noise in " + self.path + " has run out")
+            self.chunk = self.file[self.position:self.position + self.chunk_size].tolist()
+            self.position += len(self.chunk)
+            self.index = 0
+        value = self.chunk[self.index]
+        self.index += 1
+        return value
+
+    def close(self) -> None:
+        if self.history is not None:
+            if self.history.file is None and self.history.path is None:
+                # nothing was recorded, so the file is written empty
+                np.save(self.path, np.zeros(0))
+            self.history.close_file()
+        self.file = None
@@ -0,0 +1,230 @@
+from .System import *
+from .Agent import *
+from .Arena import *
+from .Patch import *
+
+class OccluderGrid(System):
+    """
+        A class which holds the bodies of a list of :class:`Agent` s, as circles, and a list of walls, as line segments, so that whole arrays of line-of-sight segments, e.g. from light sensors to light sources, can be tested for being blocked by any of them. This is what an :class:`OccludingLightSensor` uses to model shadowing.
+
+        The agents are held in a uniform grid of square cells, each at least as wide as the largest agent's diameter, with every agent listed in each of the cells which its bounding box overlaps. The table of listings is sorted by cell, so that the agents in a cell are a contiguous range, which is found by binary search. To find the agents which might block a segment, the segment is sampled at intervals of no more than a cell's width, which is enough to find all of the cells which it passes through, and only the agents listed in those cells are tested exactly. Walls are usually few, so every wall is tested against every segment, with array operations.
+
+        An agent does not block a segment which starts or ends on or inside its body, so an agent does not shadow the sensors which are mounted on its own body, or the light which it carries.
+
+        The grid reads the positions of its agents in :meth:`refresh`, which is called whenever the grid is stepped, so the grid should be added to a :class:`Simulator`'s ``envs`` list, in the same way as an :class:`AgentCollisionManager`. The table is only sorted again when at least one agent has moved into a different cell. Agents can be added to or removed from the list at any time, and walls which move, such as an :class:`Arena` which is moved, are followed too.
+    """
+    def __init__(self, agents: List[Agent]=None, walls: list=None, cell_size: float=None):
+        """
+            __init__(agents: List[Agent]=None, walls: list=None, cell_size: float=None)
+
+            :param agents: The agents whose bodies block light. Defaults to ``None``, in which case no agents block light.
+            :type agents: list[:class:`Agent`]
+
+            :param walls: The walls which block light. These can be instances of :class:`Arena`, whose four walls are used, instances of :class:`Wall`, or line segments, given as tuples of ``(x1, y1, x2, y2)``. Defaults to ``None``, in which case there are no walls.
+            :type walls: list
+
+            :param cell_size: The width of the grid's cells. Defaults to ``None``, in which case the cells are sized so that there is about one agent per cell, over the area which the agents are spread across when the grid is built, or when agents are added or removed. Cells are never made narrower than the largest agent's diameter.
+            :type cell_size: float
+        """
+        super().__init__()
+        self.agents = agents if agents is not None else []
+        self.walls = walls if walls is not None else []
+        self.given_cell_size = cell_size
+        self.cell_size: float = None
+        # the agents' positions and radii, in the order of the agents list, and the order which sorts them by cell
+        self.cx: np.ndarray = None
+        self.cy: np.ndarray = None
+        self.radius: np.ndarray = None
+        self.bounds: np.ndarray = None
+        self.cell_keys: np.ndarray = None
+        self.order: np.ndarray = None
+        self.sorted_keys: np.ndarray = None
+        self.refresh()
+
+    @staticmethod
+    def get_wall_segments(wall) -> List[Tuple[float, float, float, float]]:
+        """
+            Get the line segments which make up a wall, as tuples of ``(x1, y1, x2, y2)``.
+
+            :param wall: An :class:`Arena`, a :class:`Wall`, or a line segment.
+            :type wall: :class:`Arena`, :class:`Wall` or tuple[float, float, float, float]
+
+            :return: The segments.
+            :rtype: list[tuple[float, float, float, float]]
+        """
+        if isinstance(wall, Arena):
+            return [(wall.x_left, wall.y_bottom, wall.x_right, wall.y_bottom),
+                    (wall.x_right, wall.y_bottom, wall.x_right, wall.y_top),
+                    (wall.x_right, wall.y_top, wall.x_left, wall.y_top),
+                    (wall.x_left, wall.y_top, wall.x_left, wall.y_bottom)]
+        if isinstance(wall, Wall):
+            # a wall only extends over its patches
+            if wall.y_bottom < wall.y_top:
+                return [(wall.x, wall.y_bottom, wall.x, wall.y_top)]
+            return []
+        return [tuple(wall)]
+
+    def step(self, dt: float) -> None:
+        """
+            Step the grid forwards in time, by reading the current positions of its agents and walls.
+
+            :param dt: Integration interval - not used here.
+            :type dt: float
+        """
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+            Read the current positions of the grid's agents and walls. The table of agents is only sorted again if any of them overlaps different cells from the last time the grid was refreshed.
+        """
+        segments = [segment for wall in self.walls for segment in OccluderGrid.get_wall_segments(wall)]
+        self.segments = np.array(segments, dtype=float).reshape(-1, 4)
+
+        n = len(self.agents)
+        self.cx = np.fromiter((agent.x for agent in self.agents), dtype=float, count=n)
+        self.cy = np.fromiter((agent.y for agent in self.agents), dtype=float, count=n)
+        radius = np.fromiter((agent.radius for agent in self.agents), dtype=float, count=n)
+        if n == 0:
+            self.radius, self.cell_keys, self.order, self.sorted_keys = radius, None, None, None
+            return
+
+        rebuild = self.radius is None or len(radius) != len(self.radius) or np.any(radius != self.radius)
+        self.radius = radius
+        if rebuild:
+            max_diameter = 2 * float(radius.max())
+            if self.given_cell_size is None:
+                # aim for about one agent per cell, over the area which the agents are spread across
+                area = float(np.ptp(self.cx) * np.ptp(self.cy))
+                self.cell_size = max(max_diameter, math.sqrt(area / n))
+                if self.cell_size <= 0:
+                    self.cell_size = 1.0
+            else:
+                self.cell_size = max(self.given_cell_size, max_diameter)
+
+        # each agent is listed in every cell which its bounding box overlaps, which is at most four cells
+        h = self.cell_size
+        bounds = np.floor(np.stack([self.cx - radius, self.cx + radius, self.cy - radius, self.cy + radius]) / h).astype(np.int64)
+        if not rebuild and np.array_equal(bounds, self.bounds):
+            # no agent has changed cells, so the sorted table still holds
+            return
+        self.bounds = bounds
+        ix_lo, ix_hi, iy_lo, iy_hi = bounds
+        self.ix_min, self.ix_max = int(ix_lo.min()), int(ix_hi.max())
+        self.iy_min, self.iy_max = int(iy_lo.min()), int(iy_hi.max())
+        self.height = self.iy_max - self.iy_min + 1
+        agent, ix, iy = [], [], []
+        for dx in (0, 1):
+            for dy in (0, 1):
+                listed = (ix_lo + dx <= ix_hi) & (iy_lo + dy <= iy_hi)
+                agent.append(np.flatnonzero(listed))
+                ix.append(ix_lo[listed] + dx)
+                iy.append(iy_lo[listed] + dy)
+        agent, ix, iy = np.concatenate(agent), np.concatenate(ix), np.concatenate(iy)
+        self.cell_keys = (ix - self.ix_min) * self.height + (iy - self.iy_min)
+        order = np.argsort(self.cell_keys, kind="stable")
+        self.order = agent[order]
+        self.sorted_keys = self.cell_keys[order]
+
+    def get_candidates(self, x1, y1, x2, y2) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            Get the pairs of segments and agents which need to be tested exactly, i.e. the agents which are listed in the cells which each segment passes through. A pair may appear more than once.
+
+            :return: The indices of the segments and of the agents in each pair.
+            :rtype: tuple[:class:`numpy.ndarray`, :class:`numpy.ndarray`]
+        """
+        empty = np.zeros(0, dtype=np.int64)
+        if self.sorted_keys is None or len(x1) == 0:
+            return empty, empty
+        h = self.cell_size
+        # sample every segment at intervals of no more than h, including both ends
+        n_samples = np.ceil(np.hypot(x2 - x1, y2 - y1) / h).astype(np.int64) + 1
+        n_samples = np.maximum(n_samples, 2)
+        segment = np.repeat(np.arange(len(x1)), n_samples)
+        starts = np.cumsum(n_samples) - n_samples
+        t = (np.arange(len(segment)) - starts[segment]) / (n_samples - 1)[segment]
+        sx = np.floor((x1[segment] + t * (x2 - x1)[segment]) / h).astype(np.int64)
+        sy = np.floor((y1[segment] + t * (y2 - y1)[segment]) / h).astype(np.int64)
+
+        # the cells of consecutive samples differ by at most one in each direction, so the part of the segment between
+        # them only passes through their two cells, and, if they differ in both directions, the two other cells which
+        # share corners with both
+        first = np.zeros(len(segment), dtype=bool)
+        first[starts] = True
+        moved = np.ones(len(segment), dtype=bool)
+        moved[1:] = (sx[1:] != sx[:-1]) | (sy[1:] != sy[:-1])
+        moved |= first
+        diagonal = np.flatnonzero(~first[1:] & (sx[1:] != sx[:-1]) & (sy[1:] != sy[:-1])) + 1
+        segment = np.concatenate([segment[moved], segment[diagonal], segment[diagonal]])
+        cx = np.concatenate([sx[moved], sx[diagonal], sx[diagonal - 1]])
+        cy = np.concatenate([sy[moved], sy[diagonal - 1], sy[diagonal]])
+
+        inside = (cx >= self.ix_min) & (cx <= self.ix_max) & (cy >= self.iy_min) & (cy <= self.iy_max)
+        segment = segment[inside]
+        cell = (cx[inside] - self.ix_min) * self.height + (cy[inside] - self.iy_min)
+
+        lo = np.searchsorted(self.sorted_keys, cell, side="left")
+        hi = np.searchsorted(self.sorted_keys, cell, side="right")
+        counts = hi - lo
+        segment = np.repeat(segment, counts)
+        position = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+        return segment, self.order[position]
+
+    def get_visible(self, x1, y1, x2, y2) -> np.ndarray:
+        """
+            Find which of the given line segments are not blocked by any of the grid's agents or walls.
+
+            :param x1: The x-coordinates of the segments' start points.
+            :type x1: :class:`numpy.ndarray`
+
+            :param y1: The y-coordinates of the segments' start points.
+            :type y1: :class:`numpy.ndarray`
+
+            :param x2: The x-coordinates of the segments' end points.
+            :type x2: :class:`numpy.ndarray`
+
+            :param y2: The y-coordinates of the segments' end points.
+            :type y2: :class:`numpy.ndarray`
+
+            :return: A mask of the segments which are not blocked.
+            :rtype: :class:`numpy.ndarray`
+        """
+        x1, y1, x2, y2 = np.broadcast_arrays(*[np.atleast_1d(np.asarray(a, dtype=float)) for a in (x1, y1, x2, y2)])
+        x1, y1, x2, y2 = x1.ravel(), y1.ravel(), x2.ravel(), y2.ravel()
+        visible = np.ones(len(x1), dtype=bool)
+
+        if len(self.segments):
+            # a segment is blocked by a wall if each one's ends are strictly on opposite sides of the other
+            wx1, wy1, wx2, wy2 = self.segments.T
+            dx, dy = (x2 - x1)[:, None], (y2 - y1)[:, None]
+            ex, ey = wx2 - wx1, wy2 - wy1
+            o1 = dx * (wy1 - y1[:, None]) - dy * (wx1 - x1[:, None])
+            o2 = dx * (wy2 - y1[:, None]) - dy * (wx2 - x1[:, None])
+            o3 = ex * (y1[:, None] - wy1) - ey * (x1[:, None] - wx1)
+            o4 = ex * (y2[:, None] - wy1) - ey * (x2[:, None] - wx1)
+            visible &= ~np.any((o1 * o2 < 0) & (o3 * o4 < 0), axis=1)
+
+        segment, agent = self.get_candidates(x1, y1, x2, y2)
+        if len(segment):
+            ax, ay, r2 = self.cx[agent], self.cy[agent], self.radius[agent]**2
+            px, py = x1[segment], y1[segment]
+            dx, dy = x2[segment] - px, y2[segment] - py
+            fx, fy = ax - px, ay - py
+            length2 = dx**2 + dy**2
+            t = np.clip(np.divide(fx * dx + fy * dy, length2, out=np.zeros_like(length2), where=length2 > 0), 0, 1)
+            blocked = (fx - t * dx)**2 + (fy - t * dy)**2 < r2
+            # agents do not block segments which start or end on or inside their bodies
+            blocked &= fx**2 + fy**2 > r2 * (1 + 1e-9)
+            blocked &= (ax - x2[segment])**2 + (ay - y2[segment])**2 > r2 * (1 + 1e-9)
+            visible[segment[blocked]] = False
+
+        return visible
+
+    def reset(self) -> None:
+        """
+            Reset the grid, by reading the positions of its agents and walls again.
+        """
+        super().reset()
+        self.refresh()
+
+    def pygame_draw(self, screen, scale: float, shiftx: float, shifty: float):
+        pass
@@ -0,0 +1,136 @@
+from .LightSensor import *
+from .OccluderGrid import *
+
+class OccludingLightSensor(LightSensor):
+    """
+        A :class:`LightSensor` which can be shadowed. A light is only detected if the line segment from the sensor to the light is not blocked by any of the agents or walls in the sensor's :class:`OccluderGrid`. The grid is shared by all of the sensors in a simulation, and should be added to the :class:`Simulator`'s ``envs`` list, so that it follows the agents as they move.
+
+        For each sensor, the contributions of all of the lights which it could detect are computed as for a :class:`LightSensor`, and then the segments to the lights which contribute anything are tested against the grid, all at once. When the sensors are stepped by a :class:`SensorRegistry`, the segments of all of the sensors in a group are tested together.
+
+        ``cutoff`` and ``max_distance`` are applied as for a :class:`LightSensor`, but as occlusion can change on every step, readings are never sampled from rasters.
+    """
+    # shadows move, so rasters cannot be used
+    raster_resolution: float = None
+
+    def __init__(self, light_sources: List[LightSource], x: float, y: float, theta: float=0, FOV: float=2*math.pi, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='OccludingLightSensor', colour: str='red', delay_steps: int=0, cutoff: float=None, max_distance: float=None, occluders: OccluderGrid=None):
+        """
+            __init__(self, light_sources: List[LightSource], x: float, y: float, theta: float=0, FOV: float=2*math.pi, noisemaker: NoiseSource=None, label: str=None, enabled: bool=True, name_str: str='OccludingLightSensor', colour: str='red', delay_steps: int=0, cutoff: float=None, max_distance: float=None, occluders: OccluderGrid=None)
+
+            See :class:`LightSensor` for the other parameters.
+
+            :param occluders: The grid of agents and walls which can block the sensor's view of its lights. Defaults to ``None``, in which case nothing is blocked, and the sensor behaves as a :class:`LightSensor`.
+            :type occluders: :class:`OccluderGrid`
+        """
+        super().__init__(light_sources=light_sources, x=x, y=y, theta=theta, FOV=FOV, noisemaker=noisemaker, label=label, enabled=enabled, name_str=name_str, colour=colour, delay_steps=delay_steps, cutoff=cutoff, max_distance=max_distance)
+        self.occluders = occluders
+
+    def step(self, dt: float) -> float:
+        """
+            A method to step an occluding light sensor forwards in time (see ``LightSensor.step``).
+
+            :param dt: Integration interval - not used here.
+            :type dt: float
+
+            :return: The activation (level of stimulation) of the sensor.
+            :rtype: float
+        """
+        System.step(self, dt)  # store xy-coordinates and theta
+        self.activation = 0.0
+        if self.enabled:
+            activations, errors = OccludingLightSensor.get_occluded_brightness(self.get_field(), self.occluders, np.array([self.x], dtype=float), np.array([self.y], dtype=float), np.array([self.theta], dtype=float), self.FOV, self.label, self.cutoff, self.max_distance)
+            self.activation = float(activations[0])
+            self.max_cutoff_error = max(self.max_cutoff_error, float(errors[0]))
+
+        return self.update(dt)
+
+    @classmethod
+    def step_batch(cls, sensors: List["OccludingLightSensor"], dt: float) -> List[float]:
+        """
+            Step a group of occluding light sensors forwards in time (see ``Sensor.step_batch``). The sensors are split up by their fields, settings and grids, and the segments from all of the sensors in each subgroup to their lights are tested against the grid together.
+
+            :param sensors: The sensors.
+            :type sensors: list[:class:`OccludingLightSensor`]
+
+            :param dt: Integration interval - not used here.
+            :type dt: float
+
+            :return: The sensors' activations, in the same order as ``sensors``.
+            :rtype: list[float]
+        """
+        subgroups = {}
+        for sensor in sensors:
+            System.step(sensor, dt)
+            sensor.activation = 0.0
+            if sensor.enabled:
+                # grids are Systems, which are not hashable, so they are grouped by identity
+                key = (sensor.get_field(), id(sensor.occluders), sensor.FOV, sensor.label, sensor.cutoff, sensor.max_distance)
+                subgroups.setdefault(key, []).append(sensor)
+
+        for (field, _, FOV, label, cutoff, max_distance), subgroup in subgroups.items():
+            occluders = subgroup[0].occluders
+            x = np.array([sensor.x for sensor in subgroup], dtype=float)
+            y = np.array([sensor.y for sensor in subgroup], dtype=float)
+            theta = np.array([sensor.theta for sensor in subgroup], dtype=float)
+            activations, errors = OccludingLightSensor.get_occluded_brightness(field, occluders, x, y, theta, FOV, label, cutoff, max_distance)
+            for sensor, activation, error in zip(subgroup, activations.tolist(), errors.tolist()):
+                sensor.activation = activation
+                if error > sensor.max_cutoff_error:
+                    sensor.max_cutoff_error = error
+
+        return [sensor.update(dt) for sensor in sensors]
+
+    @staticmethod
+    def get_occluded_brightness(field: LightSourceField, occluders: OccluderGrid, x: np.ndarray, y: np.ndarray, theta: np.ndarray, FOV: float=2*math.pi, label: str=None, cutoff: float=None, max_distance: float=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            Get the total brightness of a field's lights, as it is detected by sensors at the given positions and orientations, leaving out lights which are hidden from a sensor by the agents or walls in ``occluders``.
+
+            :param field: The field.
+            :type field: :class:`LightSourceField`
+
+            :param occluders: The grid of occluders, or ``None``, in which case nothing is hidden.
+            :type occluders: :class:`OccluderGrid`
+
+            :param x: The x-coordinates of the sensors.
+            :type x: :class:`numpy.ndarray`
+
+            :param y: The y-coordinates of the sensors.
+            :type y: :class:`numpy.ndarray`
+
+            :param theta: The orientations of the sensors.
+            :type theta: :class:`numpy.ndarray`
+
+            :param FOV: The sensors' angular field of view. Defaults to ``2pi``.
+            :type FOV: float
+
+            :param label: The sensors' label. Defaults to ``None``.
+            :type label: str
+
+            :param cutoff: The brightness below which lights are ignored. Defaults to ``None``.
+            :type cutoff: float
+
+            :param max_distance: The distance beyond which lights are ignored. Defaults to ``None``.
+            :type max_distance: float
+
+            :return: The brightness detected by each sensor, and the total unoccluded brightness of the lights which each sensor ignored, because of ``cutoff`` or ``max_distance``.
+            :rtype: tuple[:class:`numpy.ndarray`, :class:`numpy.ndarray`]
+        """
+        i = field.get_bucket(label) if label else np.arange(len(field.sources))
+        contributions = field.get_contributions(i, x[:, None], y[:, None], theta[:, None], FOV, label)
+
+        errors = np.zeros(len(x))
+        if cutoff is not None or max_distance is not None:
+            ignored = np.zeros(contributions.shape, dtype=bool)
+            if cutoff is not None:
+                ignored |= contributions < cutoff
+            if max_distance is not None:
+                ignored |= np.hypot(field.x[i] - x[:, None], field.y[i] - y[:, None]) > max_distance
+            errors = np.where(ignored, contributions, 0).sum(axis=1)
+            contributions = np.where(ignored, 0, contributions)
+
+        # only the segments to lights which contribute anything need to be tested
+        sensor, light = np.nonzero(contributions)
+        weights = contributions[sensor, light]
+        if occluders is not None and len(sensor):
+            visible = occluders.get_visible(x[sensor], y[sensor], field.x[i][light], field.y[i][light])
+            sensor, weights = sensor[visible], weights[visible]
+        return np.bincount(sensor, weights=weights, minlength=len(x)), errors
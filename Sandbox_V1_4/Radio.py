@@ -1,5 +1,4 @@
 from .System import *
-import random
 
 class Radio(System):
 	"""
@@ -35,7 +34,7 @@ class Radio(System):
 		self.transmitter_range = transmitter_range
 		self.receiver_range = receiver_range
 
-		self.initial_state = self.get_data()
+		self.initial_state = self.get_data(copy=True)
 
 	def add_radio(self, radio):
 		"""
@@ -50,10 +49,10 @@ class Radio(System):
 		"""
             Receive messages from any in-range radios which this one can potentially communicate with.
 		"""
-		random.shuffle(self.radios)
-
 		self.received_messages = []
-		for radio in self.radios:
+		# receive messages in a random order, without reordering the list of radios
+		for i in self.get_rng().permutation(len(self.radios)):
+			radio = self.radios[i]
 			dist = math.sqrt((self.x - radio.x) ** 2 + (self.y - radio.y) ** 2)
 			if dist <= self.receiver_range and dist <= radio.transmitter_range:
 				self.received_messages.append(radio.message)
@@ -73,7 +72,7 @@ class Radio(System):
 		self.receiver_range = self.initial_state["receiver_range"]
 		self.transmitter_range = self.initial_state["transmitter_range"]
 
-	def get_data(self):
+	def get_data(self, copy: bool=False):
 		"""
             A function to get a radios's data.
 
@@ -86,7 +85,7 @@ class Radio(System):
             * transmitter range: ``data["transmitter_range"]``
             * receiver range: ``data["receiver_range"]``
 		"""
-		data = super().get_data()
+		data = super().get_data(copy)
 
 		data["enabled"] = self.enabled
 		data["radios"] = self.radios[:]
@@ -7,11 +7,19 @@ from .MotorSpeedSensor import *
 from .RobotController import *
 from .noise import *
 from .pygame_functions import *
+from .Kinematics import *
 
 class Robot(Agent):
     """
         A class to represent a robot with a differential drive.
     """
+    # step_sensors only steps the sensors in the sensors list, so a SensorRegistry can step them instead
+    sensor_batching = True
+    # integrate_batch is a vectorised version of integrate, so robots can be stepped together (see Agent.step_batch)
+    step_batching = True
+    # the integrator which robots' motion is integrated with, unless they are given one (see Kinematics)
+    integrator: str = "euler"
+
     def __init__(self, x: float,
                        y: float,
                        controller: RobotController,
@@ -42,9 +50,10 @@ class Robot(Agent):
                        perturb_fun: Callable=None,
                        pheromone_manager=None,
                        drop_interval=0.5,
-                       p_bump_noise=0):
+                       p_bump_noise=0,
+                       integrator: str=None):
         """
-            __init__(self, x: float, y: float, controller: RobotController, sensors: List[LightSensor], sensor_angles: List[float], radius: float=1, theta: float=0, left_motor_max_speed: float=2, right_motor_max_speed: float=2, left_motor_inertia: float=0, right_motor_inertia: float=0, left_motor_noisemaker: NoiseSource=None, right_motor_noisemaker: NoiseSource=None, left_motor_reversed: bool=False, right_motor_reversed: bool=False, left_motor_sensor_noisemaker: NoiseSource=None, right_motor_sensor_noisemaker: NoiseSource=None, energy_sensor_noisemaker: NoiseSource=None, colour: str='darkblue', light: LightSource=None, action_energy_cost: float=0, metabolism_energy_cost: float=0, alive: bool=True, maximum_energy: float=0, initial_energy: float=1, consumables=None, init_fun: Callable=None, perturb_fun: Callable=None, pheromone_manager=None, drop_interval=0.5, p_bump_noise=0)
+            __init__(self, x: float, y: float, controller: RobotController, sensors: List[LightSensor], sensor_angles: List[float], radius: float=1, theta: float=0, left_motor_max_speed: float=2, right_motor_max_speed: float=2, left_motor_inertia: float=0, right_motor_inertia: float=0, left_motor_noisemaker: NoiseSource=None, right_motor_noisemaker: NoiseSource=None, left_motor_reversed: bool=False, right_motor_reversed: bool=False, left_motor_sensor_noisemaker: NoiseSource=None, right_motor_sensor_noisemaker: NoiseSource=None, energy_sensor_noisemaker: NoiseSource=None, colour: str='darkblue', light: LightSource=None, action_energy_cost: float=0, metabolism_energy_cost: float=0, alive: bool=True, maximum_energy: float=0, initial_energy: float=1, consumables=None, init_fun: Callable=None, perturb_fun: Callable=None, pheromone_manager=None, drop_interval=0.5, p_bump_noise=0, integrator: str=None)
 
             :param x: The :class:`Robot`'s initial x-coordinate.
             :type x: float
@@ -135,6 +144,9 @@ class Robot(Agent):
 
             :param consumables: The list of consumables which this agent can consume.
             :type consumables: list(:class:`Consumable`)
+
+            :param integrator: The name of the integrator which the robot's motion is integrated with: ``"euler"``, ``"arc"`` or ``"rk4"`` (see :class:`Kinematics`). Defaults to ``None``, in which case ``Robot.integrator`` is used.
+            :type integrator: str
         """
         super().__init__(x, y, colour, theta, radius, light, energy_sensor_noisemaker, action_energy_cost, metabolism_energy_cost, alive, maximum_energy, initial_energy, init_fun=init_fun, perturb_fun=perturb_fun, pheromone_manager=pheromone_manager, drop_interval=drop_interval, p_bump_noise=p_bump_noise)  # call Agent constructor
 
@@ -152,6 +164,8 @@ class Robot(Agent):
         self.sensors += [left_motor_sensor, right_motor_sensor] + sensors
 
         self.consumables = consumables
+        if integrator is not None:
+            self.integrator = integrator
 
         self.initial_sensors = cp.copy(self.sensors)
         self.initial_sensor_angles = cp.copy(self.sensor_angles)
@@ -218,7 +232,7 @@ class Robot(Agent):
 
             Only called from step().
 
-            Applies a motor activation vector to a robot state, and simulates the consequences using Euler integration over a dt interval.
+            Applies a motor activation vector to a robot state, and simulates the consequences over a dt interval, with the robot's ``integrator`` (see :class:`Kinematics`). The motor speeds are held constant over the interval.
 
             :param dt: Interval of time to integrate the robot's motion over.
             :type dt: float
@@ -227,53 +241,37 @@ class Robot(Agent):
             :type speeds: list[float]
         """
         # calculate the linear speed and angular speed
-        v = np.mean([speeds[0], speeds[1]])
+        v = (speeds[0] + speeds[1]) / 2
         omega = (speeds[1] - speeds[0]) / (2.0 * self.radius)
 
-        state = np.array([self.x, self.y, self.theta])
+        # integrate the robot's state
+        self.x, self.y, self.theta = Kinematics.integrate(self.x, self.y, self.theta, v, omega, dt, self.integrator)
 
-        # calculate time derivative of state
-        deriv = [v * np.cos(state[2]), v * np.sin(state[2]), omega]
+    @classmethod
+    def integrate_batch(cls, robots: List["Robot"], speeds: np.ndarray, dt: float) -> None:
+        """
+            Integrate the motion of a group of robots, which all have the same integrator, in the same way as ``integrate``, but all at once (see ``Agent.step_batch``).
 
-        # perform Euler integration
-        state = dt * np.array(deriv) + state
+            Only called from step_batch().
 
-        # store robot state
-        self.x = state[0]
-        self.y = state[1]
-        self.theta = state[2]
+            :param robots: The robots.
+            :type robots: list[:class:`Robot`]
 
-    def update_energy(self, actual_speeds, dt):
-        """
-            Update the robot's energy level, based on its metabolic and action costs.
+            :param speeds: The robots' motor speeds, with a row for each robot.
+            :type speeds: :class:`numpy.ndarray`
 
-            :param dt: Interval of time to integrate the robot's energy losses over.
+            :param dt: Interval of time to integrate the robots' motion over.
             :type dt: float
-
-            :param actual_speeds: The robot's current motor speeds.
-            :type actual_speeds: list[float]
         """
-        # energy losses - allows robot to die here *before* it can consume anything
-        if self.alive:
-            # update energy. the faster the robot's wheels turn, the quicker it loses energy
-            self.energy -= np.abs(actual_speeds[0]) * dt * self.action_energy_cost
-            self.energy -= np.abs(actual_speeds[1]) * dt * self.action_energy_cost
-            self.energy -= dt * self.metabolism_energy_cost  # some energy is lost even if the robot does not move
-            self.energy = max(self.energy, 0)  # prevent energy falling below zero
-
-            if self.energy <= 0:
-                self.alive = False
-
-        # energy consumption - can include gains and losses ("negative energy")
-        if self.consumables is not None and self.alive:
-            for consumable in self.consumables:
-                if np.linalg.norm([self.x-consumable.x, self.y-consumable.y]) < consumable.radius:
-                    self.energy += consumable.consume()
-            self.energy = max(self.energy, 0) # prevent energy falling below zero
-            self.energy = min(self.energy, self.maximum_energy) # prevent energy going over "full"
-
-            if self.energy <= 0:
-                self.alive = False
+        radius = np.array([robot.radius for robot in robots], dtype=float)
+        v = (speeds[:, 0] + speeds[:, 1]) / 2
+        omega = (speeds[:, 1] - speeds[:, 0]) / (2.0 * radius)
+        x = np.array([robot.x for robot in robots], dtype=float)
+        y = np.array([robot.y for robot in robots], dtype=float)
+        theta = np.array([robot.theta for robot in robots], dtype=float)
+        x, y, theta = Kinematics.integrate_batch(x, y, theta, v, omega, dt, robots[0].integrator)
+        for robot, robot_x, robot_y, robot_theta in zip(robots, x.tolist(), y.tolist(), theta.tolist()):
+            robot.x, robot.y, robot.theta = robot_x, robot_y, robot_theta
 
     # update positions and orientations of all sensors
     def update_children_positions(self) -> None:
@@ -296,7 +294,7 @@ class Robot(Agent):
                 sensor.y = self.y + (self.radius * np.sin(self.theta + self.sensor_angles[i]))
                 sensor.theta = self.thetas[-1] + self.sensor_angles[i]
 
-    def get_data(self) -> Dict[str, Dict[str, Any]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Dict[str, Any]]:
         """
             A function to get the data from an :class:`Robot`, in the form of a string-keyed dict.
 
@@ -308,21 +306,21 @@ class Robot(Agent):
             * data from the robot's sensors: ``data["sensors"]``
             * data from the robot's motors: ``data["motors"]``
         """
-        data = super().get_data()
+        data = super().get_data(copy)
 
         data["classname"] = "Robot"
 
         data["sensors"] = []
         for sensor in self.sensors:
-            data["sensors"].append(sensor.get_data())
+            data["sensors"].append(sensor.get_data(copy))
 
         # keep these lines temporarily, so as not to break plotting code
-        data["left_motor"] = self.left_motor.get_data()
-        data["right_motor"] = self.right_motor.get_data()
+        data["left_motor"] = self.left_motor.get_data(copy)
+        data["right_motor"] = self.right_motor.get_data(copy)
         # this will replace the lines above
-        data["motors"] = [self.left_motor.get_data(), self.right_motor.get_data()]
+        data["motors"] = [data["left_motor"], data["right_motor"]]
 
-        data["controller"] = self.controller.get_data()
+        data["controller"] = self.controller.get_data(copy)
 
         return data
 
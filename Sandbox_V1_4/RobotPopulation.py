@@ -0,0 +1,526 @@
+from .System import *
+from .stimuli import *
+from .pygame_functions import *
+from .LightSourceField import *
+from .LightSensor import *
+from .Robot import *
+
+class RobotPopulation(System):
+    """
+        A class which simulates a population of identical differential drive robots, with the same morphology as the robots built by ``new_light_seeking_Robot``: two light sensors on the circumference of the body, and two motors. Rather than having a :class:`Robot` object for every robot, with its own sensor, motor and controller objects, a :class:`RobotPopulation` keeps the state of all of its robots in NumPy arrays (e.g. ``x`` is an array of the x-coordinates of all of the robots), and steps them all forwards together, in a handful of vectorised operations. This makes it possible to simulate thousands of robots at a speed which would only allow for tens of :class:`Robot` s.
+
+        The dynamics of the robots are the same as those of a :class:`Robot` which has the same parameters, so, for example, a population of robots which have no noise will follow exactly the same trajectories as the equivalent :class:`Robot` s would. The robots do not interact with each other, and some features of :class:`Robot` are not supported: consumables, pheromones, bumps, sensor delays, controller adaptation, and noise other than white noise.
+
+        The robots' controller is a single ``step_fun``, which has the same signature as the ``step_fun`` of a :class:`Controller`, i.e. ``step_fun(dt, inputs, params, state)``, returning ``(commands, state)``, but which is called with the inputs of all of the robots at once. The inputs are in the same order as those of a :class:`Robot` (energy, bump, left motor speed, right motor speed, then the light sensors), and ``inputs[i]`` is an array of the ``i``-th input of every robot, so that a ``step_fun`` which only uses arithmetic, such as ``[inputs[4] * params[0], inputs[5] * params[1]], state``, works unchanged for both a :class:`Robot` and a :class:`RobotPopulation`. The returned commands should be the left and right motor commands, each either an array with one command per robot, or a single number for all of them.
+
+        The histories of a :class:`RobotPopulation` have a row for every simulation step, and a column for every robot, e.g. ``xs[t][i]`` is the x-coordinate of robot ``i`` at step ``t``.
+
+        A :class:`RobotPopulation` can also hold an ensemble of replicas of another population, one after another along its robot axis, so that several simulation runs can be executed together, as one (see ``SimulationRunner.run_sims``). Each replica draws its noise from its own random number generator, so that its run is the same as it would have been if it had been executed on its own.
+    """
+    # the names of the attributes which hold an array with a value (or row of values) for each robot
+    robot_arrays = ["x", "y", "theta", "speeds", "energy", "alive", "activations", "max_speeds", "inertia_coeffs", "reversed", "action_energy_cost", "metabolism_energy_cost"]
+
+    def __init__(self, x: List[float],
+                       y: List[float],
+                       theta: List[float],
+                       step_fun: Callable,
+                       light_sources: List[LightSource]=[],
+                       sensor_angles: List[float]=[math.pi/4, -math.pi/4],
+                       params: List[float]=None,
+                       initial_state: Any=None,
+                       radius: float=1,
+                       FOV: float=0.75*math.pi,
+                       label: str=None,
+                       left_motor_max_speed: float=4,
+                       right_motor_max_speed: float=4,
+                       left_motor_inertia: float=0,
+                       right_motor_inertia: float=0,
+                       left_motor_reversed: bool=False,
+                       right_motor_reversed: bool=False,
+                       sensor_white_noise: List[float]=[0, 0],
+                       motor_white_noise: List[float]=[0, 0],
+                       action_energy_cost: float=0,
+                       metabolism_energy_cost: float=0,
+                       initial_energy: float=1,
+                       colour: str='darkblue',
+                       init_fun: Callable=None,
+                       perturb_fun: Callable=None,
+                       cutoff: float=None,
+                       max_distance: float=None,
+                       raster_resolution: float=None,
+                       raster_bounds: Tuple[float, float, float, float]=None,
+                       integrator: str=None):
+        """
+            __init__(x: List[float], y: List[float], theta: List[float], step_fun: Callable, light_sources: List[LightSource]=[], sensor_angles: List[float]=[math.pi/4, -math.pi/4], params: List[float]=None, initial_state: Any=None, radius: float=1, FOV: float=0.75*math.pi, label: str=None, left_motor_max_speed: float=4, right_motor_max_speed: float=4, left_motor_inertia: float=0, right_motor_inertia: float=0, left_motor_reversed: bool=False, right_motor_reversed: bool=False, sensor_white_noise: List[float]=[0, 0], motor_white_noise: List[float]=[0, 0], action_energy_cost: float=0, metabolism_energy_cost: float=0, initial_energy: float=1, colour: str='darkblue', init_fun: Callable=None, perturb_fun: Callable=None, cutoff: float=None, max_distance: float=None, raster_resolution: float=None, raster_bounds: Tuple[float, float, float, float]=None, integrator: str=None)
+
+            Any of the motor and energy parameters can be given either as a single value, which is used for every robot, or as a list with one value per robot.
+
+            :param x: The initial x-coordinates of the robots. The number of robots in the population is the length of this list.
+            :type x: list[float]
+
+            :param y: The initial y-coordinates of the robots.
+            :type y: list[float]
+
+            :param theta: The initial orientations of the robots.
+            :type theta: list[float]
+
+            :param step_fun: The robots' controller function (see above).
+            :type step_fun: function
+
+            :param light_sources: The light sources which the robots' light sensors can detect. Defaults to ``[]``.
+            :type light_sources: list[:class:`LightSource`]
+
+            :param sensor_angles: The angles of the light sensors from the robots' forward direction. Defaults to ``[pi/4, -pi/4]``.
+            :type sensor_angles: list[float]
+
+            :param params: The parameters which are passed to ``step_fun``. Either a list of parameters which are shared by all robots, or a list of lists, where ``params[j][i]`` is parameter ``j`` of robot ``i``. Defaults to ``None``.
+            :type params: list[float] or list[list[float]]
+
+            :param initial_state: The initial controller state, which is passed to ``step_fun``. Defaults to ``None``.
+            :type initial_state: any
+
+            :param radius: The radius of the robots' bodies. Defaults to ``1``.
+            :type radius: float
+
+            :param FOV: The angular field of view of the light sensors. Defaults to ``0.75pi``.
+            :type FOV: float
+
+            :param label: The label of the light sensors (see :class:`LightSensor`). Defaults to ``None``.
+            :type label: str
+
+            :param left_motor_max_speed: The maximum speed of the left motors. Defaults to ``4``.
+            :type left_motor_max_speed: float
+
+            :param right_motor_max_speed: The maximum speed of the right motors. Defaults to ``4``.
+            :type right_motor_max_speed: float
+
+            :param left_motor_inertia: The inertia of the left motors. Defaults to ``0``.
+            :type left_motor_inertia: float
+
+            :param right_motor_inertia: The inertia of the right motors. Defaults to ``0``.
+            :type right_motor_inertia: float
+
+            :param left_motor_reversed: Whether the left motors run in reverse. Defaults to ``False``.
+            :type left_motor_reversed: bool
+
+            :param right_motor_reversed: Whether the right motors run in reverse. Defaults to ``False``.
+            :type right_motor_reversed: bool
+
+            :param sensor_white_noise: The minimum and maximum values of white noise which is added to the light sensors' activations (see :class:`WhiteNoiseSource`). Defaults to ``[0, 0]``, for no noise.
+            :type sensor_white_noise: list[float]
+
+            :param motor_white_noise: The minimum and maximum values of white noise which is added to the motors' speeds. Defaults to ``[0, 0]``, for no noise.
+            :type motor_white_noise: list[float]
+
+            :param action_energy_cost: The energetic cost of action (see :class:`Robot`). Defaults to ``0``.
+            :type action_energy_cost: float
+
+            :param metabolism_energy_cost: The energetic cost of existing (see :class:`Robot`). Defaults to ``0``.
+            :type metabolism_energy_cost: float
+
+            :param initial_energy: The robots' initial energy level. Defaults to ``1``.
+            :type initial_energy: float
+
+            :param colour: The colour of the robots' bodies, for drawing. Defaults to ``"darkblue"``.
+            :type colour: str
+
+            :param init_fun: A function which can be used to set the initial state of the population in each simulation run. Defaults to ``None``.
+            :type init_fun: function
+
+            :param perturb_fun: A function which can be used to perturb the population's state, e.g. by adding random offsets to the ``x`` and ``y`` arrays. Defaults to ``None``.
+            :type perturb_fun: function
+
+            :param cutoff: The brightness below which the robots' light sensors ignore light sources (see :class:`LightSourceField`). Defaults to ``None``, in which case ``LightSensor.cutoff`` is used, as it is for the sensors of a :class:`Robot`.
+            :type cutoff: float
+
+            :param max_distance: The distance beyond which the robots' light sensors ignore light sources. Defaults to ``None``, in which case ``LightSensor.max_distance`` is used.
+            :type max_distance: float
+
+            :param raster_resolution: The resolution of the raster which the robots' light sensor readings are sampled from, in scenes where the lights do not move (see :class:`LightSensor`). Defaults to ``None``, in which case ``LightSensor.raster_resolution`` is used.
+            :type raster_resolution: float
+
+            :param raster_bounds: The area covered by the raster, as ``(x_min, x_max, y_min, y_max)``. Defaults to ``None``, in which case ``LightSensor.raster_bounds`` is used.
+            :type raster_bounds: tuple[float, float, float, float]
+
+            :param integrator: The name of the integrator which the robots' motion is integrated with: ``"euler"``, ``"arc"`` or ``"rk4"`` (see :class:`Kinematics`). Defaults to ``None``, in which case ``Robot.integrator`` is used, as it is for a :class:`Robot`.
+            :type integrator: str
+        """
+        super().__init__(init_fun=init_fun, perturb_fun=perturb_fun)
+        self.n = len(x)
+        self.step_fun = step_fun
+        self.light_sources = light_sources
+        self.sensor_angles = np.array(sensor_angles, dtype=float)
+        self.params = None if params is None else np.array(params, dtype=float)
+        self.initial_params = params
+        self.initial_controller_state = cp.deepcopy(initial_state)
+        self.radius = radius
+        self.FOV = FOV
+        self.label = label
+        self.cutoff = cutoff
+        self.max_distance = max_distance
+        self.raster_resolution = raster_resolution
+        self.raster_bounds = raster_bounds
+        self.integrator = integrator
+        self.max_cutoff_error = 0.0  # the largest upper bound on the error of any sensor reading, from ignoring lights
+        self.colour = colour
+
+        self.max_speeds = np.stack([self.per_robot(left_motor_max_speed), self.per_robot(right_motor_max_speed)], axis=1)
+        self.max_speeds = np.abs(self.max_speeds)
+        # the same transformation as in Motor
+        self.inertia_coeffs = np.maximum(0, np.stack([self.per_robot(left_motor_inertia), self.per_robot(right_motor_inertia)], axis=1)) + 1
+        self.reversed = np.stack([self.per_robot(left_motor_reversed), self.per_robot(right_motor_reversed)], axis=1).astype(bool)
+        self.sensor_white_noise = sensor_white_noise
+        self.motor_white_noise = motor_white_noise
+        self.action_energy_cost = self.per_robot(action_energy_cost)
+        self.metabolism_energy_cost = self.per_robot(metabolism_energy_cost)
+
+        self.initial_pose = [self.per_robot(x), self.per_robot(y), self.per_robot(theta)]
+        self.initial_energy = self.per_robot(initial_energy)
+        self.replicas = 1
+        self.replica_rngs = None
+        self.init_pose(*self.initial_pose)
+
+    def per_robot(self, value) -> np.ndarray:
+        """
+            Convert a parameter, which is either a single value or a list of values, to an array with a value for each robot.
+        """
+        return np.array(np.broadcast_to(np.asarray(value, dtype=float), (self.n,)))
+
+    def init_pose(self, x: List[float], y: List[float], theta: List[float]) -> None:
+        """
+            Set the robots' poses to the passed in values, and restart all of the population's histories (and its controller state) from there.
+        """
+        self.x = self.per_robot(x)
+        self.y = self.per_robot(y)
+        self.theta = self.per_robot(theta)
+        self.speeds = np.zeros((self.n, 2))
+        self.energy = self.initial_energy.copy()
+        self.alive = self.energy > 0
+        self.state = cp.deepcopy(self.initial_controller_state)
+        self.activations = np.zeros((self.n, len(self.sensor_angles)))
+        self.init_histories()
+
+    def init_histories(self) -> None:
+        """
+            Restart all of the population's histories from the robots' current state.
+        """
+        self.xs = History([self.x])
+        self.ys = History([self.y])
+        self.thetas = History([self.theta])
+        self.speeds_hist = History([self.speeds])
+        self.energies = History([self.energy])
+        self.activations_hist = History([self.activations])
+        self.commands_hist = History([self.speeds])
+
+    def step(self, dt: float) -> None:
+        """
+            Step all of the robots forwards in time: the light sensors are stepped, the controller gets motor commands from the sensor activations, the motors are stepped, and the robots' motion and energy levels are integrated.
+
+            :param dt: The interval of time to integrate the robots over.
+            :type dt: float
+        """
+        sensor_x, sensor_y, sensor_theta = self.get_sensor_poses()
+        self.activations = self.get_light_activations(sensor_x, sensor_y, sensor_theta)
+        if self.sensor_white_noise[0] != self.sensor_white_noise[1]:
+            self.activations += self.get_white_noise(self.sensor_white_noise, self.activations.shape)
+
+        # the inputs are in the same order as those of a Robot: energy, bump, left motor speed, right motor speed,
+        # and then the light sensors
+        inputs = np.vstack([self.energy, np.zeros(self.n), self.speeds.T, self.activations.T])
+        params = None if self.params is None else self.params.copy()
+        commands, state = self.step_fun(dt, inputs, params, self.state)
+        self.state = state
+        commands = np.array([np.broadcast_to(np.asarray(c, dtype=float), (self.n,)) for c in commands]).T
+
+        self.step_motors(commands, dt)
+        moving = self.alive.copy()
+        self.integrate(moving, dt)
+        self.update_energy(moving, dt)
+
+        self.xs.append(self.x)
+        self.ys.append(self.y)
+        self.thetas.append(self.theta)
+        self.speeds_hist.append(self.speeds)
+        self.energies.append(self.energy)
+        self.activations_hist.append(self.activations)
+        self.commands_hist.append(commands)
+
+    def get_sensor_poses(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+            Get the positions and orientations of all of the robots' light sensors, as arrays with a row for each robot and a column for each sensor.
+        """
+        sensor_theta = self.theta[:, None] + self.sensor_angles[None, :]
+        sensor_x = self.x[:, None] + self.radius * np.cos(sensor_theta)
+        sensor_y = self.y[:, None] + self.radius * np.sin(sensor_theta)
+        return sensor_x, sensor_y, sensor_theta
+
+    def get_light_activations(self, sensor_x: np.ndarray, sensor_y: np.ndarray, sensor_theta: np.ndarray) -> np.ndarray:
+        """
+            Get the activations of light sensors at the given positions and orientations, in the same way as :class:`LightSensor` and :class:`LightSource` compute them, but for all sensors at once.
+
+            :return: An array of sensor activations, with the same shape as the arrays of positions.
+            :rtype: :class:`numpy.ndarray`
+        """
+        cutoff = LightSensor.cutoff if self.cutoff is None else self.cutoff
+        max_distance = LightSensor.max_distance if self.max_distance is None else self.max_distance
+        raster_resolution = LightSensor.raster_resolution if self.raster_resolution is None else self.raster_resolution
+        raster_bounds = LightSensor.raster_bounds if self.raster_bounds is None else self.raster_bounds
+        field = LightSourceField.for_sources(self.light_sources)
+        if raster_resolution is not None:
+            raster = field.get_raster(raster_resolution, raster_bounds, LightSensor.raster_directions, LightSensor.raster_sources)
+            inside = raster.contains(sensor_x, sensor_y)
+            activations = np.zeros(sensor_x.shape)
+            activations[inside] = raster.get_brightness_at(sensor_x[inside], sensor_y[inside], sensor_theta[inside], self.FOV, self.label)
+            if not np.all(inside):
+                outside = ~inside
+                activations[outside] = self.get_field_activations(field, sensor_x[outside], sensor_y[outside], sensor_theta[outside], cutoff, max_distance)
+            return activations
+        return self.get_field_activations(field, sensor_x, sensor_y, sensor_theta, cutoff, max_distance)
+
+    def get_field_activations(self, field: LightSourceField, sensor_x: np.ndarray, sensor_y: np.ndarray, sensor_theta: np.ndarray, cutoff: float, max_distance: float) -> np.ndarray:
+        """
+            Get the activations of light sensors at the given positions and orientations directly from a :class:`LightSourceField`, ignoring lights according to ``cutoff`` and ``max_distance``.
+        """
+        if cutoff is None and max_distance is None:
+            return field.get_brightness_at(sensor_x, sensor_y, sensor_theta, self.FOV, self.label)
+        activations, error = field.get_brightness_at(sensor_x, sensor_y, sensor_theta, self.FOV, self.label, cutoff, max_distance, return_error=True)
+        if error.size:
+            self.max_cutoff_error = max(self.max_cutoff_error, float(np.max(error)))
+        return activations
+
+    def get_white_noise(self, limits: List[float], shape: Tuple[int, ...]) -> np.ndarray:
+        """
+            Get an array of white noise, uniformly distributed between ``limits[0]`` and ``limits[1]``, with a first axis for the robots. When the population is an ensemble of replicas, each replica's noise is drawn from its own generator.
+        """
+        if self.replica_rngs is None:
+            samples = self.get_rng().random(shape)
+        else:
+            m = self.n // self.replicas
+            samples = np.concatenate([rng.random((m,) + tuple(shape[1:])) for rng in self.replica_rngs])
+        return limits[0] + (limits[1] - limits[0]) * samples
+
+    def step_motors(self, commands: np.ndarray, dt: float) -> None:
+        """
+            Update the robots' motor speeds, in the same way as :class:`Motor` does.
+
+            :param commands: The motor commands, with a row for each robot and a column for each motor.
+            :type commands: :class:`numpy.ndarray`
+
+            :param dt: Interval of time to integrate the motors over - not currently used.
+            :type dt: float
+        """
+        commands = np.where(self.reversed, -commands, commands)
+        self.speeds = self.speeds + (commands - self.speeds) / self.inertia_coeffs
+        if self.motor_white_noise[0] != self.motor_white_noise[1]:
+            self.speeds += self.get_white_noise(self.motor_white_noise, self.speeds.shape)
+        self.speeds = np.clip(self.speeds, -self.max_speeds, self.max_speeds)
+
+    def integrate(self, moving: np.ndarray, dt: float) -> None:
+        """
+            Integrate the motion of the robots which are flagged as ``moving`` (i.e. the ones which are alive), with the population's integrator, in the same way as :class:`Robot` does.
+        """
+        v = (self.speeds[:, 0] + self.speeds[:, 1]) / 2
+        omega = (self.speeds[:, 1] - self.speeds[:, 0]) / (2.0 * self.radius)
+        integrator = Robot.integrator if self.integrator is None else self.integrator
+        x, y, theta = Kinematics.integrate_batch(self.x, self.y, self.theta, v, omega, dt, integrator)
+        self.x = np.where(moving, x, self.x)
+        self.y = np.where(moving, y, self.y)
+        self.theta = np.where(moving, theta, self.theta)
+
+    def update_energy(self, moving: np.ndarray, dt: float) -> None:
+        """
+            Update the energy levels of the robots which are flagged as ``moving``, based on their metabolic and action costs. Robots which run out of energy die.
+        """
+        cost = (np.abs(self.speeds[:, 0]) + np.abs(self.speeds[:, 1])) * dt * self.action_energy_cost + dt * self.metabolism_energy_cost
+        self.energy = np.where(moving, np.maximum(self.energy - cost, 0), self.energy)
+        self.alive = moving & (self.energy > 0)
+
+    def reset(self) -> None:
+        """
+            Reset the population to its original state upon construction, so that it can be re-used in another simulation run.
+        """
+        super().reset()
+        self.params = None if self.initial_params is None else np.array(self.initial_params, dtype=float)
+        self.max_cutoff_error = 0.0
+        self.init_pose(*self.initial_pose)
+
+    def push(self, x: List[float]=None, y: List[float]=None, theta: List[float]=None) -> None:
+        """
+            Move the robots to new positions and/or orientations, replacing the latest values in their histories, in the same way as ``Agent.push``. This is mainly useful for ``init_fun`` and ``perturb_fun`` functions.
+        """
+        if x is not None:
+            self.x = self.per_robot(x)
+            self.xs[-1] = self.x
+        if y is not None:
+            self.y = self.per_robot(y)
+            self.ys[-1] = self.y
+        if theta is not None:
+            self.theta = self.per_robot(theta)
+            self.thetas[-1] = self.theta
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+            Get a copy of the state of all of the robots, including their parameters, in the form of a string-keyed dict. This is used to build ensembles of replicas of the population (see ``new_ensemble``).
+        """
+        state = {name: getattr(self, name).copy() for name in RobotPopulation.robot_arrays}
+        state["params"] = None if self.params is None else self.params.copy()
+        state["state"] = cp.deepcopy(self.state)
+        return state
+
+    def new_ensemble(self, states: List[Dict[str, Any]], rngs: List[np.random.Generator]=None) -> "RobotPopulation":
+        """
+            Create a new :class:`RobotPopulation` which holds an ensemble of replicas of this population, one after another along the robot axis, with the given states (see ``get_state``). The new population's histories begin from these states.
+
+            If the controller has a state, then it should be an array (or list of arrays) whose last axis is the robots, so that the replicas' states can be joined together.
+
+            :param states: The states of the replicas.
+            :type states: list[dict]
+
+            :param rngs: The random number generators which the replicas will draw their noise from. Defaults to ``None``, in which case the ensemble's own generator is used for all replicas.
+            :type rngs: list[:class:`numpy.random.Generator`]
+
+            :return: The ensemble.
+            :rtype: :class:`RobotPopulation`
+        """
+        ensemble = cp.copy(self)
+        ensemble.n = self.n * len(states)
+        ensemble.replicas = len(states)
+        ensemble.replica_rngs = None
+        if rngs is not None and all(rng is not None for rng in rngs):
+            ensemble.replica_rngs = list(rngs)
+        for name in RobotPopulation.robot_arrays:
+            setattr(ensemble, name, np.concatenate([state[name] for state in states]))
+
+        params = [state["params"] for state in states]
+        if params[0] is None or all(p.ndim == 1 and np.array_equal(p, params[0]) for p in params):
+            # shared parameters stay shared, so that step_fun still gets single numbers
+            ensemble.params = params[0]
+        else:
+            ensemble.params = np.concatenate([np.broadcast_to(p.reshape(len(p), -1), (len(p), self.n)) for p in params], axis=1)
+        controller_states = [state["state"] for state in states]
+        ensemble.state = None
+        if controller_states[0] is not None:
+            ensemble.state = np.concatenate([np.asarray(s) for s in controller_states], axis=-1)
+
+        ensemble.initial_pose = [ensemble.x.copy(), ensemble.y.copy(), ensemble.theta.copy()]
+        ensemble.initial_energy = ensemble.energy.copy()
+        ensemble.init_histories()
+        return ensemble
+
+    def split_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+            Split the data of an ensemble (see ``new_ensemble`` and ``get_data``) into the data of each of its replicas, in the same form as the data of a single population.
+
+            :param data: The ensemble's data.
+            :type data: dict
+
+            :return: A list of data dicts, one for each replica.
+            :rtype: list[dict]
+        """
+        m = self.n // self.replicas
+        replicas_data = []
+        for r in range(self.replicas):
+            replica_data = dict(data)
+            replica_data["n"] = m
+            for key in ["x", "y", "theta"]:
+                replica_data[key] = data[key][r*m:(r+1)*m]
+            for key in ["xs", "ys", "thetas", "speeds", "activations", "commands_hist", "energies"]:
+                replica_data[key] = data[key][:, r*m:(r+1)*m]
+            replicas_data.append(replica_data)
+        return replicas_data
+
+    def get_data(self, copy: bool=False) -> Dict[str, Any]:
+        """
+            A function to get the data from a :class:`RobotPopulation`, in the form of a string-keyed dict. The histories in the data have a row for each simulation step and a column for each robot.
+
+            These data can be accessed with the following keys:
+
+            * class name (RobotPopulation): ``data["classname"]``
+            * the number of robots: ``data["n"]``
+            * the robots' current poses: ``data["x"]``, ``data["y"]`` and ``data["theta"]``
+            * the histories of the robots' poses: ``data["xs"]``, ``data["ys"]`` and ``data["thetas"]``
+            * the history of the robots' motor speeds, with a last axis for the left and right motors: ``data["speeds"]``
+            * the history of the robots' light sensor activations, with a last axis for the sensors: ``data["activations"]``
+            * the history of the robots' motor commands, with a last axis for the left and right motors: ``data["commands_hist"]``
+            * the history of the robots' energy levels: ``data["energies"]``
+
+            :class:`Robot`-style data for the individual robots can be got with ``get_robot_data``.
+        """
+        data = super().get_data(copy)
+        data["classname"] = "RobotPopulation"
+        data["n"] = self.n
+        data["x"] = self.x.copy()
+        data["y"] = self.y.copy()
+        data["theta"] = self.theta.copy()
+        data["xs"] = self.xs.get_values(copy)
+        data["ys"] = self.ys.get_values(copy)
+        data["thetas"] = self.thetas.get_values(copy)
+        data["speeds"] = self.speeds_hist.get_values(copy)
+        data["activations"] = self.activations_hist.get_values(copy)
+        data["commands_hist"] = self.commands_hist.get_values(copy)
+        data["energies"] = self.energies.get_values(copy)
+        return data
+
+    def get_robot_data(self, i: int) -> Dict[str, Any]:
+        """
+            Get the data of robot ``i`` in the population, in the same form as the data of a :class:`Robot` (see ``Robot.get_data``), so that it can be used with the plotting functions for robots. Only the data which a :class:`RobotPopulation` keeps are included.
+
+            :param i: The index of the robot in the population.
+            :type i: int
+        """
+        data = {"classname": "Robot", "has_position": True, "has_orientation": True,
+                "x": self.x[i], "y": self.y[i], "theta": self.theta[i],
+                "xs": self.xs.view()[:, i].copy(), "ys": self.ys.view()[:, i].copy(), "thetas": self.thetas.view()[:, i].copy(),
+                "energies": self.energies.view()[:, i].copy(), "init_fun": self.init_fun, "perturb_fun": self.perturb_fun}
+        speeds = self.speeds_hist.view()[:, i]
+        data["left_motor"] = {"speeds": speeds[:, 0].copy(), "noises": None}
+        data["right_motor"] = {"speeds": speeds[:, 1].copy(), "noises": None}
+        data["motors"] = [data["left_motor"], data["right_motor"]]
+        activations = self.activations_hist.view()[:, i]
+        # the energy and motor speed sensors read their values before they are updated in each step, and start from 0
+        energies = self.energies.view()[:, i]
+        data["sensors"] = [{"activations": np.concatenate([[0], energies[:-1]]), "noises": None, "name_str": "EnergySensor"},
+                           {"activations": np.zeros(len(self.energies)), "noises": None, "name_str": "BumpSensor"},
+                           {"activations": np.concatenate([[0], speeds[:-1, 0]]), "noises": None, "name_str": "Left motor sensor"},
+                           {"activations": np.concatenate([[0], speeds[:-1, 1]]), "noises": None, "name_str": "Right motor sensor"}]
+        for j in range(len(self.sensor_angles)):
+            data["sensors"].append({"activations": activations[:, j].copy(), "noises": None, "name_str": "LightSensor " + str(j)})
+        data["controller"] = {"commands_hist": self.commands_hist.view()[:, i].copy(), "noises": None}
+        return data
+
+    def get_robots_data(self) -> List[Dict[str, Any]]:
+        """
+            Get the :class:`Robot`-style data of every robot in the population (see ``get_robot_data``).
+        """
+        return [self.get_robot_data(i) for i in range(self.n)]
+
+    def draw(self, ax) -> None:
+        """
+            Draw the robots in the specified Matplotlib axes.
+
+            :param ax: The Matplotlib axes to draw the robots on.
+            :type ax: Matplotlib axes
+        """
+        for x, y, theta in zip(self.x, self.y, self.theta):
+            ax.plot([x, x+self.radius*np.cos(theta)], [y, y+self.radius*np.sin(theta)], 'k--', linewidth='2')
+            ax.add_artist(mpatches.Circle((x, y), self.radius, color=self.colour))
+
+    def pygame_draw(self, screen, scale: float, shiftx: float, shifty: float) -> None:
+        """
+            Draw the robots on a PyGame display.
+
+            :param screen: The PyGame display to draw on.
+            :type screen: PyGame display
+
+            :param scale: The scale to draw at.
+            :type scale: float
+
+            :param shiftx: The offset from centre in the x-axis for drawing.
+            :type shiftx: float
+
+            :param shifty: The offset from centre in the y-axis for drawing.
+            :type shifty: float
+        """
+        for x, y, theta in zip(self.x, self.y, self.theta):
+            pygame_drawcircle(screen, shiftx, shifty, scale, x, y, self.radius, self.colour)
+            pygame_drawline(screen, shiftx, shifty, scale, x, y, x + self.radius * np.cos(theta), y + self.radius * np.sin(theta), 'green', 2)
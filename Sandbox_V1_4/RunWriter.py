@@ -0,0 +1,146 @@
+from .base import *
+from .Simulator import *
+
+import os
+import pickle
+
+class RunWriter:
+    """
+        A class for streaming the data of simulation runs to disk while they are executed, so that a long batch of runs does not need to hold all of their histories (see :class:`History`) in memory. A :class:`RunWriter` is passed to :meth:`Sandbox.SimulationRunner.run_sims`, and for every run, it spills every history in the simulation to its own ``.npy`` file (see ``History.spill``), ``chunk_size`` values at a time. At the end of a run, the run's data dict (see :meth:`Sandbox.Simulator.get_data`) is saved alongside the history files, with the histories in it replaced by references to their files.
+
+        The data dicts returned by ``run_sims``, or loaded later with ``load_run`` or ``load_runs``, have the same layout as usual, but their histories are read-only, memory-mapped arrays, which are only read from disk as they are used. As they are NumPy arrays, they can be passed to the functions in ``plotting`` just like the data from unwritten runs.
+
+        The files for run ``run_n`` are written to the directory ``"run_" + str(run_n)`` in the writer's ``directory``. Each history's file is named after the path of the system it belongs to (see :meth:`Sandbox.Simulator.walk_systems`) and the history's name, e.g. ``"agents.0.xs.npy"``, and the data dict is saved as ``"data.pkl"``.
+    """
+    def __init__(self, directory: str, chunk_size: int=1000):
+        """
+            __init__(directory: str, chunk_size: int=1000)
+
+            :param directory: The directory to write runs to. It is created if it does not exist.
+            :type directory: str
+
+            :param chunk_size: The number of values of each history which are held in memory before they are written to disk. Defaults to ``1000``.
+            :type chunk_size: int
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.run_n: int = None
+        self.histories: List[History] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def get_run_directory(self, run_n: int) -> str:
+        """
+            Get the path of the directory which the files of run ``run_n`` are written to.
+        """
+        return os.path.join(self.directory, "run_" + str(run_n))
+
+    def start(self, sim: Simulator, run_n: int) -> None:
+        """
+            Start writing a simulation run. This should be called after the :class:`Simulator` has been reset, and before it is run, as that is when its systems' histories are created.
+
+            :param sim: The simulation.
+            :type sim: :class:`Simulator`
+
+            :param run_n: The number of the run.
+            :type run_n: int
+        """
+        run_directory = self.get_run_directory(run_n)
+        os.makedirs(run_directory, exist_ok=True)
+
+        histories = [("ts", sim.ts)]
+        for path, system in sim.walk_systems():
+            for name, value in vars(system).items():
+                if isinstance(value, History):
+                    histories.append((path + "/" + name, value))
+
+        self.run_n = run_n
+        self.histories = []
+        for name, history in histories:
+            if history.spill(os.path.join(run_directory, name.replace("/", ".") + ".npy"), self.chunk_size):
+                self.histories.append(history)
+
+    def finish(self, sim: Simulator) -> dict:
+        """
+            Finish writing the current simulation run, by writing the rest of its histories, and saving its data dict.
+
+            :param sim: The simulation.
+            :type sim: :class:`Simulator`
+
+            :return: The run's data, as returned from :meth:`Sandbox.Simulator.get_data`, with ``data["run_n"]`` added, and with memory-mapped histories.
+            :rtype: dict
+        """
+        for history in self.histories:
+            history.close_file()
+        self.histories = []
+
+        data = sim.get_data()
+        data["run_n"] = self.run_n
+        self.save_run(data, self.run_n)
+        return data
+
+    def save_run(self, data: dict, run_n: int) -> None:
+        """
+            Save the data dict of run ``run_n``, with any arrays which are memory-mapped from files in the run's directory saved as references to those files.
+        """
+        run_directory = self.get_run_directory(run_n)
+        with open(os.path.join(run_directory, "data.pkl"), "wb") as f:
+            _RunPickler(f, run_directory).dump(data)
+
+    def load_run(self, run_n: int) -> dict:
+        """
+            Load the data dict of a run which has been written, with its histories memory-mapped from their files.
+
+            :param run_n: The number of the run.
+            :type run_n: int
+
+            :return: The run's data.
+            :rtype: dict
+        """
+        run_directory = self.get_run_directory(run_n)
+        with open(os.path.join(run_directory, "data.pkl"), "rb") as f:
+            return _RunUnpickler(f, run_directory).load()
+
+    def load_runs(self) -> List[dict]:
+        """
+            Load the data dicts of all of the runs which have been written to the writer's directory, in the order of their ``run_n``.
+
+            :return: The runs' data.
+            :rtype: list[dict]
+        """
+        runs_n = []
+        for name in os.listdir(self.directory):
+            if name.startswith("run_") and os.path.exists(os.path.join(self.directory, name, "data.pkl")):
+                runs_n.append(int(name[len("run_"):]))
+        return [self.load_run(run_n) for run_n in sorted(runs_n)]
+
+
+class _RunPickler(pickle.Pickler):
+    """
+        A pickler which saves memory-mapped arrays of whole files in a run's directory as references to those files, and which saves functions that cannot be pickled (e.g. lambdas used as ``perturb_fun`` s) as ``None``.
+    """
+    def __init__(self, f, run_directory: str):
+        super().__init__(f)
+        self.run_directory = os.path.abspath(run_directory)
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.memmap) and obj.filename is not None and os.path.dirname(obj.filename) == self.run_directory:
+            if obj.shape == np.load(obj.filename, mmap_mode="r").shape:
+                return ("npy", os.path.basename(obj.filename))
+        if callable(obj) and "<" in getattr(obj, "__qualname__", ""):
+            return ("unpicklable", None)
+        return None
+
+
+class _RunUnpickler(pickle.Unpickler):
+    """
+        The counterpart of :class:`_RunPickler`.
+    """
+    def __init__(self, f, run_directory: str):
+        super().__init__(f)
+        self.run_directory = run_directory
+
+    def persistent_load(self, pid):
+        kind, name = pid
+        if kind == "npy":
+            return np.load(os.path.join(self.run_directory, name), mmap_mode="r")
+        return None
@@ -35,7 +35,7 @@ class Sensor(System):
             :param name_str: The name of the sensor, used in plotting simulation data.
             :type name_str: str
 
-            :param delay_steps: The number of simulation steps a sensor signal will be delayed for.
+            :param delay_steps: The number of simulation steps a sensor signal will be delayed for. This does not need to be a whole number (see :class:`DelayBlock`).
             :type delay_steps: int
 
             :param noisemaker: The source of noise for this sensor. Defaults to ``None``.
@@ -48,13 +48,12 @@ class Sensor(System):
         self.name_str = name_str
 
         self.delay_block = None
-        delay_steps = int(delay_steps)
         if delay_steps > 0:
             self.delay_block = DelayBlock(delay_steps)
 
         self.noisemaker = noisemaker  # noise source
 
-        self.initial_state = Sensor.get_data(self)
+        self.initial_state = Sensor.get_data(self, copy=True)
 
     # draw sensor in the specified matplotlib axes
     def draw(self, ax) -> None:
@@ -88,21 +87,21 @@ class Sensor(System):
         if self.has_position:
             pygame.draw.circle(screen, center=(scale*self.x+shiftx, scale*self.y+shifty), color=self.colour, radius=scale*self.radius)
 
-    def get_data(self) -> Dict[str, Union[float, List[float], str]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Union[float, List[float], str]]:
         """
             A method to get the sensors data, in the form of a dict.
 
             :return: The sensor's data, which includes the data returned from :meth:`Sandbox.System.get_data`, as well as the sensor's colour and radius (which are both assumed to be static), and its "enabled" state and "name_str" string.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["colour"] = self.colour
         data["radius"] = self.radius
         data["enabled"] = self.enabled
         data["name_str"] = self.name_str
         noises = None
         if self.noisemaker:
-            noises = self.noisemaker.get_data()["noises"]
+            noises = self.noisemaker.get_data(copy)["noises"]
         data["noises"] = noises
 
         return data
@@ -118,6 +117,24 @@ class Sensor(System):
         self.name_str = self.initial_state["name_str"]
         if self.noisemaker:
             self.noisemaker.reset()
+        if self.delay_block is not None:
+            self.delay_block.reset()
+
+    @classmethod
+    def step_batch(cls, sensors: List["Sensor"], dt: float) -> List[float]:
+        """
+            Step a group of sensors of this class forwards in time, e.g. the sensors of all of the agents in a simulation (see :class:`SensorRegistry`). By default, the sensors are simply stepped one by one, but subclasses whose activations can be computed for many sensors at once, such as :class:`LightSensor`, override this method to do so. Whichever way it is done, the sensors must end up in the same state as if their ``step`` methods had been called.
+
+            :param sensors: The sensors, which are all instances of this class.
+            :type sensors: list[:class:`Sensor`]
+
+            :param dt: The interval of time to integrate the sensors over.
+            :type dt: float
+
+            :return: The sensors' activations, in the same order as ``sensors``.
+            :rtype: list[float]
+        """
+        return [sensor.step(dt) for sensor in sensors]
 
     def update(self, dt) -> float:
         """
@@ -0,0 +1,57 @@
+from .base import *
+from .Sensor import *
+
+class SensorRegistry:
+    """
+        A class which steps the sensors of many agents together, grouped by their type, so that sensors which can be evaluated for many poses at once (such as :class:`LightSensor`) only need one vectorised pass per group, rather than one call per sensor. A :class:`Simulator` uses a registry when it is constructed with ``batch_sensors=True``.
+
+        In every simulation step, before any agent is stepped, the registry steps the sensors in the ``sensors`` lists of all of its agents, by passing each group to the ``step_batch`` method of its sensor class (see ``Sensor.step_batch``), and then gives every agent its list of activations, in the same order as its sensors, as its ``sensor_readings``. When an agent has ``sensor_readings``, ``Agent.step`` uses them instead of calling ``step_sensors``.
+
+        Only agents whose ``sensor_batching`` attribute is ``True`` are included. This is the case for the agent classes whose ``step_sensors`` method only steps every sensor in their ``sensors`` list (:class:`Robot`, :class:`Ant`, :class:`Bee` and :class:`FauxKilobot`). If you subclass one of these and override ``step_sensors``, then you should set ``sensor_batching`` to ``False`` in your subclass.
+
+        As all of the sensors are stepped before any of the agents move, an agent's sensors will not see the effect of other agents which are stepped before it in the same simulation step, such as a light carried by another agent having moved. In other words, all agents sense simultaneously. Agents also drop their pheromones (see ``Agent.drop_pheromones``) when they are stepped, which is after the registry has stepped their sensors, so a pheromone dropped in a simulation step is only sensed from the next step onwards, whereas without a registry, an agent senses the pheromones which it and the agents stepped before it have dropped in the same step. For the same reason, when sensors draw their noise from NumPy's global random number generator, the noise is drawn in a different order than without a registry, so runs will not be identical (they will be if the simulation is seeded with :meth:`Sandbox.Simulator.seed`, as every sensor then has its own generator).
+    """
+    def __init__(self, agents: List[System]):
+        """
+            __init__(agents: List[System])
+
+            :param agents: The agents whose sensors the registry steps. Agents whose ``sensor_batching`` attribute is not ``True`` are left out.
+            :type agents: list[:class:`Agent`]
+        """
+        self.agents = [agent for agent in agents if getattr(agent, "sensor_batching", False)]
+        self.groups: Dict[type, List[Sensor]] = {}
+        # where each sensor's activation goes: the index of its agent, and its index in the agent's sensors list
+        self.destinations: Dict[type, List[Tuple[int, int]]] = {}
+        self.sensors_n: List[int] = []
+        self.compile()
+
+    def compile(self) -> None:
+        """
+            Group the agents' sensors by type. This is called when the registry is constructed, and by ``step`` if the number of sensors of any of the agents has changed. If sensors are replaced by others, then this method should be called again.
+        """
+        self.groups = {}
+        self.destinations = {}
+        for i, agent in enumerate(self.agents):
+            for j, sensor in enumerate(agent.sensors):
+                self.groups.setdefault(type(sensor), []).append(sensor)
+                self.destinations.setdefault(type(sensor), []).append((i, j))
+        self.sensors_n = [len(agent.sensors) for agent in self.agents]
+
+    def step(self, dt: float) -> None:
+        """
+            Step all of the agents' sensors, and give each agent its activations, as its ``sensor_readings``.
+
+            :param dt: The interval of time to integrate the sensors over.
+            :type dt: float
+        """
+        if self.sensors_n != [len(agent.sensors) for agent in self.agents]:
+            self.compile()
+
+        readings = [[None] * n for n in self.sensors_n]
+        for sensor_type, sensors in self.groups.items():
+            activations = sensor_type.step_batch(sensors, dt)
+            for (i, j), activation in zip(self.destinations[sensor_type], activations):
+                readings[i][j] = activation
+
+        for agent, agent_readings in zip(self.agents, readings):
+            agent.sensor_readings = agent_readings
@@ -36,11 +36,11 @@ class SignalGenerator(Stimulus):
         if self.noisemaker:
             self.noisemaker.reset()
 
-    def get_data(self) -> dict:
+    def get_data(self, copy: bool=False) -> dict:
         """
 
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["outputs"] = self.outputs
         return data
 
@@ -1,7 +1,13 @@
 from .base import *
 from .Simulator import *
 from .Animator import *
+from .RobotPopulation import *
+from .RunWriter import *
 from tqdm import *
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import pickle
+import random
 
 # how to use:
 #   create agents, envs, Simulator
@@ -46,19 +52,42 @@ class SimulationRunner:
         self.perturb = perturb
         self.show_prog_bar = show_prog_bar
 
-    def run_sims(self, n: int=1):
+    def run_sims(self, n: int=1, workers: int=1, seed: int=None, ensemble: bool=False, writer: RunWriter=None):
         """
             :param n: The number of simulation runs to execute.
             :type n: int
 
-            :return: The data from all simulation runs, in a list of data dicts, as returned from :meth:`Sandbox.Simulator.get_data`
+            :param workers: The number of processes to spread the simulation runs over. Defaults to ``1``, in which case all runs are executed one after another in this process. When ``workers > 1``, every worker process gets its own copy of the :class:`Simulator`, so the state of ``self.sim`` is not changed by the runs. Animated runs are always executed serially.
+            :type workers: int
+
+            :param seed: The seed used to generate a separate seed for every simulation run. Every run is seeded with :meth:`Sandbox.Simulator.seed`, and NumPy's global random number generator and Python's ``random`` module are also seeded, for any code which does not use the systems' own generators. The seeds for a run depend only on ``seed`` and the run's number, so a run will give the same results whichever process it is executed in, and however many runs are executed before it. Defaults to ``None``, in which case runs executed serially are not seeded, and parallel runs are seeded from a number drawn from NumPy's global random number generator.
+            :type seed: int
+
+            :param ensemble: If this flag is set to ``True``, then the runs are executed together, as an ensemble (see :meth:`run_ensemble`), rather than one after another. Defaults to ``False``.
+            :type ensemble: bool
+
+            :param writer: A :class:`RunWriter`, which the runs' histories will be streamed to, so that they do not all need to be held in memory. The returned data dicts then hold memory-mapped histories. Writing is not supported for ensemble runs. Defaults to ``None``, in which case nothing is written to disk.
+            :type writer: :class:`RunWriter`
+
+            :return: The data from all simulation runs, in a list of data dicts, as returned from :meth:`Sandbox.Simulator.get_data`, in the order of their ``run_n``.
 
             :rtype: list[dict]
         """
+        if ensemble:
+            if writer is not None:
+                raise ValueError("Ensemble runs cannot be written with a RunWriter")
+            return self.run_ensemble(n, seed)
+        if workers > 1 and not self.ani:
+            return self.run_sims_parallel(n, workers, seed, writer)
+
         data = []
 
         # run set of simulations
         for i in range(n):
+            if seed is not None:
+                seed_global_rngs(get_run_seed(seed, i))
+                self.sim.seed(seed, i)
+
             self.sim.reset()
             if self.ani:
                 self.ani.animate_current = True
@@ -66,7 +95,9 @@ class SimulationRunner:
             if self.perturb:
                 self.sim.perturb()
 
-            run_data = self.run_once()
+            if writer is not None:
+                writer.start(self.sim, i)
+            run_data = self.run_once(writer)
             run_data["run_n"] = i
 
             data.append(run_data)
@@ -77,10 +108,118 @@ class SimulationRunner:
 
         return data
 
-    def run_once(self):
+    def run_sims_parallel(self, n: int, workers: int, seed: int=None, writer: RunWriter=None):
+        """
+            A method to execute a batch of simulation runs in a pool of worker processes. This method is called from :meth:`run_sims`, which should normally be used instead of calling this method directly.
+
+            :param n: The number of simulation runs to execute.
+            :type n: int
+
+            :param workers: The number of worker processes.
+            :type workers: int
+
+            :param seed: The seed used to generate a separate seed for every simulation run. Defaults to ``None``, in which case it is drawn from NumPy's global random number generator.
+            :type seed: int
+
+            :param writer: A :class:`RunWriter` for the worker processes to write the runs with. Defaults to ``None``.
+            :type writer: :class:`RunWriter`
+
+            Functions in the runs' data which cannot be pickled, such as ``init_fun`` s and ``perturb_fun`` s which are lambdas or are defined inside other functions, cannot be sent back from the worker processes, so they are ``None`` in the returned data, as they are in runs saved by a :class:`RunWriter`. On platforms where worker processes are not forked from the main process (e.g. Windows and macOS), the whole simulation has to be pickled to be sent to the workers, so it cannot contain such functions at all.
+
+            :return: The data from all simulation runs, in a list of data dicts, in the order of their ``run_n``.
+            :rtype: list[dict]
+        """
+        if multiprocessing.get_start_method() != "fork":
+            # check this here, as a failure to pickle the simulation in the pool's initializer is hard to make sense of
+            try:
+                pickle.dumps(self.sim)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                raise ValueError("The simulation cannot be sent to worker processes, as it cannot be pickled (" + str(e) + "). Functions such as init_funs and perturb_funs should be defined at the top level of a module, rather than as lambdas or inside other functions, or the runs should be executed with workers=1") from e
+
+        if seed is None:
+            seed = int(np.random.randint(2**31))
+
+        # a run's init_fun depends on the init_ind of the systems it is applied to, and these indices would have been
+        # incremented once per run if the runs were executed serially
+        systems = self.sim.agents + self.sim.envs
+        init_inds = [system.init_ind for system in systems]
+
+        data = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.sim, init_inds, self.perturb, writer)) as executor:
+            results = executor.map(_run_in_worker, range(n), [seed] * n)
+            if self.show_prog_bar:
+                results = tqdm(results, total=n, desc='Simulation runs: ')
+            for run_data in results:
+                if writer is not None:
+                    # the histories are memory-mapped from the files written by the worker, rather than being sent back
+                    run_data = writer.load_run(run_data["run_n"])
+                data.append(run_data)
+
+        for system in systems:
+            if system.init_fun:
+                system.init_ind += n
+
+        return data
+
+    def run_ensemble(self, n: int, seed: int=None):
+        """
+            A method to execute a batch of simulation runs in lockstep, as a single run of an ensemble. This is only possible when every agent in the simulation is a :class:`RobotPopulation`. The initial state of each run is drawn in the usual way, by resetting the simulation (which calls ``init_fun`` s) and perturbing it, and then each :class:`RobotPopulation` is replaced by an ensemble which holds its replicas from all of the runs (see ``RobotPopulation.new_ensemble``), and the ensembles are simulated once. Finally, the data of the ensembles are split back up into the data of the individual runs.
+
+            This means that the per-step Python overhead of a batch of runs is about the same as that of a single run. When the runs are seeded, each run gives the same results as it would have done if it had been executed by itself. Systems in ``envs`` are shared by all of the runs, so they should not be changed by ``init_fun`` s or ``perturb_fun`` s - they are left in the state of the last run's initial conditions. Disturbances are not supported. This method is called from :meth:`run_sims`, which should normally be used instead of calling this method directly.
+
+            :param n: The number of simulation runs to execute.
+            :type n: int
+
+            :param seed: The seed used to generate a separate seed for every simulation run (see :meth:`run_sims`). Defaults to ``None``, in which case the runs are not seeded.
+            :type seed: int
+
+            :return: The data from all simulation runs, in a list of data dicts, in the order of their ``run_n``.
+            :rtype: list[dict]
+        """
+        if not all(isinstance(agent, RobotPopulation) for agent in self.sim.agents):
+            raise ValueError("Ensemble runs are only possible when every agent is a RobotPopulation")
+        if self.sim.disturbances:
+            raise ValueError("Ensemble runs do not support disturbances")
+
+        # draw every run's initial conditions
+        states = [[] for _ in self.sim.agents]
+        rngs = [[] for _ in self.sim.agents]
+        for i in range(n):
+            if seed is not None:
+                seed_global_rngs(get_run_seed(seed, i))
+                self.sim.seed(seed, i)
+            self.sim.reset()
+            if self.perturb:
+                self.sim.perturb()
+            for j, agent in enumerate(self.sim.agents):
+                states[j].append(agent.get_state())
+                rngs[j].append(agent.rng)
+
+        ensembles = [agent.new_ensemble(states[j], rngs[j]) for j, agent in enumerate(self.sim.agents)]
+        ensemble_sim = Simulator(agents=ensembles, envs=self.sim.envs, duration=self.sim.duration, dt=self.sim.dt, recording=self.sim.recording, order=self.sim.order, order_table_size=self.sim.order_table_size, batch_sensors=self.sim.batch_sensors, batch_agents=self.sim.batch_agents)
+        ensemble_sim.rng = self.sim.rng
+        ensemble_sim.apply_recording()
+        ensemble_sim.reserve_histories()
+        ensemble_sim.run()
+
+        ensemble_data = ensemble_sim.get_data()
+        agents_data = [ensemble.split_data(agent_data) for ensemble, agent_data in zip(ensembles, ensemble_data["agents"])]
+        data = []
+        for i in range(n):
+            run_data = dict(ensemble_data)
+            run_data["agents"] = [agent_data[i] for agent_data in agents_data]
+            run_data["run_n"] = i
+            data.append(run_data)
+
+        return data
+
+    def run_once(self, writer: RunWriter=None):
         """
             A method to run, and animate, a single simulation run.
 
+            :param writer: The :class:`RunWriter` which the run is being written with, if there is one, which will finish writing it. Defaults to ``None``.
+            :type writer: :class:`RunWriter`
+
             :return: Data from the simulation run, as returned from :meth:`Sandbox.Simulator.get_data`
             :rtype: dict
         """
@@ -115,4 +254,89 @@ class SimulationRunner:
                     # will exit this while loop
                     animate = self.ani.paused
 
+        if writer is not None:
+            return writer.finish(self.sim)
         return self.sim.get_data()
+
+
+def get_run_seed(seed: int, run_n: int) -> int:
+    """
+        Get the seed for a single simulation run from the seed for a batch of runs. The result only depends on the two arguments, and not on the order in which runs are executed.
+
+        :param seed: The seed for the batch of runs.
+        :type seed: int
+
+        :param run_n: The number of the run in the batch.
+        :type run_n: int
+
+        :return: The run's seed.
+        :rtype: int
+    """
+    return int(np.random.SeedSequence(seed, spawn_key=(run_n,)).generate_state(1)[0])
+
+def seed_global_rngs(seed: int) -> None:
+    """
+        Seed both NumPy's global random number generator and Python's ``random`` module.
+
+        :param seed: The seed.
+        :type seed: int
+    """
+    np.random.seed(seed)
+    random.seed(seed)
+
+# the Simulator used by a worker process, along with the init_ind values its systems had when the batch of runs began
+_worker_sim = None
+_worker_init_inds = None
+_worker_perturb = True
+_worker_writer = None
+
+def _init_worker(sim: Simulator, init_inds: List[int], perturb: bool, writer: RunWriter=None) -> None:
+    """
+        Initialise a worker process, by storing the :class:`Simulator` it will run. This is done once per process, rather than once per run, so that the simulation only needs to be pickled once per worker.
+    """
+    global _worker_sim, _worker_init_inds, _worker_perturb, _worker_writer
+    _worker_sim = sim
+    _worker_init_inds = list(zip(sim.agents + sim.envs, init_inds))
+    _worker_perturb = perturb
+    _worker_writer = writer
+
+def _run_in_worker(run_n: int, seed: int) -> dict:
+    """
+        Execute a single, unanimated, simulation run in a worker process.
+    """
+    seed_global_rngs(get_run_seed(seed, run_n))
+    _worker_sim.seed(seed, run_n)
+
+    for system, init_ind in _worker_init_inds:
+        if system.init_fun:
+            system.init_ind = init_ind + run_n
+
+    _worker_sim.reset()
+    if _worker_perturb:
+        _worker_sim.perturb()
+
+    if _worker_writer is not None:
+        _worker_writer.start(_worker_sim, run_n)
+        _worker_sim.run()
+        _worker_writer.finish(_worker_sim)
+        # the data have been saved, so only the run's number needs to be returned
+        return {"run_n": run_n}
+
+    _worker_sim.run()
+
+    run_data = _worker_sim.get_data()
+    run_data["run_n"] = run_n
+    return _strip_local_functions(run_data)
+
+def _strip_local_functions(data):
+    """
+        Replace the functions in a run's data which cannot be pickled, i.e. lambdas and functions defined inside other functions (such as the ``init_fun`` s in many main scripts), with ``None``, in place, so that the data can be sent back from a worker process. These are the same functions which a :class:`RunWriter` saves as ``None``.
+    """
+    if isinstance(data, dict):
+        for key, value in data.items():
+            data[key] = _strip_local_functions(value)
+    elif isinstance(data, list):
+        data[:] = [_strip_local_functions(value) for value in data]
+    elif callable(data) and "<" in getattr(data, "__qualname__", ""):
+        return None
+    return data
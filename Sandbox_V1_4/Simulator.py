@@ -1,18 +1,37 @@
 from .base import *
 from .Agent import *
 from .DisturbanceSource import *
+from .SensorRegistry import *
 
 from typing import List, Dict
+import copy as cp
+import random
+import zlib
 
 class Simulator:
     """
         A class for running a *Sandbox* simulation.
 
         It is possible to write your own simulation loop, without too much difficulty, and sometimes you may find that the easiest way to customise. That being the case, this class mainly exists for convenience, for standardising, and to cut down on the amount of code in main scripts.
+
+        In every step, the agents are stepped first, then the environmental systems, and then the disturbances. The order in which the systems within each of these groups are stepped is chosen by the simulation's ``order`` policy:
+
+        * ``"group"``: each group is shuffled, independently, in every step. This is the default.
+        * ``"table"``: the orders are taken, in turn, from a table of ``order_table_size`` shuffled orders, which is drawn when the simulation is reset. This is quicker than shuffling in every step, and still avoids systems always being stepped in the same order.
+        * ``"fixed"``: the systems are always stepped in the order of their lists. This is the quickest policy.
+
+        Whichever policy is used, the lists themselves are never reordered. The step methods of the systems are gathered into a schedule (see :meth:`compile_schedule`) when the simulation is reset, so that the work done in each step is kept to a minimum.
+
+        If the simulation is constructed with ``batch_sensors=True``, then the sensors of all of the agents are stepped together by a :class:`SensorRegistry`, at the start of every step, before the agents are stepped, so that sensors of the same type can be evaluated in one vectorised pass. This is much quicker for large swarms, but it means that all agents sense simultaneously (see :class:`SensorRegistry`).
+
+        Similarly, if the simulation is constructed with ``batch_agents=True``, then all of the agents of each class whose ``step_batching`` attribute is ``True`` are stepped together, by the class's ``step_batch`` method, so that their motion is integrated in one vectorised pass (see :class:`Agent`), and each class takes up a single place in the schedule. In a mixed swarm, e.g. of ants and FauxKilobots, this means one call per class, rather than one per agent, but the agents of each class sense and act before any of them moves.
     """
-    def __init__(self, agents: List[Agent], envs: List[System], duration: float, dt: float, obj_fun=None, disturbances: List[DisturbanceSource]=[]):
+    # the policies for the order in which systems are stepped
+    orders = ["group", "table", "fixed"]
+
+    def __init__(self, agents: List[Agent], envs: List[System], duration: float, dt: float, obj_fun=None, disturbances: List[DisturbanceSource]=[], recording: RecordingPolicy=None, order: str="group", order_table_size: int=64, batch_sensors: bool=False, batch_agents: bool=False):
         """
-            __init__(agents: List[Agent], envs: List[System], duration: float, dt: float, obj_fun=None, disturbances: List[DisturbanceSource]=[])
+            __init__(agents: List[Agent], envs: List[System], duration: float, dt: float, obj_fun=None, disturbances: List[DisturbanceSource]=[], recording: RecordingPolicy=None, order: str="group", order_table_size: int=64, batch_sensors: bool=False, batch_agents: bool=False)
 
             :param agents: The list of agents to simulate.
             :type agents: List[Agent]
@@ -31,19 +50,56 @@ class Simulator:
 
             :param disturbances: The list of disturbances to simulate.
             :type disturbances: List[DisturbanceSource]
+
+            :param recording: The policy which determines how much of each run is kept in the histories of the simulation and its systems (see :class:`RecordingPolicy`). Individual systems can override this with their ``recording`` attributes. Defaults to ``None``, in which case everything is kept.
+            :type recording: :class:`RecordingPolicy`
+
+            :param order: The policy for the order in which systems are stepped: ``"group"``, ``"table"`` or ``"fixed"`` (see :class:`Simulator`). Defaults to ``"group"``.
+            :type order: str
+
+            :param order_table_size: The number of orders in the table used by the ``"table"`` policy, which must be at least ``1``. Defaults to ``64``.
+            :type order_table_size: int
+
+            :param batch_sensors: If ``True``, the agents' sensors are stepped together, grouped by type, by a :class:`SensorRegistry`. Defaults to ``False``.
+            :type batch_sensors: bool
+
+            :param batch_agents: If ``True``, agents of the same class are stepped together, by the class's ``step_batch`` method (see :class:`Agent`). Defaults to ``False``.
+            :type batch_agents: bool
         """
+        if order not in Simulator.orders:
+            raise ValueError("order must be one of " + str(Simulator.orders))
+        if int(order_table_size) < 1:
+            raise ValueError("order_table_size must be at least 1")
+
         self.agents = agents
         self.envs = envs
         self.disturbances = disturbances
         self.obj_fun = obj_fun
+        self.recording: RecordingPolicy = recording
 
         self.t: float = 0
-        self.ts: List[float] = [0]
+        self.ts: History = History([0])
         self.run_completed: bool = False
 
         self.duration = duration
         self.dt = dt
 
+        # the generator used to randomise the order in which systems are stepped. None means that NumPy's global
+        # generator is used, until the simulation is seeded
+        self.rng: np.random.Generator = None
+
+        self.order: str = order
+        self.order_table_size: int = int(order_table_size)
+        # the compiled schedule of step methods, which is recompiled if the policy or the numbers of systems change
+        self.schedule: list = None
+        self.schedule_key: tuple = None
+        self.schedule_step: int = 0
+        self.batch_sensors: bool = batch_sensors
+        self.sensor_registry: SensorRegistry = None
+        self.batch_agents: bool = batch_agents
+        # the groups of agents which are stepped together, if agents are batched
+        self.agent_batches: List[_AgentBatch] = None
+
 
     def get_systems(self) -> List[System]:
         """
@@ -51,12 +107,66 @@ class Simulator:
         """
         return self.envs + self.agents
 
+    def get_rng(self):
+        """
+            Get the random number generator which the simulation uses to randomise the order in which systems are stepped. See :meth:`Sandbox.System.get_rng`.
+        """
+        if self.rng is None:
+            return np.random
+        return self.rng
+
+    def walk_systems(self) -> List[Tuple[str, System]]:
+        """
+            Get every system in the simulation, including the subsystems of agents, environmental systems and disturbances (e.g. sensors, motors, controllers and noise sources), along with a path which identifies each system within the simulation. Paths are built from list indices and attribute names, e.g. ``"agents/0/sensors/4/noisemaker"``. The systems are found breadth-first, so a system which is referred to from more than one place, such as a :class:`LightSource` which is in both the ``envs`` list and a :class:`LightSensor`'s list, gets its shortest path, e.g. ``"envs/0"``.
+
+            :return: A list of ``(path, system)`` pairs, where every system appears only once.
+            :rtype: list[tuple[str, :class:`System`]]
+        """
+        systems = []
+        seen = set()
+        queue = []
+        for name, group in [("agents", self.agents), ("envs", self.envs), ("disturbances", self.disturbances)]:
+            for i, system in enumerate(group):
+                queue.append((name + "/" + str(i), system))
+
+        while queue:
+            next_queue = []
+            for path, system in queue:
+                if id(system) in seen:
+                    continue
+                seen.add(id(system))
+                systems.append((path, system))
+                for name, subsystem in system.get_subsystems():
+                    next_queue.append((path + "/" + name, subsystem))
+            queue = next_queue
+
+        return systems
+
+    def seed(self, seed: int=None, run_n: int=0) -> None:
+        """
+            Give every system in the simulation (see :meth:`walk_systems`) its own random number generator, as well as giving the simulation a generator for randomising the order in which systems are stepped. All of the generators are derived from the single ``seed``, and the generator which a system gets only depends on ``seed``, ``run_n`` and the system's path in the simulation. This means that a seeded run will give the same results however many runs are executed before it, and whichever process it is executed in.
+
+            Any code which uses NumPy's global random number generator, rather than ``get_rng()``, e.g. an ``init_fun`` which calls :func:`random_in_interval` without passing in a generator, will not be affected by this method.
+
+            :param seed: The root seed. Defaults to ``None``, in which case fresh entropy is drawn from the operating system.
+            :type seed: int
+
+            :param run_n: The number of the simulation run which the generators will be used for. Each run gets independent streams of random numbers.
+            :type run_n: int
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+
+        self.rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(run_n, zlib.crc32(b"simulator"))))
+        for path, system in self.walk_systems():
+            system.rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(run_n, zlib.crc32(path.encode()))))
+
     def reset(self) -> None:
         """
             A method to reset a :class:`Simulator`, so that it can be started again from the same initial conditions.
         """
         self.t: float = 0
-        self.ts: List[float] = [0]
+        self.ts: History = History([0])
         self.run_completed: bool = False
 
         for agent in self.agents:
@@ -68,6 +178,76 @@ class Simulator:
         for dist in self.disturbances:
             dist.reset()
 
+        self.apply_recording()
+        self.reserve_histories()
+        self.compile_schedule()
+
+    def compile_schedule(self) -> None:
+        """
+            Gather the step methods of the simulation's agents, environmental systems and disturbances into a schedule which suits the simulation's ``order`` policy (see :class:`Simulator`), so that ``step_forwards`` only has to call them. For the ``"table"`` policy, this is when the table of orders is drawn, with the simulation's random number generator. If the simulation batches its agents' sensors, then this is also when its :class:`SensorRegistry` is built, and if it batches its agents, then this is when they are grouped by class.
+
+            This is called by ``reset``, and by ``step_forwards`` if the policy or the number of systems in any of the lists has changed since the schedule was compiled. If systems in the lists are replaced by others, then this method should be called again.
+        """
+        agent_steps = [agent.step for agent in self.agents]
+        self.agent_batches = None
+        if self.batch_agents:
+            agent_steps = []
+            batches: Dict[type, List[Agent]] = {}
+            for agent in self.agents:
+                # agents whose classes override step can not be stepped by step_batch
+                if getattr(agent, "step_batching", False) and Agent.get_definer(type(agent), "step") is Agent:
+                    batches.setdefault(type(agent), []).append(agent)
+                else:
+                    agent_steps.append(agent.step)
+            self.agent_batches = [_AgentBatch(agent_type, agents) for agent_type, agents in batches.items()]
+            agent_steps += [batch.step for batch in self.agent_batches]
+        groups = [agent_steps, [env.step for env in self.envs], [dist.step for dist in self.disturbances]]
+        if self.order == "fixed":
+            self.schedule = [step for group in groups for step in group]
+        elif self.order == "table":
+            rng = self.get_rng()
+            self.schedule = []
+            for _ in range(self.order_table_size):
+                steps = []
+                for group in groups:
+                    steps += [group[i] for i in rng.permutation(len(group))]
+                self.schedule.append(steps)
+        else:
+            self.schedule = groups
+        self.sensor_registry = SensorRegistry(self.agents) if self.batch_sensors else None
+        self.schedule_key = (self.order, len(self.agents), len(self.envs), len(self.disturbances))
+        self.schedule_step = 0
+
+    def apply_recording(self) -> None:
+        """
+            Make the histories of the simulation and all of its systems (see :meth:`walk_systems`) follow the right :class:`RecordingPolicy`. A system follows its own ``recording`` policy if it has one, or otherwise the policy of the nearest system which it is a part of and which has one, e.g. a :class:`Sensor` follows the policy of the :class:`Robot` it is attached to. Systems which have no such policy follow the simulation's ``recording`` policy. This is called by ``reset``.
+        """
+        self.ts.set_policy(self.recording)
+        policies = {}
+        for path, system in self.walk_systems():
+            policy = system.recording
+            if policy is None:
+                policy = self.recording
+                parts = path.split("/")
+                for i in range(len(parts) - 1, 0, -1):
+                    parent = "/".join(parts[:i])
+                    if parent in policies:
+                        policy = policies[parent]
+                        break
+            policies[path] = policy
+            system.apply_recording(policy)
+
+    def reserve_histories(self) -> None:
+        """
+            Allocate space in the histories of the simulation and all of its systems (see :class:`History`) for every step of a run, so that they do not need to grow while the simulation is running. This is called by ``reset``.
+        """
+        # one value for the initial state, one per step, and one spare, as the accumulated floating point error in
+        # t can lead to an extra step
+        n = int(np.ceil(self.duration / self.dt)) + 2
+        self.ts.reserve(n)
+        for _, system in self.walk_systems():
+            system.reserve_histories(n)
+
     def perturb(self) -> None:
         """
            A method for perturbing the various objects in a simulation. Only objects which have a ``perturb_fun`` implemented will be affected (see ``perturb`` in :class:`System`).
@@ -77,7 +257,7 @@ class Simulator:
         for env in self.envs:
             env.perturb()
 
-    def get_data(self):
+    def get_data(self, copy: bool=False):
         """
             A method for getting a :class:`Simulator`'s data. This will include timestamps, as well as the data of all simulated systems, except for that of the :class:`DisturbanceSource` s (this may be added in a later implementation).
 
@@ -86,15 +266,120 @@ class Simulator:
             * list of data from all simulated agents: ``data["agents"]``
             * list of data from all simulated environmental features: ``data["envs"]``
             * list of timestamps from all simulation steps: ``data["ts"]``
+            * a description of what was kept in the histories of the simulation and its systems (see :class:`RecordingPolicy`): ``data["recording"]``. The description of the timestamps is in ``data["recording"]["ts"]``, and those of the systems are keyed by their paths (see :meth:`walk_systems`) and then by the names of their histories, e.g. ``data["recording"]["agents/0"]["xs"]``. Systems which have no histories are not included.
+
+            :param copy: If ``True``, the histories in the data are copies, rather than read-only views onto the histories' own arrays (see :meth:`Sandbox.System.get_data`). Defaults to ``False``.
+            :type copy: bool
         """
         agents_data = []
         for agent in self.agents:
-            agents_data.append(agent.get_data())
+            agents_data.append(agent.get_data(copy))
         envs_data = []
         for env in self.envs:
-            envs_data.append(env.get_data())
+            envs_data.append(env.get_data(copy))
+
+        recording = {"ts": self.ts.get_recording_data()}
+        for path, system in self.walk_systems():
+            system_recording = system.get_recording_data()
+            if system_recording:
+                recording[path] = system_recording
+
+        return {"agents": agents_data, "envs": envs_data, "ts": self.ts.get_values(copy), "recording": recording}
+
+    def snapshot(self) -> dict:
+        """
+            Take a snapshot of the simulation's current state, which it can be returned to later with ``restore``, e.g. so that a long burn-in period only has to be simulated once, before each of a number of variations on the simulation is run from the end of it.
+
+            The snapshot includes the states of all systems in the simulation (see :meth:`walk_systems`), including agents, environmental systems, disturbances, controllers and noise sources, as well as the simulation's time and the states of all of the random number generators involved, including NumPy's and Python's global generators. Histories (see :class:`History`) are not copied into the snapshot, but share the values recorded so far with the simulation's own histories.
+
+            :return: The snapshot. Its contents should not be modified.
+            :rtype: dict
+        """
+        walked = self.walk_systems()
+        state = cp.deepcopy({"systems": [system for _, system in walked], "ts": self.ts, "rng": self.rng})
+        state["paths"] = [path for path, _ in walked]
+        state["t"] = self.t
+        state["run_completed"] = self.run_completed
+        state["schedule_step"] = self.schedule_step
+        state["global_rngs"] = (np.random.get_state(), random.getstate())
+        return state
+
+    def restore(self, snapshot: dict) -> None:
+        """
+            Return the simulation to the state it was in when a snapshot was taken with ``snapshot``. The same snapshot can be restored any number of times.
+
+            Systems are restored in place, so any references to them (e.g. those held by an :class:`Animator`, or by a main script) are still valid afterwards. This means that the simulation must still be made up of the same systems as when the snapshot was taken, although their parameters may have been changed since.
+
+            Noise sources which are being recorded or replayed by a :class:`NoiseRecorder` carry on recording or replaying after they are restored, as their streams of random numbers are not part of the snapshot.
+
+            :param snapshot: The snapshot to restore.
+            :type snapshot: dict
+        """
+        walked = self.walk_systems()
+        if [path for path, _ in walked] != snapshot["paths"]:
+            raise ValueError("The systems in the simulation are not the same as those in the snapshot")
 
-        return {"agents": agents_data, "envs": envs_data, "ts": self.ts}
+        # copy the snapshot, so that it is left as it is to be restored again
+        state = cp.deepcopy({"systems": snapshot["systems"], "ts": snapshot["ts"], "rng": snapshot["rng"]})
+
+        # the restored systems refer to each other (and to lists of each other, e.g. a LightSensor's light sources),
+        # so references to the copies have to be replaced with references to the original systems
+        originals = {}
+        for (_, system), copy in zip(walked, state["systems"]):
+            originals[id(copy)] = system
+            for name, value in vars(copy).items():
+                old_value = vars(system).get(name)
+                if isinstance(value, list) and isinstance(old_value, list) and value and isinstance(value[0], System):
+                    originals.setdefault(id(value), old_value)
+
+        # the streams of noise sources are not copied into snapshots (see NoiseSource), so the live ones are kept
+        streams = {}
+        for _, system in walked:
+            if isinstance(system, NoiseSource):
+                streams[id(system)] = {name: vars(system)[name] for name in system.stream_attributes if name in vars(system)}
+
+        for (_, system), copy in zip(walked, state["systems"]):
+            system.__dict__.clear()
+            system.__dict__.update(copy.__dict__)
+            system.__dict__.update(streams.get(id(system), {}))
+        for _, system in walked:
+            for name, value in vars(system).items():
+                if id(value) in originals:
+                    original = originals[id(value)]
+                    if isinstance(value, list) and original is not value:
+                        original[:] = [originals.get(id(v), v) for v in value]
+                    setattr(system, name, original)
+
+        self.ts = state["ts"]
+        self.rng = state["rng"]
+        self.t = snapshot["t"]
+        self.run_completed = snapshot["run_completed"]
+        self.schedule_step = snapshot["schedule_step"]
+        np.random.set_state(snapshot["global_rngs"][0])
+        random.setstate(snapshot["global_rngs"][1])
+
+    def fork(self, k: int, seed: int=None) -> List["Simulator"]:
+        """
+            Make ``k`` independent copies of the simulation in its current state, e.g. to run a number of variations on the simulation from the end of a burn-in period. Like ``snapshot``, forking does not copy the histories recorded so far, which are shared by the simulation and its copies (see :class:`History`), so it is cheap even after a long run.
+
+            Unless ``seed`` is given, every copy carries on with the same random numbers as the simulation itself would have (which is useful for comparing variations on a simulation fairly). NumPy's and Python's global random number generators cannot be copied, so any systems which use them rather than generators of their own (see :meth:`seed`) will not get the same random numbers in each copy.
+
+            :param k: The number of copies to make.
+            :type k: int
+
+            :param seed: If this is given, each copy is seeded (see :meth:`seed`) with ``seed`` and its index in the list of copies as the run number, so that the copies get independent streams of random numbers. Defaults to ``None``.
+            :type seed: int
+
+            :return: The copies.
+            :rtype: list[:class:`Simulator`]
+        """
+        forks = []
+        for i in range(k):
+            fork = cp.deepcopy(self)
+            if seed is not None:
+                fork.seed(seed, i)
+            forks.append(fork)
+        return forks
 
     def step_forwards(self) -> None:
         """
@@ -103,20 +388,27 @@ class Simulator:
         # begin simulation main loop
         if self.t < self.duration:
 
-            np.random.shuffle(self.agents)
-            # step all robots
-            for agent in self.agents:
-                agent.step(self.dt)
-
-            np.random.shuffle(self.envs)
-            # step all environmental features
-            for f in self.envs:
-                f.step(self.dt)
+            if self.schedule_key != (self.order, len(self.agents), len(self.envs), len(self.disturbances)) or self.batch_sensors != (self.sensor_registry is not None) or self.batch_agents != (self.agent_batches is not None):
+                self.compile_schedule()
 
-            np.random.shuffle(self.disturbances)
-            # step disturbance
-            for disturbance in self.disturbances:
-                disturbance.step(self.dt)
+            # systems may be stepped in a random order, but the lists themselves are not shuffled, so that the paths
+            # used in seed() stay the same from one step to the next
+            dt = self.dt
+            if self.sensor_registry is not None:
+                self.sensor_registry.step(dt)
+            if self.order == "group":
+                rng = self.get_rng()
+                # step all robots, then all environmental features, then all disturbances
+                for steps in self.schedule:
+                    for i in rng.permutation(len(steps)):
+                        steps[i](dt)
+            else:
+                steps = self.schedule
+                if self.order == "table":
+                    steps = self.schedule[self.schedule_step % len(self.schedule)]
+                    self.schedule_step += 1
+                for step in steps:
+                    step(dt)
 
             # increment time variable and store in ts list for plotting later
             self.t += self.dt
@@ -130,3 +422,15 @@ class Simulator:
         """
         while self.t < self.duration:
             self.step_forwards()
+
+
+class _AgentBatch:
+    """
+        A group of agents of the same class, which a :class:`Simulator` steps together, with the class's ``step_batch`` method.
+    """
+    def __init__(self, agent_type: type, agents: List[Agent]):
+        self.agent_type = agent_type
+        self.agents = agents
+
+    def step(self, dt: float) -> None:
+        self.agent_type.step_batch(self.agents, dt)
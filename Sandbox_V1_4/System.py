@@ -1,11 +1,20 @@
 from .base import *
+from .History import *
 
 from typing import Callable
 
 class System:
     '''
         Every object in a Sandbox simulation is an instance of a subclass of the abstract class :class:`System`. In some cases, this is for conceptual reasons rather than practical ones, e.g. in the case of a :class:`DisturbanceSource`, which certainly can be considered a system but which doesn't currently inherit anything from :class:`System` (although this may well change in a future implementation).
+
+        Every :class:`System` can have its own random number generator, ``rng``. By default this is ``None``, in which case NumPy's global random number generator is used. Systems should always get their generator with ``get_rng()``, so that simulations can be seeded with :meth:`Sandbox.Simulator.seed`.
+
+        A :class:`System`'s histories (see :class:`History`) follow the :class:`RecordingPolicy` of the :class:`Simulator` it is simulated in, unless its ``recording`` attribute is set to a policy of its own, which then also applies to its subsystems.
     '''
+    # class attributes, so that subclasses which do not call System.__init__ still have them
+    rng: np.random.Generator = None
+    recording: RecordingPolicy = None
+
     def __init__(self, x: float=None, y: float=None, theta: float=None, init_fun: Callable=None, perturb_fun: Callable=None):
         """
             __init__(x: float=None, y: float=None, theta: float=None, perturb_fun: Callable=None, init_fun: Callable=None)
@@ -39,7 +48,7 @@ class System:
         self.init_fun: Callable = init_fun
         self.init_ind: int = 0
 
-        self.initial_state = System.get_data(self)
+        self.initial_state = System.get_data(self, copy=True)
 
     def step(self, dt: float) -> None:
         """
@@ -54,7 +63,7 @@ class System:
         if self.has_orientation:
             self.thetas.append(self.theta)
 
-    def get_data(self) -> Dict[str, Union[float, List[float]]]:
+    def get_data(self, copy: bool=False) -> Dict[str, Union[float, List[float]]]:
         """
             A function to get the data from a :class:`System`, in the form of a string-keyed dict. If a :class:`System` has position, then its current coordinates plus their histories will be included in the data. If a :class:`System` has orientation, then its current orientation and its orientation history are incuded in the data.
 
@@ -67,6 +76,11 @@ class System:
             * current orientation: ``data["theta"]``
             * history of orientations over time: ``data["thetas"]``
 
+            Histories (see :class:`History`) are returned as NumPy arrays. By default, these are read-only views onto the histories' own arrays (see ``History.get_values``), so that getting the data of a long simulation run is quick and takes no extra memory. Subclasses pass ``copy`` on to the ``get_data`` methods of their subsystems.
+
+            :param copy: If ``True``, the histories are returned as copies, which belong to the caller. Defaults to ``False``.
+            :type copy: bool
+
             :return: The System's data.
             :rtype: dict
         """
@@ -75,12 +89,12 @@ class System:
                                                       "ys": None, "thetas": None, "has_position": self.has_position, "has_orientation":  self.has_orientation, "perturb_fun": self.perturb_fun, "init_fun": self.init_fun, "init_ind": self.init_ind}
 
         if self.has_position:
-            data["xs"] = self.xs[:]
+            data["xs"] = self.xs.get_values(copy)
             data["x"] = self.x
-            data["ys"] = self.ys[:]
+            data["ys"] = self.ys.get_values(copy)
             data["y"] = self.y
         if self.has_orientation:
-            data["thetas"] = self.thetas[:]
+            data["thetas"] = self.thetas.get_values(copy)
             data["theta"] = self.theta
 
         return data
@@ -121,8 +135,8 @@ class System:
         """
         self.x = x
         self.y = y
-        self.xs = [x]
-        self.ys = [y]
+        self.xs = History([x])
+        self.ys = History([y])
 
     def init_theta(self, theta: float) -> None:
         """
@@ -132,7 +146,7 @@ class System:
             :type theta: float
         """
         self.theta = theta
-        self.thetas = [theta]
+        self.thetas = History([theta])
 
     def perturb(self) -> None:
         """
@@ -149,6 +163,66 @@ class System:
             self.init_fun(self)
             self.init_ind += 1
 
+    def reserve_histories(self, n: int) -> None:
+        """
+            Make sure that all of the system's histories (see :class:`History`) have space for at least ``n`` values, so that they will not need to grow during a simulation run. Histories held by the system's subsystems are not included - :class:`Simulator` calls this method on every system in a simulation.
+
+            :param n: The number of values to allocate space for.
+            :type n: int
+        """
+        for value in vars(self).values():
+            if isinstance(value, History):
+                value.reserve(n)
+
+    def apply_recording(self, policy: RecordingPolicy=None) -> None:
+        """
+            Make all of the system's histories (see :class:`History`) follow a :class:`RecordingPolicy`. This is called by :class:`Simulator` when it is reset, with the policy which applies to the system, which is not necessarily the system's own ``recording`` attribute, as that may be inherited from the simulation or from another system.
+
+            :param policy: The policy to follow. Defaults to ``None``, in which case every value is kept.
+            :type policy: :class:`RecordingPolicy`
+        """
+        for value in vars(self).values():
+            if isinstance(value, History):
+                value.set_policy(policy)
+
+    def get_recording_data(self) -> Dict[str, dict]:
+        """
+            Get a description of what was kept in each of the system's histories (see ``History.get_recording_data``), in a dict which is keyed by the names of the histories, e.g. ``data["xs"]``.
+        """
+        data = {}
+        for name, value in vars(self).items():
+            if isinstance(value, History):
+                data[name] = value.get_recording_data()
+        return data
+
+    def get_rng(self):
+        """
+            Get the random number generator which the system should use for all of its random draws. If the system has not been given its own generator, e.g. by :meth:`Sandbox.Simulator.seed`, then this will be NumPy's global random number generator.
+
+            :return: The system's random number generator.
+            :rtype: :class:`numpy.random.Generator`, or the ``numpy.random`` module
+        """
+        if self.rng is None:
+            return np.random
+        return self.rng
+
+    def get_subsystems(self) -> List[Tuple[str, "System"]]:
+        """
+            Get the systems which this system is made up of or refers to, e.g. the sensors, motors and controller of a :class:`Robot`, or the noise source of a :class:`Sensor`. Attributes which hold a :class:`System`, or a list of them, are found automatically, so subclasses do not need to override this method.
+
+            :return: A list of ``(name, system)`` pairs, where ``name`` is the attribute name, followed by the list index for systems held in lists, e.g. ``"sensors/4"``.
+            :rtype: list[tuple[str, :class:`System`]]
+        """
+        subsystems = []
+        for name, value in vars(self).items():
+            if isinstance(value, System):
+                subsystems.append((name, value))
+            elif isinstance(value, (list, tuple)) and value and isinstance(value[0], System):
+                for i, v in enumerate(value):
+                    if isinstance(v, System):
+                        subsystems.append((name + "/" + str(i), v))
+        return subsystems
+
     def __eq__(self, other):
         """
             Overrides the == operator for instances of this class.
@@ -5,7 +5,7 @@ from typing import Tuple
 
 class WallPatchSensor(Sensor, FOV_thing):
     """
-
+        A sensor which detects the patches on one or more :class:`Wall` s. Its activation is the fraction of the projection of its field of view onto each wall which is covered by patches, summed over the walls which it faces. Covered lengths are found from the walls' indexes of their patches (see ``Wall.get_covered_length``), so the cost of a step does not grow with the number of patches on a wall.
     """
     # construct sensor
     def __init__(self, wall, x: float, y: float, theta: float=0, FOV: float=0.1*math.pi, noisemaker: NoiseSource=None, name_str: str='PatchSensor', enabled: bool=True, delay_steps: float=0):
@@ -13,13 +13,13 @@ class WallPatchSensor(Sensor, FOV_thing):
 
         """
         super().__init__(x=x, y=y, theta=theta, name_str=name_str, enabled=enabled, noisemaker=noisemaker, delay_steps=delay_steps)
-        self.wall = wall  # a list of Patch instances which this sensor can detect
+        self.wall = wall  # the Wall, or list of Walls, whose patches this sensor can detect
         self.activation = 0  # sensor activation. this variable is updated in and returned from the step method. it is stored separately in case you want to access it multiple times between simulation steps, although that is unlikely to be necessary
-        self.activations = [self.activation]  # for plotting and analysis, a sensor keeps a complete record of its activation over time
+        self.activations = History([self.activation])  # for plotting and analysis, a sensor keeps a complete record of its activation over time
         # self.noisemaker = noisemaker  # noise source
         self.FOV = FOV  # sensor angular field of view
 
-        self.initial_state = self.get_data()
+        self.initial_state = self.get_data(copy=True)
 
 
     def step(self, dt: float) -> float:
@@ -28,76 +28,36 @@ class WallPatchSensor(Sensor, FOV_thing):
         """
         super().step(dt)  # call System step method, to store xy-coordinates and theta
 
-        # distance to wall
-        x_dist = self.wall.x - self.x
-        # edges of FOV
-        theta1 = self.theta + self.FOV/2
-        theta2 = self.theta - self.FOV/2
+        self.activation = 0
 
-        x1 = np.cos(theta1)
-        x2 = np.cos(theta2)
+        for wall in self.get_walls():
+            # distance to wall
+            x_dist = wall.x - self.x
+            # edges of FOV
+            theta1 = self.theta + self.FOV/2
+            theta2 = self.theta - self.FOV/2
 
-        self.activation = 0
+            x1 = math.cos(theta1)
+            x2 = math.cos(theta2)
+
+            s = np.sign(x_dist)
+            if ((np.sign(x1) == s) or (np.sign(x2) == s)):
+
+                # projection of sensor FOV onto wall
+                l1 = x_dist / x1
+                l2 = x_dist / x2
+                y_bottom = self.y + (l1 * math.sin(theta1))
+                y_top = self.y + (l2 * math.sin(theta2))
 
-        s = np.sign(x_dist)
-        if ((np.sign(x1) == s) or (np.sign(x2) == s)):
-
-            # projection of sensor FOV onto wall
-            # y_top = self.y + x_dist * np.sin(theta1)
-            # y_bottom = self.y + x_dist * np.sin(theta2)
-            l1 = x_dist / math.cos(theta1)
-            l2 = x_dist / math.cos(theta2)
-            y_bottom = self.y + (l1 * math.sin(theta1))
-            y_top = self.y + (l2 * math.sin(theta2))
-
-            # print(y_bottom, y_top)
-
-            if y_bottom > y_top:
-                # print(y_bottom, y_top)
-                temp = y_top
-                y_top = y_bottom
-                y_bottom = temp
-                # print(y_bottom, y_top, '\n')
-
-            proj_length = y_top - y_bottom
-
-            # print('proj',y_bottom, y_top)
-
-            for patch in self.wall.patches:
-                # print('patch', patch.y_bottom, patch.y_top)
-                l = 0
-                # only look if top of patch is above bottom of FOV
-                if patch.y_top > y_bottom:
-                    # print("yep")
-                    # if FOV top edge is inside patch
-                    if y_top < patch.y_top:
-                        if y_top > patch.y_bottom:
-                            # print("yo")
-                            # if FOV is entirely inside patch
-                            if y_bottom > patch.y_bottom:
-                                # visible length
-                                l = proj_length
-                                # print('all: ', l)
-                            # if only top edge of FOV is inside patch
-                            else:
-                                # visible length
-                                l = y_top - patch.y_bottom
-                                # print('top only', l)
-                    # if only bottom edge of patch is inside FOV
-                    elif y_bottom < patch.y_top and y_bottom > patch.y_bottom:
-                        # print('uh?', y_bottom, patch.y_bottom, y_top)
-                        # visible length
-                        l = patch.y_top - y_bottom
-                        # print('bottom only', l)
-                    # if patch is entirely inside FOV
-                    elif y_top > patch.y_top and y_bottom < patch.y_bottom:
-                        l = patch.length
-
-                    # increase activation according to ratio between visible patch length and length of projection of sensor onto wall
-                    if l:
-                        self.activation += l / proj_length
-                # else:
-                #     print("nope")
+                if y_bottom > y_top:
+                    y_bottom, y_top = y_top, y_bottom
+
+                proj_length = y_top - y_bottom
+
+                # increase activation according to ratio between visible patch length and length of projection of
+                # sensor onto wall
+                if proj_length > 0:
+                    self.activation += wall.get_covered_length(y_bottom, y_top) / proj_length
 
         # # add noise, if a noisemaker is implemented
         # if self.noisemaker != None:
@@ -111,20 +71,28 @@ class WallPatchSensor(Sensor, FOV_thing):
 
         return self.update(dt)
 
-    def get_data(self) -> dict:
+    def get_walls(self) -> list:
+        """
+            Get the list of walls which the sensor can detect patches on.
+        """
+        if isinstance(self.wall, (list, tuple)):
+            return self.wall
+        return [self.wall]
+
+    def get_data(self, copy: bool=False) -> dict:
         """
 
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["activation"] = self.activation
-        data["activations"] = cp.copy(self.activations)
+        data["activations"] = self.activations.get_values(copy)
         data["FOV"] = self.FOV
         data["wall"] = self.wall
         data["noises"] =  None
         if self.noisemaker:
-            # print(self.noisemaker.get_data())
+            # print(self.noisemaker.get_data(copy))
             # print()
-            data["noises"] = self.noisemaker.get_data()["noises"][:]
+            data["noises"] = self.noisemaker.get_data(copy)["noises"]
         return data
 
     def reset(self) -> None:
@@ -136,7 +104,7 @@ class WallPatchSensor(Sensor, FOV_thing):
         super().reset()
 
         self.activation = self.initial_state["activations"][0]
-        self.activations = [self.activation]
+        self.activations = History([self.activation])
         self.FOV = self.initial_state["FOV"]
         self.wall = self.initial_state["wall"]
 
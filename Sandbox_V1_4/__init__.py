@@ -2,17 +2,23 @@ from .factories import *
 from .plotting import *
 from .base import *
 from .noise import *
+from .BrightnessModel import *
 from .stimuli import *
 from .Motor import *
 from .Simulator import *
+from .SensorRegistry import *
 from .SimulationRunner import *
+from .RunWriter import *
+from .NoiseRecorder import *
 from .pygame_functions import *
 from .Animator import *
 from .Arena import *
 from .CircularArena import *
 from .DisturbanceSource import *
 from .Agent import *
+from .Kinematics import *
 from .Robot import *
+from .RobotPopulation import *
 from .Controller import *
 from .RobotController import *
 from .Bee import *
@@ -24,6 +30,7 @@ from .HRCorrelator import *
 from .Patch import *
 from .WallPatchSensor import *
 from .System import *
+from .History import *
 # from .LogisticMap import *
 # from .LogisticMapController import *
 from .FeedbackController import *
@@ -31,6 +38,7 @@ from .FirstOrderIntegrator import *
 from .MotorSpeedSensor import *
 from .Consumable import *
 from .FloorPatch import *
+from .FloorPatchMap import *
 from .FloorPatchSensor import *
 from .pheromones import *
 from .MerryGoRound import *
@@ -43,7 +51,10 @@ from .FauxKilobotController import *
 from .DelayBlock import *
 from .EnergySensor import *
 from .Sensor import *
+from .LightSourceField import *
 from .LightSensor import *
+from .OccluderGrid import *
+from .OccludingLightSensor import *
 from .CompassSensor import *
 from .HeadingSensor import *
 from .FadingLight import *
@@ -30,14 +30,24 @@ def angle_difference(angle1: float, angle2: float) -> float:
         diff -= (2*math.pi)
     return diff
 
+# a vectorised version of angle_difference, for arrays of angles
+def angle_differences(angles1: np.ndarray, angles2: np.ndarray) -> np.ndarray:
+    """
+        A vectorised version of ``angle_difference``, which finds the differences between two arrays of angles, in the interval ``(-pi, pi]``.
+    """
+    diff = (angles1 - angles2) % (2*math.pi)
+    return np.where(diff > math.pi, diff - 2*math.pi, diff)
+
 # generate random number from uniform interval
 # - numpy already has a function for this, but I wrote this and used it in many places before thinking to check that
-def random_in_interval(minimum: float=0, maximum: float=1) -> float:
+def random_in_interval(minimum: float=0, maximum: float=1, rng=None) -> float:
     """
-
+        Generate a random number from the uniform interval [minimum, maximum). If ``rng`` is ``None``, then NumPy's global random number generator is used - to use a system's own generator, pass in ``rng=system.get_rng()``.
     """
+    if rng is None:
+        rng = np.random
     width = maximum - minimum
-    return (width * np.random.random()) + minimum
+    return (width * rng.random()) + minimum
 
 def norm(x1, x2, y1, y2):
     """
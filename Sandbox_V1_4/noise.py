@@ -17,7 +17,25 @@ from .System import *
 class NoiseSource(System):
     """
         The abstract superclass for all classes representing sources of noise.
+
+        Noise sources get their random numbers from :meth:`get_random`. When a noise source has its own random number generator (see :meth:`Sandbox.Simulator.seed`), random numbers are drawn from it in blocks, which start small and double in size up to ``block_size``, and are then served from the block one at a time, which is much faster than drawing them one at a time. As NumPy generators produce the same stream of numbers however many are drawn at a time, a noise source's output does not depend on ``block_size``, and is the same as if every number had been drawn separately. Noise sources which use NumPy's global generator, which may be shared with other code, draw their numbers one at a time, as before.
+
+        The random numbers which a noise source uses can be recorded to a file, and then replayed in place of drawing new ones, with a :class:`NoiseRecorder`.
     """
+    # the largest number of random numbers which a noise source draws from its generator at a time
+    block_size: int = 4096
+    # the block of random numbers which is being served, the generator it was drawn from, and the index of the next
+    # number to serve from it. these are class attributes, so that subclasses which do not call NoiseSource.__init__
+    # still have them
+    buffer: np.ndarray = None
+    buffer_rng: np.random.Generator = None
+    buffer_index: int = 0
+    # the stream which the source's random numbers are being recorded to or replayed from, if any (see NoiseRecorder)
+    stream = None
+    # the attributes which belong to the recording or replay in progress, which are not copied with the noise source, e.g.
+    # into a snapshot of a simulation, and which Simulator.restore keeps
+    stream_attributes: Tuple[str, ...] = ("stream",)
+
     def __init__(self):
         """
             __init__()
@@ -26,7 +44,7 @@ class NoiseSource(System):
         """
         super().__init__()
         self.noise = 0.0
-        self.noises = [self.noise]
+        self.noises = History([self.noise])
 
     def step(self, dt: float) -> float: # type: ignore
         """
@@ -41,21 +59,91 @@ class NoiseSource(System):
         self.noises.append(self.noise)
         return self.noise
 
+    def get_random(self, normal: bool=False) -> float:
+        """
+            Get the next random number from the noise source's stream of random numbers, which is drawn from its generator in blocks, if it has a generator of its own.
+
+            :param normal: If ``True``, the number is drawn from the standard normal distribution, and otherwise from the uniform distribution on ``[0, 1)``. A noise source should always draw from the same distribution. Defaults to ``False``.
+            :type normal: bool
+
+            :return: The random number.
+            :rtype: float
+        """
+        if self.stream is not None:
+            if self.stream.replaying:
+                return self.stream.read()
+            value = self.draw_random(normal)
+            self.stream.write(value)
+            return value
+        return self.draw_random(normal)
+
+    def draw_random(self, normal: bool=False) -> float:
+        """
+            Draw the next random number from the noise source's generator, or from its current block of random numbers (see :meth:`get_random`, which should be used instead of this method, so that the number can be recorded or replayed).
+        """
+        rng = self.rng
+        if rng is None:
+            return np.random.standard_normal() if normal else np.random.random()
+        if self.buffer_rng is not rng or self.buffer_index == len(self.buffer):
+            # a new generator (e.g. from seeding a new run) starts a new stream, with a small block
+            size = min(64, self.block_size) if self.buffer_rng is not rng else min(2 * len(self.buffer), self.block_size)
+            self.buffer = rng.standard_normal(size) if normal else rng.random(size)
+            self.buffer_rng = rng
+            self.buffer_index = 0
+        value = self.buffer[self.buffer_index]
+        self.buffer_index += 1
+        return float(value)
+
+    def get_randoms(self, n: int, normal: bool=False) -> np.ndarray:
+        """
+            Get the next ``n`` random numbers from the noise source's stream of random numbers, all at once. The numbers are the same as ``n`` calls to :meth:`get_random` would return, and are recorded or replayed in the same way.
+
+            :param n: The number of random numbers.
+            :type n: int
+
+            :param normal: If ``True``, the numbers are drawn from the standard normal distribution, and otherwise from the uniform distribution on ``[0, 1)``. Defaults to ``False``.
+            :type normal: bool
+
+            :return: The random numbers.
+            :rtype: :class:`numpy.ndarray`
+        """
+        if self.stream is not None:
+            return np.array([self.get_random(normal) for _ in range(n)], dtype=float)
+        rng = self.rng
+        if rng is None:
+            return np.random.standard_normal(n) if normal else np.random.random(n)
+        # numbers left over in the current block are served first, and the rest are drawn directly
+        taken = np.zeros(0)
+        if self.buffer_rng is rng:
+            taken = self.buffer[self.buffer_index:self.buffer_index + n]
+            self.buffer_index += len(taken)
+        rest = n - len(taken)
+        if rest == 0:
+            return taken.copy()
+        return np.concatenate((taken, rng.standard_normal(rest) if normal else rng.random(rest)))
+
+    def __getstate__(self) -> dict:
+        # copies of a noise source, e.g. in forks of a simulation, do not record or replay its stream
+        state = self.__dict__.copy()
+        for name in self.stream_attributes:
+            state.pop(name, None)
+        return state
+
     def reset(self) -> None:
         """
-            Reset NoiseSource, by resetting noise level to 0 and deleting any existing history of noise outputs.
+            Reset NoiseSource, by resetting noise level to 0 and deleting any existing history of noise outputs. Any random numbers which have been drawn but not yet used are kept, so that the source's stream of random numbers carries on as it would have if they had been drawn one at a time.
         """
         self.noise = 0.0
-        self.noises = [self.noise]
+        self.noises = History([self.noise])
 
-    def get_data(self) -> Dict[str, List[float]]:
+    def get_data(self, copy: bool=False) -> Dict[str, List[float]]:
         """
             Get the noise source's data.
 
             :return: The noise source's data.
             :rtype: dict of data, which only includes the history of noise outputs in this superclass.
         """
-        n = self.noises
+        n = self.noises.get_values(copy)
         return {"noises": n}
 
 class WhiteNoiseSource(NoiseSource):
@@ -95,7 +183,7 @@ class WhiteNoiseSource(NoiseSource):
             :return: Output from noise source.
             :rtype: float
         """
-        self.noise = self.min_val + (self.extent * np.random.random())  # generate noise
+        self.noise = self.min_val + (self.extent * self.get_random())  # generate noise
         return super().step(dt)  # call step of NoiseSource to store noise
 
 class BrownNoiseSource(NoiseSource):
@@ -129,7 +217,7 @@ class BrownNoiseSource(NoiseSource):
             :return: Output from noise source.
             :rtype: float
         """
-        self.noise += self.max_step_size * (2 * np.random.random() - 1)  # generate noise
+        self.noise += self.max_step_size * (2 * self.get_random() - 1)  # generate noise
         return super().step(dt)  # store noise
 
 
@@ -196,8 +284,8 @@ class SpikeNoiseSource(NoiseSource):
             :rtype: float
         """
         self.noise = 0.0  # noise is zero by default
-        if np.random.random() < self.prob:  # if a randomly generated number is less than the probability of a spike, then spike
-            if np.random.random() < 0.5:  # spikes are positive or negative with equiprobability
+        if self.get_random() < self.prob:  # if a randomly generated number is less than the probability of a spike, then spike
+            if self.get_random() < 0.5:  # spikes are positive or negative with equiprobability
                 self.noise = self.pos_size  # positive spike
             else:
                 self.noise = self.neg_size  # negative spike
@@ -209,7 +297,7 @@ class SpikeNoiseSource(NoiseSource):
 # this class provides a convenient way to have a single NoiseSource which incorporates all of those kinds of noise
 class NoiseMaker(NoiseSource):
     """
-        A subclass of :class:`NoiseSource` which provides a source of mixed noise: white, brown and "spike". A :class:`NoiseMaker` has its own instances of :class:`WhiteNoiseSource`, :class:`BrownNoiseSource` and :class:`SpikeNoiseSource`, and its output is the sum of their outputs.
+        A subclass of :class:`NoiseSource` which provides a source of mixed noise: white, brown, "spike", Ornstein-Uhlenbeck and pink. A :class:`NoiseMaker` has its own instances of :class:`WhiteNoiseSource`, :class:`BrownNoiseSource`, :class:`SpikeNoiseSource`, :class:`OUNoiseSource` and :class:`PinkNoiseSource`, and its output is the sum of their outputs.
 
         .. figure:: images/NoiseMaker.svg
           :width: 400
@@ -219,9 +307,11 @@ class NoiseMaker(NoiseSource):
     def __init__(self,
                  white_noise_params: List[float]=[0.0, 0.0],
                  brown_noise_step: float=0,
-                 spike_noise_params: List[float]=[0.0, 0.0, 0.0]):
+                 spike_noise_params: List[float]=[0.0, 0.0, 0.0],
+                 ou_noise_params: List[float]=[0.0, 0.0],
+                 pink_noise_std: float=0):
         """
-            __init__(white_noise_params: List[float]=[0.0, 0.0], brown_noise_step: float=0, spike_noise_params: List[float]=[0.0, 0.0, 0.0])
+            __init__(white_noise_params: List[float]=[0.0, 0.0], brown_noise_step: float=0, spike_noise_params: List[float]=[0.0, 0.0, 0.0], ou_noise_params: List[float]=[0.0, 0.0], pink_noise_std: float=0)
 
             Construct :class:`NoiseMaker`. The noisemaker's individual noise sources will only be constructed if non-zero parameters for them are passed into ``__init__``. The :class:`NoiseMaker` class does not provide for this to be changed after construction, although additional noise sources can always be added to a noisemaker's list manually.
 
@@ -234,6 +324,12 @@ class NoiseMaker(NoiseSource):
             :param spike_noise_params: The parameters for the noisemaker's :class:`SpikeNoiseSource`. Defaults to ``[0, 0, 0]``, in which case the noisemaker will produce no spike noise.
             :type spike_noise_params: list(float)
 
+            :param ou_noise_params: The parameters for the noisemaker's :class:`OUNoiseSource`, in the form ``[tau, std]``. Defaults to ``[0, 0]``, in which case the noisemaker will produce no Ornstein-Uhlenbeck noise.
+            :type ou_noise_params: list(float)
+
+            :param pink_noise_std: The standard deviation of the noisemaker's :class:`PinkNoiseSource`. Defaults to ``0``, in which case the noisemaker will produce no pink noise.
+            :type pink_noise_std: float
+
         """
         super().__init__()
         self.noise_sources: List[NoiseSource] = []  # list of noise sources
@@ -243,6 +339,10 @@ class NoiseMaker(NoiseSource):
             self.noise_sources.append(BrownNoiseSource(max_step_size=brown_noise_step))
         if spike_noise_params != [0, 0, 0]:
             self.noise_sources.append(SpikeNoiseSource(prob=spike_noise_params[0], pos_size=spike_noise_params[1], neg_size=spike_noise_params[2]))
+        if ou_noise_params != [0, 0]:
+            self.noise_sources.append(OUNoiseSource(tau=ou_noise_params[0], std=ou_noise_params[1]))
+        if pink_noise_std != 0:
+            self.noise_sources.append(PinkNoiseSource(std=pink_noise_std))
 
     def step(self, dt: float) -> float:
         """
@@ -302,5 +402,144 @@ class GaussianNoiseSource(NoiseSource):
             :return: Output from noise source.
             :rtype: float
         """
-        self.noise = np.random.normal(self.mean, self.std)  # generate noise
+        self.noise = self.mean + self.std * self.get_random(normal=True)  # generate noise
+        return super().step(dt)  # store noise
+
+class OUNoiseSource(NoiseSource):
+    """
+        A class representing a source of Ornstein-Uhlenbeck noise. Like brown noise, Ornstein-Uhlenbeck noise drifts, but it is also pulled back towards its mean, so that, unlike brown noise, it stays within a few standard deviations of its mean however long a simulation runs for. Its output is correlated over a time of about ``tau``, and its long-run standard deviation is ``std``.
+
+        The noise is stepped with the exact solution of the Ornstein-Uhlenbeck process over an interval of ``dt``,
+
+        ``noise = mean + (noise - mean) * exp(-dt / tau) + std * sqrt(1 - exp(-2 * dt / tau)) * N(0, 1)``
+
+        so its statistics are the same for any step size, and only one random number is used in each step, as for a :class:`GaussianNoiseSource`. As for other noise sources, the noise starts from ``0``.
+    """
+    def __init__(self, tau: float, std: float, mean: float=0.0):
+        """
+            __init__(self, tau: float, std: float, mean: float=0.0)
+
+            Construct instance of :class:`OUNoiseSource`.
+
+            :param tau: The time constant of the noise, i.e. the time over which it is correlated, which should be greater than ``0``.
+            :type tau: float
+
+            :param std: The long-run standard deviation of the noise.
+            :type std: float
+
+            :param mean: The mean which the noise is pulled towards. Defaults to ``0``.
+            :type mean: float
+        """
+        super().__init__()
+        self.tau = tau
+        self.std = std
+        self.mean = mean
+        # the decay and diffusion coefficients of the last step size, which are only recomputed when it changes
+        self.coeffs_key: Tuple[float, float, float] = None
+        self.decay = 1.0
+        self.diffusion = 0.0
+
+    def step(self, dt: float) -> float:
+        """
+            Step noise source forwards in time, by solving the Ornstein-Uhlenbeck process over an interval of ``dt``, and update its history.
+
+            :param dt: Interval of time to integrate the noise source over.
+            :type dt: float
+
+            :return: Output from noise source.
+            :rtype: float
+        """
+        if self.coeffs_key != (dt, self.tau, self.std):
+            self.coeffs_key = (dt, self.tau, self.std)
+            self.decay = math.exp(-dt / self.tau)
+            self.diffusion = self.std * math.sqrt(1 - self.decay * self.decay)
+        self.noise = self.mean + (self.noise - self.mean) * self.decay + self.diffusion * self.get_random(normal=True)  # generate noise
+        return super().step(dt)  # store noise
+
+class PinkNoiseSource(NoiseSource):
+    """
+        A class representing a source of pink, or 1/f, noise, whose power is inversely proportional to frequency, so that it has more slow drift than white noise, and more fast variation than brown noise. Unlike brown noise, pink noise does not wander off: it has a fixed standard deviation, ``std``, around its ``mean``.
+
+        Pink noise is generated ``length`` steps at a time, by filtering a block of Gaussian white noise in the frequency domain, with NumPy's FFT, and is then served from the block one step at a time, so that it costs about as much per step as white noise. Each block is faded into the end of the one before it, over ``overlap`` steps, so that there are no jumps between blocks. The frequencies which a block can contain are multiples of ``1 / length`` steps, so variations slower than ``length`` steps are left out.
+
+        As for other noise sources, the noise is ``0`` until the source is first stepped. The noise does not depend on ``dt``, but only on the number of steps.
+    """
+    # the stream which the current block of noise was made from, which, like the stream itself, is not copied with the
+    # source, so it is a class attribute, which copies fall back on
+    block_stream = None
+    stream_attributes: Tuple[str, ...] = ("stream", "block_stream")
+
+    def __init__(self, std: float, mean: float=0.0, length: int=8192, overlap: int=64):
+        """
+            __init__(self, std: float, mean: float=0.0, length: int=8192, overlap: int=64)
+
+            Construct instance of :class:`PinkNoiseSource`.
+
+            :param std: The standard deviation of the noise.
+            :type std: float
+
+            :param mean: The mean of the noise. Defaults to ``0``.
+            :type mean: float
+
+            :param length: The number of steps of noise which are generated at a time. Defaults to ``8192``.
+            :type length: int
+
+            :param overlap: The number of steps over which each block of noise is faded into the one before it. Defaults to ``64``.
+            :type overlap: int
+        """
+        super().__init__()
+        self.std = std
+        self.mean = mean
+        self.length = length
+        self.overlap = min(overlap, length)
+        # the filter which shapes white noise into pink noise, scaled so that the filtered noise has a standard deviation of 1
+        n = length + self.overlap
+        gains = np.zeros(n // 2 + 1)
+        gains[1:] = 1 / np.sqrt(np.arange(1, n // 2 + 1))
+        # each frequency, apart from 0 and (for even n) the Nyquist frequency, appears twice in the full spectrum
+        power = 2 * np.sum(np.square(gains)) - (gains[-1] ** 2 if n % 2 == 0 else 0)
+        self.gains = gains * math.sqrt(n / power)
+        # the current block of pink noise, with unit standard deviation, and the index of the next value to serve from it
+        self.block: List[float] = []
+        self.block_index = 0
+        # the extra values at the end of the current block, which the next block is faded in from
+        self.tail: np.ndarray = None
+        # the generator which the current block was made from, so that a new one starts a new block. The generator is
+        # kept, rather than its id, so that copies of the source (e.g. in forks of a simulation) refer to their own copy
+        # of it, and carry on with the same block
+        self.block_rng: np.random.Generator = None
+
+    def make_block(self) -> None:
+        """
+            Generate the next block of pink noise, from ``length + overlap`` random numbers.
+        """
+        n = self.length + self.overlap
+        noise = np.fft.irfft(np.fft.rfft(self.get_randoms(n, normal=True)) * self.gains, n)
+        if self.tail is not None and self.overlap:
+            # fade in with weights whose squares sum to 1, which keeps the standard deviation of the independent blocks
+            fade = np.sin(0.5 * math.pi * (np.arange(self.overlap) + 0.5) / self.overlap)
+            noise[:self.overlap] = fade * noise[:self.overlap] + np.sqrt(1 - fade * fade) * self.tail
+        self.block = noise[:self.length].tolist()
+        self.tail = noise[self.length:]
+        self.block_index = 0
+
+    def step(self, dt: float) -> float:
+        """
+            Step noise source forwards in time, by serving the next value of its current block of pink noise (and generating a new block, if the current one has been used up), and update its history.
+
+            :param dt: Interval of time to integrate the noise source over - not currently used.
+            :type dt: float
+
+            :return: Output from noise source.
+            :rtype: float
+        """
+        if self.block_rng is not self.rng or self.block_stream is not self.stream:
+            # a new generator, or a new recording or replay, starts a fresh block
+            self.block_rng, self.block_stream = self.rng, self.stream
+            self.tail = None
+            self.make_block()
+        elif self.block_index == len(self.block):
+            self.make_block()
+        self.noise = self.mean + self.std * self.block[self.block_index]  # generate noise
+        self.block_index += 1
         return super().step(dt)  # store noise
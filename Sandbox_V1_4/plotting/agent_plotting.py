@@ -82,7 +82,7 @@ def check_for_noise_data(agent_data):
 
     sensor_noise_n = 0
     for sensor_data in agent_data["sensors"]:
-        if sensor_data["noises"]:
+        if sensor_data["noises"] is not None:
             sensor_noise_n += 1
             sensor_noise = True
 
@@ -117,7 +117,7 @@ def plot_single_robot_noise(ts, agent_data):
 
     if sensor_noise_n > 0:
         for i, sensor_data in enumerate(agent_data["sensors"]):
-            if sensor_data["noises"]:
+            if sensor_data["noises"] is not None:
                 ax[ax_ind].plot(ts, sensor_data["noises"], label='Sensor ' + str(i) + ' noise')
                 # ax[ax_ind].legend()
                 ax[ax_ind].set_title(sensor_data["name_str"] + ' noise')
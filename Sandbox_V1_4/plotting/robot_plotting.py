@@ -1,6 +1,7 @@
 from . import *
 from . import timeColouredPlots as tcp
 import matplotlib.pyplot as plt
+import numpy as np
 
 def plot_all_robots_basic_data(sim_data, show_motors=True, show_sensors=True, show_controllers=False, multiple_plots=True):
     '''
@@ -40,7 +41,7 @@ def check_noise_data(robot_data):
     for sensor_data in robot_data["sensors"]:
         # print(sensor_data)
         # print(sensor_data.keys())
-        if sensor_data["noises"]:
+        if sensor_data["noises"] is not None:
             sensor_noise_n += 1
             sensor_noise = True
 
@@ -98,7 +99,7 @@ def plot_all_robots_noise(sim_data):
 
         if sensor_noise_n > 0:
             for i, sensor_data in enumerate(robot_data["sensors"]):
-                if sensor_data["noises"]:
+                if sensor_data["noises"] is not None:
                     ax[ax_ind].plot(ts, sensor_data["noises"], label='Run ' + str(robot_data["run_n"]) + ' robot ' + str(robot_data["ind"]))
             ax[ax_ind].legend()
             ax[ax_ind].set_title('Sensor noise')
@@ -139,7 +140,7 @@ def plot_single_robot_noise(robot_data, ts):
 
     if sensor_noise_n > 0:
         for i, sensor_data in enumerate(robot_data["sensors"]):
-            if sensor_data["noises"]:
+            if sensor_data["noises"] is not None:
                 ax[ax_ind].plot(ts, sensor_data["noises"], label='Sensor ' + str(i) + ' noise')
         ax[ax_ind].legend()
         ax[ax_ind].set_title('Sensor noise')
@@ -326,8 +327,8 @@ def plot_all_agents_trajectories(all_ts, agents_data, light_sources_data, draw_a
     for data in agents_data:
         l = longest_len - len(data["xs"])
         if len(data["xs"]) < longest_len:
-            data["xs"] += [data["xs"][-1]] * l
-            data["ys"] += [data["ys"][-1]] * l
+            data["xs"] = np.concatenate([data["xs"], [data["xs"][-1]] * l])
+            data["ys"] = np.concatenate([data["ys"], [data["ys"][-1]] * l])
 
         agent_min_x = min(data["xs"])
         agent_max_x = max(data["xs"])
@@ -11,7 +11,6 @@ def doColourVaryingPlot2d(x, y, t, fig, ax, map_ind=0, showBar=True, barlabel='t
     map_ind = map_ind % len(maps)
     map = maps[map_ind]
     segments = []
-    x2 = x
     x = np.array(x)
     y = np.array(y)
     t = np.array(t)
@@ -39,7 +38,7 @@ def doColourVaryingPlot2d(x, y, t, fig, ax, map_ind=0, showBar=True, barlabel='t
         col.set_label(barlabel + " " + linestyles[linestyle_ind])
 
     x_min, x_max = ax.get_xlim()
-    x2 += [x_min, x_max]
+    x2 = np.concatenate([x, [x_min, x_max]])
 
     ax.set_xlim([np.min(x2), np.max(x2)])
     ax.set_ylim([np.min(y), np.max(y)])
@@ -1,4 +1,5 @@
 from .System import *
+from .BrightnessModel import *
 
 '''
     Note: Stimulus classes are not normally
@@ -71,7 +72,7 @@ class Stimulus(System):
         else:
             return None
 
-    def get_data(self) -> dict:
+    def get_data(self, copy: bool=False) -> dict:
         """
             A method to return the data of the stimulus.
             Note: this is not likely to be particularly useful, as it only contains the original state, as recorded by :class:`System`, and the current state of "is_on".
@@ -79,7 +80,7 @@ class Stimulus(System):
             :return: A dict containing the data returned from :meth:`Sandbox.System.get_data`, plus ``is_on``.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["is_on"] = self.is_on
         return data
 
@@ -120,7 +121,11 @@ class LightSource(Stimulus):
           :align: center
           :alt: Inverse square light decay model
 
+        A :class:`LightSource` keeps any :class:`LightSourceField` s which it is part of up to date, by writing the new values of its ``field_attributes`` into them whenever they are assigned to.
     """
+    # the attributes which a LightSourceField holds arrays of
+    field_attributes = ["x", "y", "theta", "brightness", "gradient", "half_spread", "model", "is_on", "label"]
+
     # construct light source
     def __init__(self, x: float, y: float, theta: float=0, spread=2*math.pi, brightness: float=1, gradient: float=0.01, model: str='inv_sq', is_on: bool=True, colour: str='yellow', label: str=None):
         """
@@ -140,10 +145,10 @@ class LightSource(Stimulus):
             :param brightness: The brightness of the light, at its own coordinate.
             :type brightness: float
 
-            :param gradient: The gradient of brightness decay with distance, when the linear model is used.
+            :param gradient: The gradient of brightness decay with distance, when the linear model is used, or the rate of decay for the exponential and gaussian models.
             :type gradient: float
 
-            :param model: The light decay model. ``inv_sq``, ``linear``, and ``binary`` are valid models.
+            :param model: The light decay model. ``inv_sq``, ``linear``, ``binary``, ``exponential`` and ``gaussian`` are valid models, as are any models which have been registered with ``BrightnessModel.register``.
             :type model: str
 
             :param is_on: A flag which can be use to determine whether or not a light can be detected. Defaults to ``True``. This allows for the light to be turned on and off.
@@ -155,6 +160,7 @@ class LightSource(Stimulus):
             :param label: A light source's label defines a group. Any :class:`LightSensor` with the same label attribute will detect all, and only, light sources which are in its list and also in that group. A :class:`LightSensor` with no label will detect any :class:`LightSource` in its list, regardless of label.
             :type label: str
         """
+        self.fields = []  # the LightSourceFields which this light is in, along with its index in each of them
         super().__init__(x, y, theta, is_on)  # call Stimulus constructor
         self.brightness = brightness  # this is the brightness of the light at the source
         self.initial_brightness = brightness
@@ -174,9 +180,22 @@ class LightSource(Stimulus):
         self.half_spread = spread / 2 # angular spread of light cone
         self.initial_half_spread = spread / 2
 
+    def __setattr__(self, name, value) -> None:
+        super().__setattr__(name, value)
+        # keep any fields which this light is in up to date
+        if name in LightSource.field_attributes:
+            for field, i in self.__dict__.get("fields", ()):
+                field.update(i, name, value)
+
+    def __getstate__(self) -> dict:
+        # fields are rebuilt as they are needed, rather than being copied or pickled
+        state = self.__dict__.copy()
+        state["fields"] = []
+        return state
+
     def get_brightness_at(self, x: float, y: float, sensor_angle=None) -> float:
         """
-            A method to get the brightness of the light (as it is perceived) at the given xy coordinates, according to the light source's ``model``, and which angles it can be perceived from (determined by the light's ``spread`` attribute).
+            A method to get the brightness of the light (as it is perceived) at the given xy coordinates, according to the light source's ``model`` (see :class:`BrightnessModel`), and which angles it can be perceived from (determined by the light's ``spread`` attribute).
 
             :param x: The x-component of the position to find the brightness at.
             :type x: float
@@ -191,48 +210,20 @@ class LightSource(Stimulus):
             :rtype: float
         """
 
-        # print(sensor_angle)
-
         if not self.is_on:
             return 0
 
-        # angle_diff = -np.Inf
-#
-        # if sensor_angle is not None:
-		#
-        #     self.theta = self.theta % (2*math.pi)
-		#
-        #     # for computing the next step, constrain the angle of the sensor to be in the interval [0, 2*np.pi]
-        #     sensor_angle += math.pi # rotate this angle, to be from point of view of light
-        #     angle = sensor_angle % (2*math.pi)
-        #     if angle < 0:
-        #         angle += 2 * math.pi
-		#
-        #     # find the difference between the direction the sensor points in and the direction the light source points in
-        #     angle_diff = min([np.abs(self.theta - angle), np.abs(self.theta - (angle-2*math.pi))])
-		#
-        # print(sensor_angle, angle_diff)
-
-        self.theta = self.theta % (2*math.pi)
-
-        brightness = 0
         # if sensor can "see" light from its current position and orientation, then return brightness at sensor's coordinate, else return 0
-
-        angle_to_light = math.atan2(y-self.y, x-self.x)  # find angle of vector from light source to sensor
-
-        # if angle_diff > self.half_spread:
-        if abs(angle_difference(angle_to_light, self.theta)) >= (self.half_spread):
+        dx = x - self.x
+        dy = y - self.y
+        angle = abs(angle_difference(math.atan2(dy, dx), self.theta))  # angle of vector from light source to sensor, relative to the light's orientation
+        if angle >= self.half_spread:
             return 0
-        else:
-            dist = self.get_distance(x, y)
-            if self.model == 'inv_sq':
-                brightness = self.inv_sq_model(dist)
-            elif self.model == 'linear':
-                brightness = self.linear_model(dist)
-            elif self.model == 'binary':
-                brightness = self.brightness
 
-        return brightness
+        model = BrightnessModel.models.get(self.model)
+        if model is None:
+            return 0
+        return float(model.kernel(math.sqrt(dx**2 + dy**2), angle, self.brightness, self.gradient))
 
     # for some controllers, it is much easier to work with a linear light decay model. it is not physically realistic as a model of light, but we can think of this as being preprocessed to linearise raw sensor data
     def linear_model(self, dist: float) -> float:
@@ -245,7 +236,7 @@ class LightSource(Stimulus):
             :return: The perceived brightness.
             :rtype: float
         """
-        return max(self.brightness - self.gradient * dist, 0)
+        return float(BrightnessModel.models["linear"].kernel(dist, 0, self.brightness, self.gradient))
 
     # this is a more realistic model of light decay. for simple Braitenberg vehicle style robots the nonlinearity of
     # light decay can lead to interesting behaviours
@@ -259,16 +250,16 @@ class LightSource(Stimulus):
             :return: The perceived brightness.
             :rtype: float
         """
-        return self.brightness / np.power(dist+1, 2)  # 1 is added to fix brightness at dist=0
+        return float(BrightnessModel.models["inv_sq"].kernel(dist, 0, self.brightness, self.gradient))
 
-    def get_data(self) -> dict:
+    def get_data(self, copy: bool=False) -> dict:
         """
             Get the :class:`LightSource`'s data. This method, if used, relies on the assumption that the :class:`LightSource` and its properties are static.
 
             :return: The :class:`LightSource`'s data in dict form.
             :rtype: dict
         """
-        data = super().get_data()
+        data = super().get_data(copy)
         data["brightness"] = self.brightness
         data["gradient"] = self.gradient
         data["model"] = self.model